@@ -0,0 +1,214 @@
+"""
+Instrumentasi per panggilan untuk layanan eksternal (Google Sheets, SMTP, pembuatan PDF).
+
+Setiap panggilan dicatat dengan nama operasi, range/target, jumlah baris dan byte yang
+ditransfer, latency serta jumlah retry. Data disimpan di memori sebagai histogram latency
+per (service, operasi) ditambah daftar panggilan terakhir, dan dapat diekspor ke JSON/CSV.
+"""
+import csv
+import json
+import time
+import logging
+import threading
+import functools
+from collections import deque
+
+logging.basicConfig(level=logging.WARNING)
+
+# Batas atas bucket histogram latency (detik); bucket terakhir menampung sisanya
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+RECENT_CALLS = 500      # jumlah panggilan terakhir yang disimpan untuk ekspor detail
+
+CSV_FIELDS = ['time', 'service', 'op', 'target', 'rows', 'bytes', 'latency', 'retries', 'ok', 'error']
+
+def bucket_label(index):
+    if index < len(LATENCY_BUCKETS):
+        return f"<={LATENCY_BUCKETS[index]:g}s"
+    return f">{LATENCY_BUCKETS[-1]:g}s"
+
+class CallRecord:
+    """Satu panggilan yang sedang diukur; pemanggil mengisi rows/bytes/retries bila diketahui."""
+    __slots__ = ('service', 'op', 'target', 'rows', 'bytes', 'retries', 'started', 'latency', 'ok', 'error')
+
+    def __init__(self, service, op, target=None):
+        self.service = service
+        self.op = op
+        self.target = target or ''
+        self.rows = 0
+        self.bytes = 0
+        self.retries = 0
+        self.started = time.time()
+        self.latency = 0.0
+        self.ok = True
+        self.error = ''
+
+    def as_dict(self):
+        return {
+            'time': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+            'service': self.service,
+            'op': self.op,
+            'target': self.target,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'latency': round(self.latency, 4),
+            'retries': self.retries,
+            'ok': self.ok,
+            'error': self.error,
+        }
+
+class _OpStats:
+    __slots__ = ('count', 'errors', 'retries', 'rows', 'bytes', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.rows = 0
+        self.bytes = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, record):
+        self.count += 1
+        self.errors += 0 if record.ok else 1
+        self.retries += record.retries
+        self.rows += record.rows
+        self.bytes += record.bytes
+        self.total += record.latency
+        self.max = max(self.max, record.latency)
+        index = len(LATENCY_BUCKETS)
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            if record.latency <= upper:
+                index = i
+                break
+        self.buckets[index] += 1
+
+    def percentile(self, fraction):
+        """Perkiraan persentil dari histogram (batas atas bucket; bucket terakhir memakai max)."""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= threshold:
+                return min(LATENCY_BUCKETS[i], self.max) if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+class ApiMetrics:
+    """
+    Kumpulan metrik panggilan eksternal untuk seluruh proses (thread-safe).
+    - track(service, op, target): context manager yang mengukur satu panggilan
+    - summary(): ringkasan per (service, op): jumlah, error, retry, baris, byte, p50/p95/max
+    - export_json(path) / export_csv(path): simpan ringkasan + panggilan terakhir
+    """
+    def __init__(self, recent=RECENT_CALLS):
+        self._lock = threading.Lock()
+        self._ops = {}
+        self._recent = deque(maxlen=recent)
+
+    def record(self, record):
+        with self._lock:
+            key = (record.service, record.op)
+            if key not in self._ops:
+                self._ops[key] = _OpStats()
+            self._ops[key].add(record)
+            self._recent.append(record)
+
+    def track(self, service, op, target=None):
+        return _Tracker(self, service, op, target)
+
+    def timed(self, service, op):
+        """Decorator: ukur setiap pemanggilan fungsi sebagai satu operasi."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.track(service, op):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        with self._lock:
+            items = sorted(self._ops.items())
+            result = []
+            for (service, op), stats in items:
+                result.append({
+                    'service': service,
+                    'op': op,
+                    'count': stats.count,
+                    'errors': stats.errors,
+                    'retries': stats.retries,
+                    'rows': stats.rows,
+                    'bytes': stats.bytes,
+                    'avg': round(stats.total / stats.count, 4) if stats.count else 0.0,
+                    'p50': round(stats.percentile(0.5), 4),
+                    'p95': round(stats.percentile(0.95), 4),
+                    'max': round(stats.max, 4),
+                    'histogram': {bucket_label(i): n for i, n in enumerate(stats.buckets)},
+                })
+            return result
+
+    def recent(self, limit=None):
+        with self._lock:
+            records = list(self._recent)
+        if limit is not None:
+            records = records[-limit:]
+        return [r.as_dict() for r in records]
+
+    def totals(self):
+        """Ringkasan singkat untuk status bar: (jumlah panggilan, error, total latency)."""
+        with self._lock:
+            count = sum(s.count for s in self._ops.values())
+            errors = sum(s.errors for s in self._ops.values())
+            latency = sum(s.total for s in self._ops.values())
+        return count, errors, latency
+
+    def reset(self):
+        with self._lock:
+            self._ops.clear()
+            self._recent.clear()
+
+    def export_json(self, path):
+        from api_rate_limiter import rate_limiter
+        payload = {
+            'exported_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'latency_buckets': list(LATENCY_BUCKETS),
+            'summary': self.summary(),
+            'rate_limiter': rate_limiter.stats(),
+            'calls': self.recent(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+
+    def export_csv(self, path):
+        """Satu baris per panggilan (panggilan terakhir saja, lihat RECENT_CALLS)."""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for row in self.recent():
+                writer.writerow(row)
+
+class _Tracker:
+    def __init__(self, metrics, service, op, target):
+        self._metrics = metrics
+        self.record = CallRecord(service, op, target)
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record.latency = time.perf_counter() - self._start
+        if exc is not None:
+            self.record.ok = False
+            self.record.error = f"{exc_type.__name__}: {exc}"[:200]
+        try:
+            self._metrics.record(self.record)
+        except Exception as e:
+            logging.warning(f"[ApiMetrics] Gagal mencatat metrik: {e}")
+        return False
+
+api_metrics = ApiMetrics()
@@ -0,0 +1,167 @@
+import time
+import random
+import socket
+import logging
+import threading
+
+logging.basicConfig(level=logging.WARNING)
+
+# Kuota default Google Sheets: 60 request/menit/user -> 1 token per detik, burst kecil diizinkan
+DEFAULT_RATE = 1.0        # token per detik
+DEFAULT_CAPACITY = 15     # jumlah request yang boleh langsung jalan berturut-turut
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0        # detik
+BACKOFF_MAX = 32.0        # detik
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+# Penulisan non-idempoten (append, hapus baris) hanya diulang bila pasti belum diterapkan server:
+# 429 (ditolak kuota) atau koneksi yang gagal dibuka sebelum request terkirim
+RETRYABLE_WRITE_STATUS = (429,)
+UNSENT_ERRORS = (ConnectionRefusedError, socket.gaierror)
+
+class TokenBucket:
+    """Token bucket thread-safe. acquire() memblok sampai token tersedia dan mengembalikan lama menunggu."""
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_CAPACITY):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds):
+        """Tahan semua pemanggil (semua thread) selama `seconds`, mis. setelah 429/Retry-After."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return waited
+                    delay = (1.0 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+def _error_status(error):
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _retry_after(error):
+    """Nilai header Retry-After (detik) dari HttpError, atau None."""
+    resp = getattr(error, 'resp', None)
+    if resp is None or not hasattr(resp, 'get'):
+        return None
+    value = resp.get('retry-after') or resp.get('Retry-After')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable_error(error, idempotent=True):
+    """
+    True untuk kuota/overload (429/5xx) dan gangguan jaringan sementara. idempotent=False
+    (mis. appendCells/deleteDimension): timeout atau 5xx bisa terjadi setelah server menerapkan
+    penulisan, sehingga mengulang dapat menggandakan baris atau menghapus baris yang salah;
+    hanya 429 dan error sebelum request terkirim yang diulang.
+    """
+    status = _error_status(error)
+    if not idempotent:
+        return status in RETRYABLE_WRITE_STATUS or isinstance(error, UNSENT_ERRORS)
+    if status in RETRYABLE_STATUS:
+        return True
+    return isinstance(error, (socket.timeout, ConnectionError, TimeoutError))
+
+class RateLimiter:
+    """
+    Pintu tunggal untuk semua request Google API di proses ini.
+    - Token bucket bersama membatasi laju request dari semua thread
+    - Error 429/5xx diulang dengan exponential backoff + jitter, menghormati Retry-After
+      (penulisan non-idempoten hanya pada 429, lihat is_retryable_error)
+    - 429 menahan bucket untuk semua thread agar tidak terjadi badai retry
+    - Counter waktu tertahan tersedia lewat stats()
+    """
+    def __init__(self, rate=DEFAULT_RATE, capacity=DEFAULT_CAPACITY, max_retries=MAX_RETRIES,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.bucket = TokenBucket(rate, capacity)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._stats = {
+            'requests': 0,
+            'retries': 0,
+            'rate_limited': 0,        # jumlah respons 429
+            'failures': 0,
+            'throttled_seconds': 0.0, # menunggu token bucket
+            'backoff_seconds': 0.0,   # menunggu sebelum retry
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def backoff_delay(self, attempt, error=None):
+        """Full jitter: acak di [0, min(max, base*2^attempt)], tidak kurang dari Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        retry_after = _retry_after(error) if error is not None else None
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, func, *args, idempotent=True, **kwargs):
+        """
+        Jalankan func(*args, **kwargs) melalui limiter dengan retry otomatis.
+        idempotent=False untuk penulisan yang tidak aman diulang setelah mungkin diterapkan.
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire()
+            if waited:
+                self._count('throttled_seconds', waited)
+            self._count('requests')
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable_error(e, idempotent):
+                    self._count('failures')
+                    raise
+                delay = self.backoff_delay(attempt, e)
+                if _error_status(e) == 429:
+                    self._count('rate_limited')
+                    self.bucket.pause(delay)
+                logging.warning(f"[RateLimiter] Request gagal ({e}), ulangi dalam {delay:.1f} detik")
+                self._count('retries')
+                self._count('backoff_seconds', delay)
+                time.sleep(delay)
+                attempt += 1
+
+    def execute(self, request, idempotent=True):
+        """Jalankan HttpRequest googleapiclient (objek dengan .execute())."""
+        return self.call(request.execute, idempotent=idempotent)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0.0 if isinstance(self._stats[key], float) else 0
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,86 @@
+"""
+Jembatan antara Tkinter dan pekerjaan Google Sheets yang memblokir.
+
+Fungsi sinkron (request Sheets, sinkronisasi replika) dijalankan di thread pool; setiap
+thread punya transport HTTP sendiri dari SheetsServicePool dan tetap melewati rate
+limiter bersama. Event loop berjalan di satu thread latar belakang; dari kode Tkinter
+gunakan run_in_tk() agar callback dijalankan kembali di thread UI.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.WARNING)
+
+MAX_IN_FLIGHT = 4       # request Sheets yang boleh berjalan bersamaan
+TK_POLL_MS = 30         # interval cek hasil dari thread UI
+
+_executor = ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT, thread_name_prefix="sheets-io")
+_loop = None
+_loop_lock = threading.Lock()
+
+def _get_loop():
+    """Event loop bersama yang berjalan di thread daemon (dibuat saat pertama dipakai)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="sheets-async-loop", daemon=True).start()
+        return _loop
+
+def submit(coro):
+    """Jadwalkan coroutine di event loop bersama. Return concurrent.futures.Future."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+class AsyncSheetsClient:
+    """
+    Pembungkus async untuk SheetsBackend: call() menjalankan fungsi sinkron apa pun
+    (mis. get_full_row, sinkronisasi replika) di thread pool, dibatasi MAX_IN_FLIGHT.
+    """
+    def __init__(self, backend=None, max_in_flight=MAX_IN_FLIGHT):
+        if backend is None:
+            from sheets_backend import get_backend
+            backend = get_backend()
+        self.backend = backend
+        self.max_in_flight = max_in_flight
+        self._semaphores = {}
+
+    def _semaphore(self):
+        # Semaphore asyncio terikat ke loop yang sedang berjalan
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphores[loop]
+
+    async def call(self, func, *args):
+        async with self._semaphore():
+            return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+def run_in_tk(widget, coro, on_success=None, on_error=None):
+    """
+    Jembatan ke loop Tk: jalankan coroutine di event loop latar belakang lalu panggil
+    on_success(result) / on_error(exception) di thread UI lewat widget.after().
+    """
+    future = submit(coro)
+
+    def poll():
+        if not future.done():
+            try:
+                widget.after(TK_POLL_MS, poll)
+            except Exception:
+                future.cancel()  # widget sudah dihancurkan
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            else:
+                logging.warning(f"[async_sheets] Request gagal: {e}")
+            return
+        if on_success:
+            on_success(result)
+
+    widget.after(TK_POLL_MS, poll)
+    return future
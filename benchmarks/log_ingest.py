@@ -0,0 +1,66 @@
+"""
+Benchmark ingest log: jalur per baris (row_to_log_values) vs jalur vektor pandas (log_value_columns).
+
+    python benchmarks/log_ingest.py [jumlah_baris ...]   (default: 1000 10000 100000)
+
+Data berasal dari synthetic_log_rows(); sebagian tanggal diubah menjadi serial Excel, Klasifikasi
+diberi huruf kecil/spasi dan sebagian baris dipotong agar padding, konversi tanggal dan normalisasi
+ikut terukur. Waktu "+store" termasuk pembuatan LogStore (index tanggal, kunci urut, trigram).
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import ENHANCED_HEADER
+from sheets_backend import synthetic_log_rows
+from logic.log_ingest import EXCEL_EPOCH, DATE_FORMAT, _rows_to_columns, log_value_columns, pd
+from logic.log_store import LogStore
+from datetime import datetime
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+SERIAL_COLUMNS = [ENHANCED_HEADER.index(c) for c in ("Tgl. Surat", "Tgl. Penerimaan")]
+KLASIFIKASI = ENHANCED_HEADER.index("Klasifikasi")
+
+def sheet_like_rows(n):
+    rows = synthetic_log_rows(n, seed=n)
+    for i, row in enumerate(rows):
+        if i % 2 == 0:
+            for col in SERIAL_COLUMNS:
+                serial = (datetime.strptime(row[col], DATE_FORMAT) - EXCEL_EPOCH).days
+                row[col] = str(serial)
+        row[KLASIFIKASI] = f" {row[KLASIFIKASI].lower()} "
+        if i % 3 == 0:
+            # Sheets API tidak mengirim sel kosong di ujung baris
+            while row and row[-1] == "":
+                row.pop()
+    return rows
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def with_store(convert, rows):
+    store = LogStore()
+    store.extend_columns(convert(rows))
+    return store
+
+def main(sizes):
+    if pd is None:
+        print("pandas/numpy tidak terpasang: hanya jalur per baris yang tersedia")
+    print(f"{'baris':>8} {'per baris':>10} {'vektor':>10} {'x':>6} {'+store baris':>13} {'+store vektor':>14}")
+    for n in sizes:
+        rows = sheet_like_rows(n)
+        python_cols, python_s = timed(_rows_to_columns, rows)
+        vector_cols, vector_s = timed(log_value_columns, rows)
+        if python_cols != vector_cols:
+            raise SystemExit(f"Hasil berbeda untuk {n} baris")
+        _, python_store_s = timed(with_store, _rows_to_columns, rows)
+        _, vector_store_s = timed(with_store, log_value_columns, rows)
+        print(f"{n:>8} {python_s:>9.3f}s {vector_s:>9.3f}s {python_s / vector_s:>5.1f}x "
+              f"{python_store_s:>12.3f}s {vector_store_s:>13.3f}s")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -5,7 +5,8 @@ import traceback
 import platform
 import sys
 import os
-from google_sheets_connect import append_row_to_sheet, create_new_sheet, write_multilayer_header, append_rows_to_sheet, get_sheets_service, SHEET_ID
+from google_sheets_connect import append_row_to_sheet, create_new_sheet, write_multilayer_header, append_rows_to_sheet, get_sheets_service, close_sheets_service, SHEET_ID
+from logic.log_replica import get_log_replica
 import smtplib
 import tempfile
 from email.message import EmailMessage
@@ -36,6 +37,8 @@ from disposisi_app.views.components.validation import is_no_surat_unique
 from disposisi_app.views.components.shortcuts import setup_shortcuts
 from disposisi_app.views.components.gesture_handlers import setup_touchpad_gestures
 from disposisi_app.views.components.dialogs import show_shortcuts, show_about
+from disposisi_app.views.components.metrics_viewer import show_api_metrics, attach_metrics_label
+from disposisi_app.views.components.log_dashboard import LogDashboard
 from disposisi_app.views.components.tooltip_utils import attach_tooltip, add_tooltips
 from disposisi_app.views.components.export_utils import save_to_pdf, save_to_sheet
 from disposisi_app.views.components.form_utils import clear_form
@@ -188,6 +191,7 @@ class FormApp(tk.Tk):
                             activebackground="#3b82f6", activeforeground="white")
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="⌨️ Shortcuts", command=self.show_shortcuts)
+        help_menu.add_command(label="📊 Statistik API", command=lambda: show_api_metrics(self))
 
     def create_status_bar(self):
         """Create a compact status bar"""
@@ -216,6 +220,17 @@ class FormApp(tk.Tk):
                                  fg="#3b82f6")
         version_label.pack(side="right", padx=12, pady=4)
 
+        # Ringkasan panggilan Sheets/SMTP; klik untuk membuka Statistik API
+        metrics_label = tk.Label(right_status,
+                                 text="",
+                                 font=("Segoe UI", 9),
+                                 bg="#f8fafc",
+                                 fg="#64748b",
+                                 cursor="hand2")
+        metrics_label.pack(side="right", padx=8, pady=4)
+        metrics_label.bind("<Button-1>", lambda e: show_api_metrics(self))
+        attach_metrics_label(metrics_label)
+
     def setup_shortcuts(self):
         setup_shortcuts(
             self,
@@ -335,12 +350,20 @@ class FormApp(tk.Tk):
         from excel_crud_tab import LogTab
         self.log_frame = LogTab(self.notebook, on_edit_log=self.open_edit_tab)
         self.notebook.add(self.log_frame, text="📊 Data & Log")
+
+        # Ringkasan membaca counter dari data LogTab, jadi tidak memuat data sendiri
+        self.dashboard_frame = LogDashboard(self.notebook, get_store=lambda: self.log_frame.store)
+        self.notebook.add(self.dashboard_frame, text="📈 Ringkasan")
         
         def on_tab_changed(event):
             tab_id = event.widget.index("current")
             if tab_id == 1:
                 if self.log_data_dirty or self.log_frame.is_cache_expired():
-                    self.log_frame.refresh_log_data(force_refresh=True)
+                    self.log_frame.refresh_log_data(force_refresh=self.log_data_dirty)
+                    self.log_data_dirty = False
+            elif tab_id == 2:
+                if self.log_data_dirty or self.log_frame.is_cache_expired():
+                    self.log_frame.load_sheet_data(force_refresh=self.log_data_dirty, quiet=True)
                     self.log_data_dirty = False
         
         self.notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
@@ -356,9 +379,13 @@ class FormApp(tk.Tk):
         self.edit_tab = edit_tab
 
     def _on_edit_saved(self):
+        # Dipanggil dari thread simpan. Perubahan sudah diterapkan ke LogTab lewat listener replika
+        # (dijadwalkan dengan after), jadi tab Log cukup ditampilkan setelahnya tanpa unduh ulang
+        self.after(0, self._show_log_after_edit)
+
+    def _show_log_after_edit(self):
         if hasattr(self, 'notebook') and hasattr(self, 'log_frame'):
             self.notebook.select(self.log_frame)
-            self.log_frame.refresh_log_data(force_refresh=True)
         for i in range(self.notebook.index('end')):
             if self.notebook.tab(i, 'text') == '✏️ Edit Data':
                 self.notebook.forget(i)
@@ -1181,12 +1208,22 @@ def collect_form_data_safely(self):
 # Main application entry point
 def main():
     """Main function to run the Email Manager Application"""
+    replica = None
     try:
         app = FormApp()
+        # Replika log lokal disinkronkan berkala di latar belakang
+        replica = get_log_replica()
+        replica.start_background_sync()
         app.mainloop()
     except Exception as e:
         print(f"Error starting application: {str(e)}")
         messagebox.showerror("Error", f"Terjadi kesalahan saat memulai aplikasi:\n{str(e)}")
+    finally:
+        # Tutup koneksi Google Sheets yang masih terbuka; replika yang sama dengan yang dijalankan
+        # (get_log_replica() di sini bisa membuat replika baru bila backend sudah berganti)
+        if replica is not None:
+            replica.stop_background_sync()
+        close_sheets_service()
 
 
 if __name__ == "__main__":
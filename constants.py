@@ -182,4 +182,25 @@ STATUS_MESSAGES = {
     "searching": "Searching...",
     "found": "Found results",
     "not_found": "No results found"
-} 
\ No newline at end of file
+} 
+
+# Struktur kolom log disposisi di Google Sheets (34 kolom, A-AH, data mulai baris 6)
+ENHANCED_HEADER = [
+    "No. Agenda", "No. Surat", "Tgl. Surat", "Perihal", "Asal Surat", "Ditujukan",
+    "Klasifikasi", "Disposisi kepada", "Untuk Di :", "Selesai Tgl.", "Kode Klasifikasi",
+    "Tgl. Penerimaan", "Indeks", "Bicarakan dengan", "Teruskan kepada", "Harap Selesai Tanggal",
+    "Direktur Utama Instruksi", "Direktur Utama Tanggal", "Direktur Keuangan Instruksi", "Direktur Keuangan Tanggal",
+    "Direktur Teknik Instruksi", "Direktur Teknik Tanggal", "GM Keuangan & Administrasi Instruksi", "GM Keuangan & Administrasi Tanggal",
+    "GM Operasional & Pemeliharaan Instruksi", "GM Operasional & Pemeliharaan Tanggal",
+    "Manager Pemeliharaan Instruksi", "Manager Pemeliharaan Tanggal",
+    "Manager Operasional Instruksi", "Manager Operasional Tanggal",
+    "Manager Administrasi Instruksi", "Manager Administrasi Tanggal",
+    "Manager Keuangan Instruksi", "Manager Keuangan Tanggal"
+]
+LOG_SHEET_NAME = 'Sheet1'
+LOG_FIRST_ROW = 6  # Baris pertama data log (di bawah header multi-layer)
+# Kolom ringkasan A-P (No. Agenda s/d Harap Selesai Tanggal) dimuat langsung untuk daftar log;
+# kolom instruksi/tanggal per jabatan Q-AH hanya dimuat saat baris dibuka atau diekspor
+LOG_SUMMARY_COLUMNS = 16
+LOG_SUMMARY_LAST_COL = 'P'
+LOG_DETAIL_FIRST_COL = 'Q'
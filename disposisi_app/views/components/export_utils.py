@@ -145,7 +145,7 @@ def collect_form_data_safely(self):
 def save_to_pdf(self):
     import threading
     from tkinter import filedialog
-    import time, traceback, os, tempfile
+    import traceback, os, tempfile
     from pdf_output import save_form_to_pdf, merge_pdfs
     from sheet_logic import upload_to_sheet
     from disposisi_app.views.components.loading_screen import loading_manager, LoadingMessageBox
@@ -155,11 +155,6 @@ def save_to_pdf(self):
             # Show loading screen
             loading_manager.show_loading(self, "Saving to PDF...", True)
             
-            # Progress simulation
-            for i in range(1, 101):
-                time.sleep(0.02)
-                loading_manager.update_progress(i)
-            
             filepath = filedialog.asksaveasfilename(
                 defaultextension=".pdf",
                 filetypes=[("PDF Documents", "*.pdf"), ("All Files", "*.*")]
@@ -190,6 +185,7 @@ def save_to_pdf(self):
                 # Continue anyway if validation fails
             
             # Create PDF
+            loading_manager.update_progress(30, "Membuat PDF...")
             with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
                 temp_pdf_path = temp_pdf.name
             
@@ -209,6 +205,7 @@ def save_to_pdf(self):
                 print(f"[WARNING] Error removing temp file: {e}")
             
             # Upload to Google Sheets
+            loading_manager.update_progress(70, "Mengunggah ke Google Sheets...")
             try:
                 upload_to_sheet(self, call_from_pdf=True, data_override=data)
             except Exception as e:
@@ -239,7 +236,7 @@ def save_to_pdf(self):
 
 def save_to_sheet(self):
     import threading
-    import time, traceback
+    import traceback
     from sheet_logic import upload_to_sheet
     from disposisi_app.views.components.loading_screen import loading_manager, LoadingMessageBox
     
@@ -248,11 +245,6 @@ def save_to_sheet(self):
             # Show loading screen
             loading_manager.show_loading(self, "Saving to Sheet...", True)
             
-            # Progress simulation
-            for i in range(1, 101):
-                time.sleep(0.01)
-                loading_manager.update_progress(i)
-            
             # Safely collect form data
             data = collect_form_data_safely(self)
             
@@ -262,21 +254,9 @@ def save_to_sheet(self):
                 loading_manager.hide_loading()
                 return
             
-            # Check uniqueness
-            try:
-                from disposisi_app.views.components.validation import is_no_surat_unique
-                from google_sheets_connect import get_sheets_service, SHEET_ID
-                if not is_no_surat_unique(data.get("no_surat", ""), get_sheets_service, SHEET_ID):
-                    LoadingMessageBox.showerror("Validasi", "No. Surat sudah ada di sheet, harus unik!", parent=self)
-                    loading_manager.hide_loading()
-                    return
-            except Exception as e:
-                print(f"[WARNING] Error checking uniqueness: {e}")
-                LoadingMessageBox.showerror("Error", f"Error validasi: {e}", parent=self)
-                loading_manager.hide_loading()
-                return
-            
-            # Upload to sheet
+            # Upload to sheet (cek keunikan No. Surat dilakukan di dalam upload_to_sheet,
+            # digabung dengan pengecekan header dalam satu batchGet)
+            loading_manager.update_progress(50, "Mengunggah ke Google Sheets...")
             upload_to_sheet(self, call_from_pdf=False)
             
             loading_manager.hide_loading()
@@ -304,7 +284,8 @@ def safe_get_filter_value(widget, widget_name="unknown", default=""):
         print(f"[WARNING] Error getting filter value from {widget_name}: {e}")
         return default
 
-def export_excel_advanced(self, filepath):
+def export_excel_advanced(self, filepath, rows=None):
+    """Export rows (record dict per baris; default self.filtered_data) ke Excel dengan header multi-layer."""
     import openpyxl
     from openpyxl.styles import Alignment, Font, Border, Side
     from openpyxl.utils import get_column_letter
@@ -407,8 +388,10 @@ def export_excel_advanced(self, filepath):
         ]
         
         # Add data rows safely
-        if hasattr(self, 'filtered_data') and self.filtered_data:
-            for row in self.filtered_data:
+        if rows is None:
+            rows = getattr(self, 'filtered_data', None)
+        if rows:
+            for row in rows:
                 try:
                     row_data = []
                     for col in ENHANCED_HEADER:
@@ -206,6 +206,7 @@ class FinishDialog(tk.Toplevel):
         self.senior_officer_vars = {}
         self.senior_officer_frames = {}
         self.dropdown_buttons = {}  # Track dropdown buttons for state management
+        self._name_widgets = {}  # posisi -> (checkbutton, teks dasar) untuk diisi nama dari sheet admin
         
         if not self.disposisi_labels:
             no_data_frame = ttk.Frame(self.email_scrollable_frame)
@@ -269,17 +270,8 @@ class FinishDialog(tk.Toplevel):
             
             self.email_vars[label] = var  # Keep original label for email lookup
             
-            # Try to get name from admin sheet
-            try:
-                from email_sender.send_email import EmailSender
-                email_sender = EmailSender()
-                name, _ = email_sender.get_recipient_name(label)
-                if name:
-                    display_text = f"📋 {display_label} - {name}"
-                else:
-                    display_text = f"📋 {display_label}"
-            except:
-                display_text = f"📋 {display_label}"
+            # Nama dari sheet admin diisi setelah lookup async selesai (_load_recipient_names)
+            display_text = f"📋 {display_label}"
             
             # Main checkbox on the left
             main_cb = ttk.Checkbutton(
@@ -289,6 +281,7 @@ class FinishDialog(tk.Toplevel):
                 style="Manager.TCheckbutton"
             )
             main_cb.grid(row=0, column=0, sticky="w")
+            self._name_widgets[label] = (main_cb, display_text)
             
             # ENHANCED: Add senior officers if this is a manager position
             if label in senior_officer_map:
@@ -346,17 +339,7 @@ class FinishDialog(tk.Toplevel):
                     officer_frame = ttk.Frame(officers_grid)
                     officer_frame.pack(fill="x", pady=3)
                     
-                    # Try to get name for senior officer
-                    try:
-                        from email_sender.send_email import EmailSender
-                        email_sender = EmailSender()
-                        name, _ = email_sender.get_recipient_name(senior_officer)
-                        if name:
-                            display_text = f"👤 {senior_officer} - {name}"
-                        else:
-                            display_text = f"👤 {senior_officer}"
-                    except:
-                        display_text = f"👤 {senior_officer}"
+                    display_text = f"👤 {senior_officer}"
                     
                     senior_cb = ttk.Checkbutton(
                         officer_frame, 
@@ -365,6 +348,7 @@ class FinishDialog(tk.Toplevel):
                         style="Senior.TCheckbutton"
                     )
                     senior_cb.pack(anchor="w")
+                    self._name_widgets[senior_officer] = (senior_cb, display_text)
                 
                 # Add "Toggle All" functionality with better styling
                 def create_select_all_handler(manager_label):
@@ -432,6 +416,38 @@ class FinishDialog(tk.Toplevel):
                 
                 var.trace('w', lambda *args, label=label, frame=senior_frame, btn=dropdown_btn, exp=expanded_state: 
                          create_checkbox_handler(label, frame, btn, exp)())
+        
+        self._load_recipient_names()
+
+    def _get_email_sender(self):
+        """Satu EmailSender per dialog (inisialisasi membuka koneksi ke sheet admin)"""
+        if getattr(self, '_email_sender', None) is None:
+            self._email_sender = EmailSender()
+        return self._email_sender
+
+    def _load_recipient_names(self):
+        """Ambil nama semua posisi dalam satu batchGet di latar belakang, lalu perbarui label checkbox"""
+        from async_sheets import AsyncSheetsClient, run_in_tk
+        positions = list(self._name_widgets)
+        if not positions:
+            return
+
+        async def fetch_names():
+            email_sender = await AsyncSheetsClient().call(self._get_email_sender)
+            recipients = await email_sender.get_recipients_async(positions)
+            return {pos: info['name'] for pos, info in recipients.items()}
+
+        def apply_names(names):
+            for pos, name in names.items():
+                widget, base_text = self._name_widgets.get(pos, (None, None))
+                if widget is not None and name:
+                    try:
+                        widget.configure(text=f"{base_text} - {name}")
+                    except tk.TclError:
+                        pass  # dialog sudah ditutup
+
+        run_in_tk(self, fetch_names(), on_success=apply_names,
+                  on_error=lambda e: print(f"[FinishDialog] Gagal mengambil nama penerima: {e}"))
 
     def _toggle_email_frame(self):
         if self.send_email_var.get():
@@ -509,14 +525,12 @@ class FinishDialog(tk.Toplevel):
                             "Manager Keuangan": "Manager keu"
                         }
                         
-                        # Get names from email sender
-                        from email_sender.send_email import EmailSender
-                        email_sender = EmailSender()
+                        # Get names from email sender (satu batchGet untuk semua posisi)
+                        names = self._get_email_sender().get_recipient_names(selected_positions)
                         
                         display_recipients = []
                         for pos in selected_positions:
-                            # Try to get name from admin sheet
-                            name, _ = email_sender.get_recipient_name(pos)
+                            name = names.get(pos)
                             if name:
                                 display_name = f"{name} ({abbreviation_map.get(pos, pos)})"
                             else:
@@ -0,0 +1,83 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Tab Ringkasan membaca counter LogStore.aggregates (logic.log_aggregates); render ulang hanya
+# bila versi store berubah, dicek setiap DASHBOARD_REFRESH_MS selama tab terlihat
+DASHBOARD_REFRESH_MS = 1000
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "Mei", "Jun", "Jul", "Agu", "Sep", "Okt", "Nov", "Des"]
+
+def _make_table(parent, title, label_heading, height=8):
+    frame = ttk.LabelFrame(parent, text=title, padding=(6, 4))
+    tree = ttk.Treeview(frame, columns=("label", "count", "share"), show="headings", height=height)
+    tree.heading("label", text=label_heading)
+    tree.heading("count", text="Jumlah")
+    tree.heading("share", text="%")
+    tree.column("label", width=220, anchor="w")
+    tree.column("count", width=70, anchor="e")
+    tree.column("share", width=60, anchor="e")
+    scroll = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scroll.set)
+    tree.pack(side="left", fill="both", expand=True)
+    scroll.pack(side="right", fill="y")
+    return frame, tree
+
+def _fill(tree, rows, total):
+    tree.delete(*tree.get_children())
+    for label, count in rows:
+        share = f"{count * 100 / total:.1f}" if total else "0.0"
+        tree.insert("", "end", values=(label, count, share))
+
+class LogDashboard(ttk.Frame):
+    """
+    Tab ringkasan log disposisi: jumlah per Klasifikasi, per penerima Disposisi kepada dan per bulan
+    Tgl. Surat. Terbuka vs selesai belum ditampilkan: log belum punya penanda selesai (lihat
+    logic.log_aggregates); tenggat ditampilkan lewat filter Tenggat di tab Log. get_store: callable yang mengembalikan LogStore aktif (LogTab.store), sehingga ringkasan
+    selalu mengikuti data yang ditampilkan di tab Log.
+    """
+    def __init__(self, parent, get_store):
+        super().__init__(parent, padding=(10, 8))
+        self.get_store = get_store
+        self._shown = None  # (id(store), store.version) yang sedang ditampilkan
+
+        self.total_label = ttk.Label(self, text="", font=("Segoe UI", 11, "bold"))
+        self.total_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 8))
+
+        klasifikasi_frame, self.klasifikasi_tree = _make_table(self, "Per Klasifikasi", "Klasifikasi", height=5)
+        klasifikasi_frame.grid(row=1, column=0, sticky="nsew", padx=(0, 6), pady=(0, 6))
+        disposisi_frame, self.disposisi_tree = _make_table(self, "Per Disposisi kepada", "Penerima", height=5)
+        disposisi_frame.grid(row=1, column=1, sticky="nsew", pady=(0, 6))
+        month_frame, self.month_tree = _make_table(self, "Per Bulan (Tgl. Surat)", "Bulan", height=12)
+        month_frame.grid(row=2, column=0, columnspan=2, sticky="nsew")
+
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(2, weight=1)
+        self.bind("<Map>", lambda e: self.refresh())
+        self._poll()
+
+    def refresh(self, force=False):
+        """Tampilkan counter terbaru; tidak melakukan apa-apa bila store tidak berubah."""
+        store = self.get_store()
+        if store is None:
+            return
+        shown = (id(store), store.version)
+        if shown == self._shown and not force:
+            return
+        self._shown = shown
+        aggregates = store.aggregates
+        total = aggregates.total
+        self.total_label.config(text=f"Total {total} surat")
+        _fill(self.klasifikasi_tree, aggregates.by_klasifikasi(), total)
+        _fill(self.disposisi_tree, aggregates.by_disposisi(), total)
+        # Bulan terbaru di atas
+        months = [(f"{MONTH_NAMES[month - 1]} {year}" if 1 <= month <= 12 else str(year), count)
+                  for (year, month), count in reversed(aggregates.by_month())]
+        _fill(self.month_tree, months, total)
+
+    def _poll(self):
+        try:
+            if self.winfo_ismapped():
+                self.refresh()
+            self.after(DASHBOARD_REFRESH_MS, self._poll)
+        except tk.TclError:
+            pass  # tab sudah dihancurkan
@@ -0,0 +1,124 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from api_metrics import api_metrics
+from api_rate_limiter import rate_limiter
+
+SUMMARY_COLUMNS = [
+    ("service", "Layanan", 70),
+    ("op", "Operasi", 150),
+    ("count", "Jumlah", 60),
+    ("errors", "Error", 50),
+    ("retries", "Retry", 50),
+    ("rows", "Baris", 60),
+    ("bytes", "Byte", 80),
+    ("avg", "Rata2 (s)", 70),
+    ("p50", "p50 (s)", 60),
+    ("p95", "p95 (s)", 60),
+    ("max", "Max (s)", 60),
+]
+RECENT_COLUMNS = [
+    ("time", "Waktu", 130),
+    ("service", "Layanan", 70),
+    ("op", "Operasi", 130),
+    ("target", "Range/Target", 170),
+    ("rows", "Baris", 55),
+    ("bytes", "Byte", 70),
+    ("latency", "Latency (s)", 75),
+    ("retries", "Retry", 50),
+    ("ok", "OK", 40),
+]
+RECENT_LIMIT = 200
+STATUS_REFRESH_MS = 5000
+
+def _make_tree(parent, columns):
+    frame = ttk.Frame(parent)
+    tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings", height=8)
+    for key, label, width in columns:
+        tree.heading(key, text=label)
+        tree.column(key, width=width, anchor="w" if key in ("service", "op", "target", "time") else "e")
+    scroll = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=scroll.set)
+    tree.pack(side="left", fill="both", expand=True)
+    scroll.pack(side="right", fill="y")
+    return frame, tree
+
+def show_api_metrics(parent):
+    """Jendela ringkasan latency/payload panggilan Google Sheets, SMTP dan PDF."""
+    window = tk.Toplevel(parent)
+    window.title("Statistik API")
+    window.geometry("900x560")
+    try:
+        window.iconbitmap('JapekELEVATED.ico')
+    except:
+        pass
+
+    ttk.Label(window, text="Ringkasan per operasi", font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=10, pady=(10, 2))
+    summary_frame, summary_tree = _make_tree(window, SUMMARY_COLUMNS)
+    summary_frame.pack(fill="both", expand=True, padx=10)
+
+    limiter_label = ttk.Label(window, text="", font=("Segoe UI", 9))
+    limiter_label.pack(anchor="w", padx=10, pady=(4, 0))
+
+    ttk.Label(window, text=f"{RECENT_LIMIT} panggilan terakhir", font=("Segoe UI", 10, "bold")).pack(anchor="w", padx=10, pady=(10, 2))
+    recent_frame, recent_tree = _make_tree(window, RECENT_COLUMNS)
+    recent_frame.pack(fill="both", expand=True, padx=10)
+
+    def refresh():
+        summary_tree.delete(*summary_tree.get_children())
+        for row in api_metrics.summary():
+            summary_tree.insert("", "end", values=[row[key] for key, _, _ in SUMMARY_COLUMNS])
+        recent_tree.delete(*recent_tree.get_children())
+        for row in reversed(api_metrics.recent(RECENT_LIMIT)):
+            recent_tree.insert("", "end", values=[row[key] for key, _, _ in RECENT_COLUMNS])
+        stats = rate_limiter.stats()
+        limiter_label.config(text=(
+            f"Rate limiter: {stats['requests']} request, {stats['retries']} retry, "
+            f"{stats['rate_limited']}x 429, tertahan {stats['throttled_seconds']:.1f}s, "
+            f"backoff {stats['backoff_seconds']:.1f}s"))
+
+    def export(kind):
+        path = filedialog.asksaveasfilename(
+            parent=window,
+            defaultextension=f".{kind}",
+            filetypes=[(kind.upper(), f"*.{kind}"), ("All Files", "*.*")],
+            title="Export Statistik API")
+        if not path:
+            return
+        try:
+            if kind == "json":
+                api_metrics.export_json(path)
+            else:
+                api_metrics.export_csv(path)
+            messagebox.showinfo("Export", f"Statistik disimpan ke {path}", parent=window)
+        except Exception as e:
+            messagebox.showerror("Export", f"Gagal menyimpan statistik: {e}", parent=window)
+
+    def reset():
+        api_metrics.reset()
+        rate_limiter.reset_stats()
+        refresh()
+
+    buttons = ttk.Frame(window)
+    buttons.pack(fill="x", padx=10, pady=10)
+    ttk.Button(buttons, text="Refresh", command=refresh).pack(side="left")
+    ttk.Button(buttons, text="Export JSON", command=lambda: export("json")).pack(side="left", padx=(6, 0))
+    ttk.Button(buttons, text="Export CSV", command=lambda: export("csv")).pack(side="left", padx=(6, 0))
+    ttk.Button(buttons, text="Reset", command=reset).pack(side="left", padx=(6, 0))
+    ttk.Button(buttons, text="Tutup", command=window.destroy).pack(side="right")
+
+    refresh()
+    return window
+
+def attach_metrics_label(label):
+    """Perbarui label status bar dengan ringkasan panggilan API setiap STATUS_REFRESH_MS."""
+    def update():
+        try:
+            count, errors, latency = api_metrics.totals()
+            text = f"API: {count} panggilan, {latency:.1f}s"
+            if errors:
+                text += f", {errors} error"
+            label.config(text=text)
+            label.after(STATUS_REFRESH_MS, update)
+        except tk.TclError:
+            pass  # label sudah dihancurkan
+    update()
@@ -1,10 +1,15 @@
+def is_no_surat_in_values(no_surat, values):
+    """True jika no_surat ada di hasil baca kolom No. Surat (list of rows)."""
+    no_surat = str(no_surat).strip()
+    return any(row and str(row[0]).strip() == no_surat for row in values)
+
 def is_no_surat_unique(no_surat, get_sheets_service, SHEET_ID):
-    service = get_sheets_service()
-    range_name = 'Sheet1!B6:B'  # Kolom B = No. Surat
-    result = service.spreadsheets().values().get(
-        spreadsheetId=SHEET_ID,
-        range=range_name
-    ).execute()
-    values = result.get('values', []) or []
-    no_surat_list = [str(row[0]).strip() for row in values if row and len(row) > 0]
-    return str(no_surat).strip() not in no_surat_list 
\ No newline at end of file
+    # Cek di replika lokal bila sudah pernah disinkronkan; upload tetap memeriksa ulang di sheet
+    from constants import LOG_SHEET_NAME, LOG_FIRST_ROW
+    from logic.log_replica import get_log_replica
+    replica = get_log_replica()
+    if replica.last_synced is not None:
+        return not replica.no_surat_exists(no_surat)
+    range_name = f'{LOG_SHEET_NAME}!B{LOG_FIRST_ROW}:B'  # Kolom B = No. Surat
+    values = replica.backend.get_range(range_name)
+    return not is_no_surat_in_values(no_surat, values)
@@ -0,0 +1,256 @@
+from tkinter import ttk
+
+WHEEL_ROWS = 3  # baris per notch scroll mouse
+
+class VirtualTreeview:
+    """
+    Mode tampilan virtual untuk ttk.Treeview: seluruh data tetap di memori (di pemilik),
+    tetapi Treeview hanya berisi baris yang terlihat di viewport. Item Treeview dipakai ulang
+    saat menggulir sehingga biaya render tidak bergantung pada jumlah data (50k+ baris).
+
+    - row_values(index) -> list nilai kolom untuk baris ke-index (0-based, urutan tampilan)
+    - Seleksi disimpan sebagai index absolut, tetap terjaga walaupun baris keluar dari viewport
+    - activate()/deactivate() memasang/melepas mode virtual tanpa membuat ulang widget
+    """
+    def __init__(self, tree, scrollbar, row_values, row_tags=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.row_tags = row_tags or (lambda index: ('evenrow' if index % 2 == 0 else 'oddrow',))
+        self.total = 0
+        self.offset = 0
+        self.visible = max(1, int(tree.cget('height') or 1))
+        self.selected = set()
+        self.cursor = None
+        self.anchor = None
+        self.active = False
+        self._iids = []
+        self._tag = f"VirtualTree{id(self)}"
+        self._bind_class()
+
+    # --- pemasangan mode ---
+    def _bind_class(self):
+        bind = lambda seq, func: self.tree.bind_class(self._tag, seq, func)
+        bind("<MouseWheel>", lambda e: self.scroll_rows(-WHEEL_ROWS if e.delta > 0 else WHEEL_ROWS))
+        bind("<Button-4>", lambda e: self.scroll_rows(-WHEEL_ROWS))
+        bind("<Button-5>", lambda e: self.scroll_rows(WHEEL_ROWS))
+        bind("<Configure>", self._on_configure)
+        bind("<<TreeviewSelect>>", self._on_select)
+        bind("<Button-1>", self._on_plain_click)
+        bind("<Up>", lambda e: self._move(-1, extend=False))
+        bind("<Down>", lambda e: self._move(1, extend=False))
+        bind("<Shift-Up>", lambda e: self._move(-1, extend=True))
+        bind("<Shift-Down>", lambda e: self._move(1, extend=True))
+        bind("<Prior>", lambda e: self._move(-self.visible, extend=False))
+        bind("<Next>", lambda e: self._move(self.visible, extend=False))
+        bind("<Home>", lambda e: self._move(-self.total, extend=False))
+        bind("<End>", lambda e: self._move(self.total, extend=False))
+
+    def activate(self):
+        if self.active:
+            return
+        self.active = True
+        self.tree.bindtags((self._tag,) + tuple(t for t in self.tree.bindtags() if t != self._tag))
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self.yview)
+        self.tree.delete(*self.tree.get_children())
+        self._iids = []
+        self._resize(self.tree.winfo_height())
+
+    def deactivate(self):
+        if not self.active:
+            return
+        self.active = False
+        self.tree.bindtags(tuple(t for t in self.tree.bindtags() if t != self._tag))
+        self.tree.delete(*self.tree.get_children())
+        self._iids = []
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+        self.selected.clear()
+        self.cursor = self.anchor = None
+
+    # --- data & render ---
+    def set_total(self, total, keep_position=False):
+        """Dipanggil pemilik setelah data/filter berubah."""
+        self.total = total
+        if not keep_position:
+            self.offset = 0
+            self.selected.clear()
+            self.cursor = self.anchor = None
+        else:
+            self.selected = {i for i in self.selected if i < total}
+        self.render()
+
+    def _clamp_offset(self):
+        self.offset = max(0, min(self.offset, self.total - self.visible))
+
+    def render(self):
+        if not self.active:
+            return
+        self._clamp_offset()
+        count = max(0, min(self.visible, self.total - self.offset))
+        while len(self._iids) > count:
+            self.tree.delete(self._iids.pop())
+        while len(self._iids) < count:
+            self._iids.append(self.tree.insert("", "end"))
+        for slot, iid in enumerate(self._iids):
+            index = self.offset + slot
+            self.tree.item(iid, values=self.row_values(index), tags=self.row_tags(index))
+        self.tree.selection_set([iid for slot, iid in enumerate(self._iids) if self.offset + slot in self.selected])
+        if self.cursor is not None and self.offset <= self.cursor < self.offset + count:
+            self.tree.focus(self._iids[self.cursor - self.offset])
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        if self.total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self.offset / self.total
+        last = min(1.0, (self.offset + self.visible) / self.total)
+        self.scrollbar.set(first, last)
+
+    def _on_configure(self, event):
+        self._resize(event.height)
+
+    def _resize(self, height):
+        if height <= 1:
+            return  # widget belum dipetakan
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Perkiraan tinggi heading; dikoreksi setelah render bila baris terakhir terpotong
+        visible = max(1, (height - row_height) // row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+            self.tree.after_idle(self._fit_viewport)
+
+    def _fit_viewport(self):
+        """Kurangi jumlah baris bila baris terakhir tidak tampil penuh di viewport."""
+        while self.active and self._iids and self.visible > 1 and not self.tree.bbox(self._iids[-1]):
+            self.visible -= 1
+            self.render()
+
+    # --- scroll ---
+    def yview(self, *args):
+        """Handler command scrollbar (moveto/scroll) dalam satuan baris data."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self.visible if len(args) > 2 and args[2] == "pages" else 1
+            self.offset += amount * step
+        self.render()
+
+    def scroll_rows(self, amount):
+        self.offset += amount
+        self.render()
+        return "break"
+
+    def see(self, index):
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible:
+            self.offset = index - self.visible + 1
+        self.render()
+
+    # --- seleksi ---
+    def index_of(self, iid):
+        """Index absolut untuk item Treeview yang sedang tampil, atau None."""
+        try:
+            return self.offset + self._iids.index(iid)
+        except ValueError:
+            return None
+
+    def selected_indices(self):
+        return sorted(self.selected)
+
+    def _on_plain_click(self, event):
+        # Klik biasa (tanpa Ctrl/Shift) mengganti seleksi, termasuk baris di luar viewport
+        if not (event.state & 0x0005):
+            self.selected.clear()
+
+    def _on_select(self, event=None):
+        current = set(self.tree.selection())
+        for slot, iid in enumerate(self._iids):
+            index = self.offset + slot
+            if iid in current:
+                self.selected.add(index)
+            else:
+                self.selected.discard(index)
+        focus = self.tree.focus()
+        if focus:
+            index = self.index_of(focus)
+            if index is not None:
+                self.cursor = index
+                if self.anchor is None or len(self.selected) <= 1:
+                    self.anchor = index
+
+    def _move(self, delta, extend):
+        if self.total == 0:
+            return "break"
+        if self.cursor is None:
+            target = 0 if delta > 0 else self.total - 1
+        else:
+            target = max(0, min(self.total - 1, self.cursor + delta))
+        if extend and self.anchor is not None:
+            low, high = sorted((self.anchor, target))
+            self.selected = set(range(low, high + 1))
+        else:
+            self.selected = {target}
+            self.anchor = target
+        self.cursor = target
+        self.see(target)
+        return "break"
+
+class KeyedTreeRows:
+    """
+    Isi ttk.Treeview berdasarkan kunci baris yang stabil (mis. index LogStore) untuk mode paging.
+    Menyimpan pemetaan kunci -> (iid, values, tags) sehingga sync() hanya menyisipkan,
+    menghapus, memindahkan atau memperbarui item yang memang berubah, bukan hapus-semua/isi-ulang.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.items = {}    # kunci -> (iid, values, tags)
+        self._keys = {}    # iid -> kunci
+
+    def sync(self, rows):
+        """rows: iterable (kunci, values(tuple), tags(tuple)) sesuai urutan tampil."""
+        rows = list(rows)
+        wanted = {key for key, _, _ in rows}
+        stale = [key for key in self.items if key not in wanted]
+        if stale:
+            self.tree.delete(*[self.items[key][0] for key in stale])
+            for key in stale:
+                del self._keys[self.items.pop(key)[0]]
+        order = []
+        for key, values, tags in rows:
+            entry = self.items.get(key)
+            if entry is None:
+                iid = self.tree.insert("", "end", values=values, tags=tags)
+                self._keys[iid] = key
+            else:
+                iid, old_values, old_tags = entry
+                if old_values != values or old_tags != tags:
+                    self.tree.item(iid, values=values, tags=tags)
+            self.items[key] = (iid, values, tags)
+            order.append(iid)
+        # Pindahkan hanya bila urutan berubah (mis. halaman berganti sebagian atau data diurutkan)
+        if list(self.tree.get_children()) != order:
+            for pos, iid in enumerate(order):
+                self.tree.move(iid, "", pos)
+
+    def clear(self):
+        """Hapus semua item yang dikelola (mis. sebelum beralih ke mode virtual)."""
+        iids = [iid for iid in self._keys if self.tree.exists(iid)]
+        if iids:
+            self.tree.delete(*iids)
+        self.items.clear()
+        self._keys.clear()
+
+    def key_of(self, iid):
+        return self._keys.get(iid)
+
+    def iid_of(self, key):
+        entry = self.items.get(key)
+        return entry[0] if entry else None
@@ -1,22 +1,10 @@
 import traceback
 import logging
-from google_sheets_connect import get_sheets_service, SHEET_ID, update_row_in_sheet
+from constants import ENHANCED_HEADER, LOG_SHEET_NAME, LOG_FIRST_ROW
+from logic.log_replica import get_log_replica
 
 logging.basicConfig(level=logging.WARNING)
 
-ENHANCED_HEADER = [
-    "No. Agenda", "No. Surat", "Tgl. Surat", "Perihal", "Asal Surat", "Ditujukan", 
-    "Klasifikasi", "Disposisi kepada", "Untuk Di :", "Selesai Tgl.", "Kode Klasifikasi", 
-    "Tgl. Penerimaan", "Indeks", "Bicarakan dengan", "Teruskan kepada", "Harap Selesai Tanggal",
-    "Direktur Utama Instruksi", "Direktur Utama Tanggal", "Direktur Keuangan Instruksi", "Direktur Keuangan Tanggal",
-    "Direktur Teknik Instruksi", "Direktur Teknik Tanggal", "GM Keuangan & Administrasi Instruksi", "GM Keuangan & Administrasi Tanggal",
-    "GM Operasional & Pemeliharaan Instruksi", "GM Operasional & Pemeliharaan Tanggal", 
-    "Manager Pemeliharaan Instruksi", "Manager Pemeliharaan Tanggal",
-    "Manager Operasional Instruksi", "Manager Operasional Tanggal",
-    "Manager Administrasi Instruksi", "Manager Administrasi Tanggal",
-    "Manager Keuangan Instruksi", "Manager Keuangan Tanggal"
-]
-
 # Field mapping for consistent data conversion
 FIELD_MAPPING = {
     "Tgl. Surat": "tgl_surat",
@@ -103,64 +91,47 @@ def safe_get_value(data, key, default=""):
 
 # Ambil satu entry log dari Google Sheets berdasarkan No. Surat (bukan No. Agenda)
 def get_log_entry_by_no_surat(no_surat):
-    service = get_sheets_service()
-    range_name = 'Sheet1!A6:AH'  # Changed from AB to AH for 34 columns
-    result = service.spreadsheets().values().get(
-        spreadsheetId=SHEET_ID,
-        range=range_name
-    ).execute()
-    values = result.get('values', [])
-    for row in values:
-        row = row + ["" for _ in range(len(ENHANCED_HEADER) - len(row))]
-        if row[1] == no_surat:
-            data = {ENHANCED_HEADER[i]: row[i] for i in range(len(ENHANCED_HEADER))}
-            # Konversi instruksi jabatan ke list of dict
-            instruksi_jabatan_map = [
-                ("Direktur Utama Instruksi", "Direktur Utama", "Direktur Utama Tanggal"),
-                ("Direktur Keuangan Instruksi", "Direktur Keuangan", "Direktur Keuangan Tanggal"),
-                ("Direktur Teknik Instruksi", "Direktur Teknik", "Direktur Teknik Tanggal"),
-                ("GM Keuangan & Administrasi Instruksi", "GM Keuangan & Administrasi", "GM Keuangan & Administrasi Tanggal"),
-                ("GM Operasional & Pemeliharaan Instruksi", "GM Operasional & Pemeliharaan", "GM Operasional & Pemeliharaan Tanggal"),
-                ("Manager Pemeliharaan Instruksi", "Manager Pemeliharaan", "Manager Pemeliharaan Tanggal"),
-                ("Manager Operasional Instruksi", "Manager Operasional", "Manager Operasional Tanggal"),
-                ("Manager Administrasi Instruksi", "Manager Administrasi", "Manager Administrasi Tanggal"),
-                ("Manager Keuangan Instruksi", "Manager Keuangan", "Manager Keuangan Tanggal")
-            ]
-            instruksi_from_log = []
-            for instr_col, posisi_label, tgl_col in instruksi_jabatan_map:
-                instruksi_val = data.get(instr_col, "").strip()
-                tgl_val = data.get(tgl_col, "").strip()
-                if instruksi_val:
-                    instruksi_from_log.append({
-                        "posisi": posisi_label,
-                        "instruksi": instruksi_val,
-                        "tanggal": tgl_val
-                    })
-            data["isi_instruksi"] = instruksi_from_log
-            return data
-    return None
+    # Kolom kunci dulu, lalu hanya baris yang cocok (lihat LogReplica.get_full_row)
+    found = get_log_replica().get_full_row(no_surat)
+    if found is None:
+        return None
+    row = found[1]
+    data = {ENHANCED_HEADER[i]: row[i] for i in range(len(ENHANCED_HEADER))}
+    # Konversi instruksi jabatan ke list of dict
+    instruksi_jabatan_map = [
+        ("Direktur Utama Instruksi", "Direktur Utama", "Direktur Utama Tanggal"),
+        ("Direktur Keuangan Instruksi", "Direktur Keuangan", "Direktur Keuangan Tanggal"),
+        ("Direktur Teknik Instruksi", "Direktur Teknik", "Direktur Teknik Tanggal"),
+        ("GM Keuangan & Administrasi Instruksi", "GM Keuangan & Administrasi", "GM Keuangan & Administrasi Tanggal"),
+        ("GM Operasional & Pemeliharaan Instruksi", "GM Operasional & Pemeliharaan", "GM Operasional & Pemeliharaan Tanggal"),
+        ("Manager Pemeliharaan Instruksi", "Manager Pemeliharaan", "Manager Pemeliharaan Tanggal"),
+        ("Manager Operasional Instruksi", "Manager Operasional", "Manager Operasional Tanggal"),
+        ("Manager Administrasi Instruksi", "Manager Administrasi", "Manager Administrasi Tanggal"),
+        ("Manager Keuangan Instruksi", "Manager Keuangan", "Manager Keuangan Tanggal")
+    ]
+    instruksi_from_log = []
+    for instr_col, posisi_label, tgl_col in instruksi_jabatan_map:
+        instruksi_val = data.get(instr_col, "").strip()
+        tgl_val = data.get(tgl_col, "").strip()
+        if instruksi_val:
+            instruksi_from_log.append({
+                "posisi": posisi_label,
+                "instruksi": instruksi_val,
+                "tanggal": tgl_val
+            })
+    data["isi_instruksi"] = instruksi_from_log
+    return data
 
 # Overwrite baris di Google Sheets sesuai No. Surat dengan data_baru
-def update_log_entry(data_lama, data_baru):
+# row_pos: posisi baris yang sudah diverifikasi pemanggil (mis. pre-check edit tab), opsional
+def update_log_entry(data_lama, data_baru, row_pos=None):
     try:
-        service = get_sheets_service()
-        range_name = 'Sheet1!A6:AH'  # Changed from AB to AH for 34 columns
-        result = service.spreadsheets().values().get(
-            spreadsheetId=SHEET_ID,
-            range=range_name
-        ).execute()
-        values = result.get('values', []) or []
-        idx = -1
+        replica = get_log_replica()
         no_surat_lama = safe_get_value(data_lama, "No. Surat")
-        
-        # Find the row to update
-        for i, row in enumerate(values):
-            row_full = row + ["" for _ in range(len(ENHANCED_HEADER) - len(row))]
-            if str(row_full[1]).strip() == no_surat_lama:
-                idx = i
-                break
-        
-        if idx == -1:
+
+        # Cari baris dari replika lokal, diverifikasi satu sel di sheet sebelum ditimpa
+        idx = row_pos if row_pos is not None else replica.locate_for_write(no_surat_lama)
+        if idx is None:
             raise Exception(f"Data dengan No. Surat '{no_surat_lama}' tidak ditemukan di sheet, tidak bisa update.")
 
         # ROBUST MERGE: Gabungkan data_lama dan data_baru agar field yang tidak diubah tetap ada
@@ -306,7 +277,8 @@ def update_log_entry(data_lama, data_baru):
                 print(f"[WARNING] Error processing column {col}: {e}")
                 row_data.append("")  # Add empty value to maintain column alignment
 
-        print(f"[update_log_entry] Updating row {idx+6} with {len(row_data)} columns")
+        row_number = idx + LOG_FIRST_ROW  # idx 0 = baris pertama data log
+        print(f"[update_log_entry] Updating row {row_number} with {len(row_data)} columns")
         print(f"[update_log_entry] Expected columns: {len(ENHANCED_HEADER)}")
         
         # Ensure we have exactly 34 columns for Google Sheets (A-AH)
@@ -317,8 +289,9 @@ def update_log_entry(data_lama, data_baru):
         print(f"[update_log_entry] Final row data length: {len(row_data)} (should be 34)")
         print(f"[update_log_entry] Row data preview: {row_data[:5]}...")  # Show first 5 columns
         
-        # Update the row
-        update_row_in_sheet(row_data, idx+1)  # idx+1 karena row_number mulai dari 1 = baris ke-6
+        # Update the row: replika (dan tab Log) diperbarui lebih dulu, dikembalikan jika penulisan gagal
+        with replica.optimistic_update(idx, row_data):
+            replica.backend.update_range(f'{LOG_SHEET_NAME}!A{row_number}:AH{row_number}', [row_data])
         
         print(f"[update_log_entry] Successfully updated row for No. Surat: {no_surat_lama}")
         return True
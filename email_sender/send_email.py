@@ -5,9 +5,8 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
 from pathlib import Path
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 import os
+import sys
 
 # Import from other files in the same package
 try:
@@ -16,6 +15,18 @@ except ImportError:
     # Fallback for direct execution
     import config
 
+try:
+    from google_sheets_connect import get_service_pool, execute_request
+except ImportError:
+    # Fallback for direct execution
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from google_sheets_connect import get_service_pool, execute_request
+from sheets_backend import GoogleSheetsBackend
+from async_sheets import AsyncSheetsClient
+from api_metrics import api_metrics
+
+ADMIN_SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+
 class EmailSender:
     def __init__(self):
         self.sender_email = config.EMAIL_HOST_USER
@@ -24,8 +35,8 @@ class EmailSender:
         # Initialize admin_sheet_id BEFORE using it
         self.admin_sheet_id = config.ADMIN_SHEET_ID
         
-        # Initialize sheets service
-        self.sheets_service = self._get_sheets_service()
+        # Initialize sheets service pool (shared with the rest of the process)
+        self._sheets_pool = self._get_sheets_pool()
         
         # ENHANCED: Position to cell mapping including senior officers
         # Updated to use correct sheet structure: A=posisi, B=nama, C=email, D=last_updated
@@ -77,8 +88,26 @@ class EmailSender:
             "Senior Officer Keuangan 2": "B18"
         }
 
-    def _get_sheets_service(self):
-        """Initialize Google Sheets service with admin credentials"""
+    @property
+    def sheets_service(self):
+        """Service for the calling thread, taken from the shared pool (None if unavailable)"""
+        if not self._sheets_pool:
+            return None
+        try:
+            return self._sheets_pool.get_service()
+        except Exception as e:
+            print(f"Error getting sheets service: {e}")
+            return None
+
+    @property
+    def admin_backend(self):
+        """SheetsBackend read-only untuk sheet admin (None jika service tidak tersedia)"""
+        if not self._sheets_pool:
+            return None
+        return GoogleSheetsBackend(self.admin_sheet_id, service_factory=self._sheets_pool.get_service)
+
+    def _get_sheets_pool(self):
+        """Initialize Google Sheets service pool with admin credentials"""
         try:
             # Use absolute path for credentials
             current_dir = Path(__file__).parent.parent
@@ -105,19 +134,17 @@ class EmailSender:
             
             print(f"Using credentials from: {credentials_path}")
             
-            creds = Credentials.from_service_account_file(
-                str(credentials_path),
-                scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-            )
-            service = build('sheets', 'v4', credentials=creds)
+            pool = get_service_pool(str(credentials_path), scopes=ADMIN_SCOPES)
+            service = pool.get_service()
             
             # Test the connection
             try:
-                sheet_metadata = service.spreadsheets().get(
-                    spreadsheetId=self.admin_sheet_id
-                ).execute()
+                sheet_metadata = execute_request(service.spreadsheets().get(
+                    spreadsheetId=self.admin_sheet_id,
+                    fields='properties.title'
+                ))
                 print(f"✓ Connected to admin sheet: {sheet_metadata.get('properties', {}).get('title', 'Unknown')}")
-                return service
+                return pool
             except Exception as e:
                 print(f"Error: Cannot access admin sheet {self.admin_sheet_id}: {e}")
                 return None
@@ -144,10 +171,10 @@ class EmailSender:
         try:
             # Read the specific cell from admin sheet
             range_name = f'Sheet1!{cell_ref}'
-            result = self.sheets_service.spreadsheets().values().get(
+            result = execute_request(self.sheets_service.spreadsheets().values().get(
                 spreadsheetId=self.admin_sheet_id,
                 range=range_name
-            ).execute()
+            ))
             
             values = result.get('values', [])
             if not values or not values[0] or not values[0][0]:
@@ -180,10 +207,10 @@ class EmailSender:
         try:
             # Read the specific cell from admin sheet
             range_name = f'Sheet1!{cell_ref}'
-            result = self.sheets_service.spreadsheets().values().get(
+            result = execute_request(self.sheets_service.spreadsheets().values().get(
                 spreadsheetId=self.admin_sheet_id,
                 range=range_name
-            ).execute()
+            ))
             
             values = result.get('values', [])
             if not values or not values[0] or not values[0][0]:
@@ -203,6 +230,61 @@ class EmailSender:
             print(f"[EmailSender] {error_msg}")
             return None, error_msg
 
+    @staticmethod
+    def _is_valid_email(email):
+        return '@' in email and '.' in email.split('@')[-1] and len(email) > 5
+
+    def get_recipients(self, positions):
+        """
+        Fetch email and name for several positions with one batchGet on the admin sheet.
+        Returns: dict position -> {'email', 'name', 'message'} (email/name None if not found)
+        """
+        positions = list(dict.fromkeys(positions))
+        backend = self.admin_backend
+        if backend is None:
+            msg = "Google Sheets service not available. Check credentials/credentials.json file."
+            return {pos: {'email': None, 'name': None, 'message': msg} for pos in positions}
+        
+        known = [pos for pos in positions
+                 if pos in self.position_cell_mapping and pos in self.position_name_cell_mapping]
+        ranges = []
+        for pos in known:
+            ranges.append(f'Sheet1!{self.position_cell_mapping[pos]}')
+            ranges.append(f'Sheet1!{self.position_name_cell_mapping[pos]}')
+        
+        results = {pos: {'email': None, 'name': None, 'message': f"Position '{pos}' not found in mapping"}
+                   for pos in positions}
+        try:
+            values = backend.batch_get(ranges) if ranges else []
+        except Exception as e:
+            error_msg = f"Error reading email data from admin sheet: {str(e)}"
+            print(f"[EmailSender] {error_msg}")
+            for pos in known:
+                results[pos]['message'] = error_msg
+            return results
+        
+        for i, pos in enumerate(known):
+            email_values, name_values = values[2 * i], values[2 * i + 1]
+            email = str(email_values[0][0]).strip() if email_values and email_values[0] else ""
+            name = str(name_values[0][0]).strip() if name_values and name_values[0] else ""
+            results[pos]['name'] = name or None
+            if not email:
+                results[pos]['message'] = f"No email found in cell {self.position_cell_mapping[pos]} for position: {pos}"
+            elif self._is_valid_email(email):
+                results[pos]['email'] = email
+                results[pos]['message'] = f"Email found: {email}"
+            else:
+                results[pos]['message'] = f"Invalid email format for {pos}: {email}"
+        return results
+
+    async def get_recipients_async(self, positions):
+        """Async version of get_recipients, runs on the shared Sheets thread pool"""
+        return await AsyncSheetsClient(self.admin_backend).call(self.get_recipients, positions)
+
+    def get_recipient_names(self, positions):
+        """Names for several positions in one round trip: dict position -> name (or None)"""
+        return {pos: info['name'] for pos, info in self.get_recipients(positions).items()}
+
     def get_all_position_emails(self):
         """ENHANCED: Fetch all position emails including senior officers from the admin sheet"""
         if not self.sheets_service:
@@ -211,12 +293,11 @@ class EmailSender:
         emails = {}
         errors = []
         
-        for position, cell_ref in self.position_cell_mapping.items():
-            email, msg = self.get_recipient_email(position)
-            if email:
-                emails[position] = email
+        for position, info in self.get_recipients(self.position_cell_mapping.keys()).items():
+            if info['email']:
+                emails[position] = info['email']
             else:
-                errors.append(f"{position}: {msg}")
+                errors.append(f"{position}: {info['message']}")
         
         return emails, errors
 
@@ -282,17 +363,25 @@ class EmailSender:
             # Send the email using SMTP
             print(f"Connecting to SMTP server {config.EMAIL_HOST}:{config.EMAIL_PORT}...")
             
-            if config.EMAIL_PORT == 465:
-                # Use SSL
-                with smtplib.SMTP_SSL(config.EMAIL_HOST, config.EMAIL_PORT) as server:
-                    server.login(self.sender_email, self.sender_password)
-                    server.sendmail(self.sender_email, valid_recipients, msg.as_string())
-            else:
-                # Use TLS
-                with smtplib.SMTP(config.EMAIL_HOST, config.EMAIL_PORT) as server:
-                    server.starttls()
+            payload = msg.as_string()
+            smtp_target = f"{config.EMAIL_HOST}:{config.EMAIL_PORT}"
+            # Koneksi+login dan pengiriman diukur terpisah (lihat api_metrics)
+            with api_metrics.track('smtp', 'connect', smtp_target):
+                if config.EMAIL_PORT == 465:
+                    # Use SSL
+                    server = smtplib.SMTP_SSL(config.EMAIL_HOST, config.EMAIL_PORT)
+                else:
+                    # Use TLS
+                    server = smtplib.SMTP(config.EMAIL_HOST, config.EMAIL_PORT)
+            with server:
+                with api_metrics.track('smtp', 'login', smtp_target):
+                    if config.EMAIL_PORT != 465:
+                        server.starttls()
                     server.login(self.sender_email, self.sender_password)
-                    server.sendmail(self.sender_email, valid_recipients, msg.as_string())
+                with api_metrics.track('smtp', 'sendmail', smtp_target) as call:
+                    call.rows = len(valid_recipients)
+                    call.bytes = len(payload)
+                    server.sendmail(self.sender_email, valid_recipients, payload)
             
             return True, f"Email sent successfully to: {', '.join(valid_recipients)}"
             
@@ -329,10 +418,10 @@ class EmailSender:
         
         print(f"[DEBUG] Looking up emails and names for positions: {positions}")
         
+        # Satu batchGet untuk semua posisi (sebelumnya 2 request per posisi)
+        recipients = self.get_recipients(positions)
         for position in positions:
-            print(f"[DEBUG] Looking up email and name for: {position}")
-            email, email_msg = self.get_recipient_email(position)
-            name, name_msg = self.get_recipient_name(position)
+            email, email_msg, name = recipients[position]['email'], recipients[position]['message'], recipients[position]['name']
             
             if email:
                 recipient_emails.append(email)
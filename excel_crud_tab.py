@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import logging
-from google_sheets_connect import get_sheets_service, SHEET_ID
-from constants import FIELD_LABELS, ALL_FIELDS
+from constants import FIELD_LABELS, ALL_FIELDS, ENHANCED_HEADER, LOG_SHEET_NAME, LOG_SUMMARY_COLUMNS, LOG_FIRST_ROW
+from logic.log_replica import get_log_replica
+from logic.log_store import LogStore
+from logic.log_ingest import DATE_COLUMNS, excel_serial_to_date, log_value_columns, row_to_log_values
+from logic.log_query import LogQuery
+from logic.deadline_index import OVERDUE_WINDOW_DAYS, POSITIONS
+from logic.text_index import SearchCancelled
 import csv
 import os
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import openpyxl
 from openpyxl.styles import Alignment, Font, Border, Side
 from openpyxl.utils import get_column_letter
@@ -17,25 +23,10 @@ from disposisi_app.views.components.export_utils import save_to_pdf, save_to_she
 from disposisi_app.views.components.form_utils import clear_form
 from disposisi_app.views.components.constants import POSISI_OPTIONS, TOOLTIP_LABELS
 from disposisi_app.views.components.styles import setup_styles
+from disposisi_app.views.components.virtual_tree import VirtualTreeview, KeyedTreeRows
 
 logging.basicConfig(level=logging.WARNING)
 
-SHEET_NAME = 'Sheet1'
-
-# Enhanced header with 34 columns (A-AH) matching Google Sheets structure
-ENHANCED_HEADER = [
-    "No. Agenda", "No. Surat", "Tgl. Surat", "Perihal", "Asal Surat", "Ditujukan",
-    "Klasifikasi", "Disposisi kepada", "Untuk Di :", "Selesai Tgl.", "Kode Klasifikasi", 
-    "Tgl. Penerimaan", "Indeks", "Bicarakan dengan", "Teruskan kepada", "Harap Selesai Tanggal",
-    "Direktur Utama Instruksi", "Direktur Utama Tanggal", "Direktur Keuangan Instruksi", "Direktur Keuangan Tanggal",
-    "Direktur Teknik Instruksi", "Direktur Teknik Tanggal", "GM Keuangan & Administrasi Instruksi", "GM Keuangan & Administrasi Tanggal",
-    "GM Operasional & Pemeliharaan Instruksi", "GM Operasional & Pemeliharaan Tanggal", 
-    "Manager Pemeliharaan Instruksi", "Manager Pemeliharaan Tanggal",
-    "Manager Operasional Instruksi", "Manager Operasional Tanggal",
-    "Manager Administrasi Instruksi", "Manager Administrasi Tanggal",
-    "Manager Keuangan Instruksi", "Manager Keuangan Tanggal"
-]
-
 # Searchable columns (without position instruction columns)
 SEARCHABLE_LABELS = [
     "No. Agenda", "No. Surat", "Tgl. Surat", "Perihal", "Asal Surat", "Ditujukan",
@@ -43,10 +34,21 @@ SEARCHABLE_LABELS = [
     "Tgl. Penerimaan", "Indeks", "Bicarakan dengan", "Teruskan kepada", "Harap Selesai Tanggal"
 ]
 
+VIEW_MODES = ["Per halaman", "Gulir (semua data)"]
+SEARCH_ALL_LABEL = "Semua kolom teks"  # Perihal, Asal Surat, No. Surat, Ditujukan, instruksi
+SEARCH_DEBOUNCE_MS = 250  # jeda setelah ketikan terakhir sebelum pencarian dijalankan
+SEARCH_POLL_MS = 30       # interval cek hasil pencarian dari thread UI
+# Pilihan filter tenggat (label, jenis di logic.deadline_index.DEADLINE_WINDOWS); jumlah per pilihan
+# ditampilkan di label dan dihitung dari index tenggat LogStore
+DEADLINE_FILTERS = [("", None), (f"Lewat tenggat ≤ {OVERDUE_WINDOW_DAYS} hari", 'overdue'), ("Jatuh tempo ≤ 7 hari", 'week'),
+                    ("Jatuh tempo ≤ 30 hari", 'month'), ("Belum jatuh tempo", 'pending')]
+DEADLINE_ALL_POSITIONS = "Semua (Harap Selesai)"
+
+# Satu worker untuk pencarian: query lama yang belum jalan dibatalkan, yang sedang jalan berhenti di cek berikutnya
+_search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-search")
+
 class LogTab(ttk.Frame):
-    _log_cache = None
-    _last_cache_time = 0
-    _cache_ttl = 60  # detik, cache berlaku 1 menit
+    _cache_ttl = 60  # detik, replika lokal dianggap segar selama 1 menit
     PAGE_SIZE = 20  # Jumlah data per halaman
     """
     Enhanced Log Tab with improved table styling and grid lines.
@@ -63,12 +65,23 @@ class LogTab(ttk.Frame):
         setup_styles(self)  # Terapkan style global
         self.on_edit_log = on_edit_log
         self.pack(fill="both", expand=True)
-        self.data = []  # Data log
-        self.filtered_data = []
+        self.store = LogStore()  # Data log (per kolom, lihat logic.log_store)
+        self.filtered_data = self.store.all()  # LogView: index baris yang lolos search/filter
         self.tooltip = None  # Untuk tooltip tombol
         self.current_page = 1
         self.total_pages = 1
         self.page_size = LogTab.PAGE_SIZE
+        self._loaded_version = None  # data_version replika yang sedang ditampilkan
+        self._row_ids = []           # id replika per index LogStore (identitas baris)
+        self._index_of_id = {}
+        self._replica = None         # replika yang perubahannya diikuti lewat _on_replica_change
+        self._loading = False        # load_sheet_data sedang berjalan di thread latar
+        self.query = LogQuery()      # kriteria search + filter kolom + tahun/bulan yang aktif bersamaan
+        self._search_after = None    # id after() debounce yang tertunda
+        self._search_gen = 0         # naik setiap query baru; hasil dengan gen lama dibuang
+        self._search_future = None
+        self._last_query = None
+        self._edit_token = None      # baris terakhir yang diminta dibuka di tab Edit (lihat _open_for_edit)
         self.create_widgets()
         self.setup_shortcuts()
         # self.load_sheet_data()  # Hapus auto-load di awal, load hanya saat tab aktif
@@ -76,12 +89,15 @@ class LogTab(ttk.Frame):
     def setup_shortcuts(self):
         self.bind_all("<Control-f>", lambda e: self.focus_search())
         self.search_entry.bind("<Return>", lambda e: self.do_search())
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        self.search_col.bind('<<ComboboxSelected>>', lambda e: self.do_search())
         self.tree.bind("<Delete>", lambda e: self.delete_selected())
         self.tree.bind("<Return>", lambda e: self.edit_selected())
         self.tree.bind("<Up>", self.on_arrow_up)
         self.tree.bind("<Down>", self.on_arrow_down)
         self.tree.bind("<Shift-Up>", self.on_shift_arrow_up)
         self.tree.bind("<Shift-Down>", self.on_shift_arrow_down)
+        self.tree.bind("<Shift-Button-1>", self.on_heading_shift_click)
 
     def on_arrow_up(self, event):
         selected = self.tree.selection()
@@ -201,7 +217,7 @@ class LogTab(ttk.Frame):
         search_group = ttk.LabelFrame(top_frame, text="Pencarian", padding=(8, 4))
         search_group.pack(side="left", padx=(0, 12))
         ttk.Label(search_group, text="Kolom:").pack(side="left", padx=(0, 4))
-        self.search_col = ttk.Combobox(search_group, values=SEARCHABLE_LABELS, state="readonly", width=18)
+        self.search_col = ttk.Combobox(search_group, values=[SEARCH_ALL_LABEL] + SEARCHABLE_LABELS, state="readonly", width=18)
         self.search_col.current(0)
         self.search_col.pack(side="left", padx=(0, 4))
         self.search_entry = ttk.Entry(search_group, width=20)
@@ -234,6 +250,21 @@ class LogTab(ttk.Frame):
         self.year_combo.bind('<<ComboboxSelected>>', self.apply_year_month_filter)
         self.month_combo.bind('<<ComboboxSelected>>', self.apply_year_month_filter)
 
+        # Tenggat group: Harap Selesai Tanggal atau tenggat per jabatan
+        deadline_group = ttk.LabelFrame(top_frame, text="Tenggat", padding=(8, 4))
+        deadline_group.pack(side="left", padx=(12, 0))
+        self.deadline_combo = ttk.Combobox(deadline_group, state="readonly", width=24,
+                                           values=[label for label, _ in DEADLINE_FILTERS])
+        self.deadline_combo.current(0)
+        self.deadline_combo.pack(side="left", padx=(0, 4))
+        ttk.Label(deadline_group, text="Jabatan:").pack(side="left", padx=(0, 4))
+        self.deadline_position = ttk.Combobox(deadline_group, values=[DEADLINE_ALL_POSITIONS] + POSITIONS,
+                                              state="readonly", width=22)
+        self.deadline_position.current(0)
+        self.deadline_position.pack(side="left")
+        self.deadline_combo.bind('<<ComboboxSelected>>', self.apply_deadline_filter)
+        self.deadline_position.bind('<<ComboboxSelected>>', self.apply_deadline_filter)
+
         # --- STATUS BAR ---
         status_frame = ttk.Frame(self)
         status_frame.pack(fill="x", padx=10, pady=(2, 12))  # Tambah padding bawah agar header tabel tidak tertutup
@@ -278,12 +309,16 @@ class LogTab(ttk.Frame):
         self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         self.tree.grid(row=0, column=0, sticky="nsew")
         v_scrollbar.grid(row=0, column=1, sticky="ns")
+        # Mode gulir: hanya baris di viewport yang dibuat sebagai item Treeview
+        self.virtual = VirtualTreeview(self.tree, v_scrollbar, self._row_values)
+        self.tree_rows = KeyedTreeRows(self.tree)  # mode paging: item Treeview per index LogStore
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         table_frame.rowconfigure(0, weight=1)
         table_frame.columnconfigure(0, weight=1)
         for col in ENHANCED_HEADER:
             display_name = self.get_column_display_name(col)
-            self.tree.heading(col, text=str(display_name) if display_name is not None else "")
+            self.tree.heading(col, text=str(display_name) if display_name is not None else "",
+                              command=lambda c=col: self.on_heading_click(c))
             # Lebar kolom lebih besar agar header tidak terpotong
             self.tree.column(col, width=180, anchor="center", minwidth=120, stretch=True)
 
@@ -310,6 +345,11 @@ class LogTab(ttk.Frame):
         # Kanan: tombol paging
         paging_frame = ttk.Frame(bottom_frame)
         paging_frame.pack(side="right", anchor="e")
+        ttk.Label(paging_frame, text="Tampilan:").pack(side="left", padx=(0, 4))
+        self.view_mode = ttk.Combobox(paging_frame, values=VIEW_MODES, state="readonly", width=17)
+        self.view_mode.current(0)
+        self.view_mode.pack(side="left", padx=(0, 8))
+        self.view_mode.bind('<<ComboboxSelected>>', self.on_view_mode_changed)
         self.btn_prev = ttk.Button(paging_frame, text="⏮️ Sebelumnya", command=self.go_prev_page, style="Secondary.TButton")
         self.btn_prev.pack(side="left", padx=4)
         self.paging_info_label = ttk.Label(paging_frame, text="Halaman 1 dari 1", font=("Arial", 9))
@@ -393,121 +433,85 @@ class LogTab(ttk.Frame):
 
     def update_record_count(self):
         """Update the record count display."""
-        total_records = len(self.data)
+        total_records = self.store.live_count()
         filtered_records = len(self.filtered_data)
         
         if total_records == filtered_records:
             self.record_count_label.config(text=f"{total_records} records")
         else:
             self.record_count_label.config(text=f"{filtered_records}/{total_records} records")
+        self.update_deadline_counts()
+
+    def _deadline_position(self):
+        position = self.deadline_position.get()
+        return None if position == DEADLINE_ALL_POSITIONS else position
+
+    def update_deadline_counts(self):
+        """Tulis jumlah baris per pilihan tenggat di combobox (lookup index tenggat, tanpa scan)."""
+        deadlines = self.store.deadlines
+        position = self._deadline_position()
+        selected = self.deadline_combo.current()
+        self.deadline_combo['values'] = [
+            f"{label} ({deadlines.count(kind, position)})" if kind else label for label, kind in DEADLINE_FILTERS]
+        self.deadline_combo.current(max(selected, 0))
 
     def clear_filter(self):
         """Clear all filters and show all data."""
-        self.filtered_data = self.data.copy()
-        try:
-            self.refresh_table()
-            self.update_filter_values()
-            self.update_record_count()
-            update_status(self.status_label, "Filter cleared")
-        except Exception as e:
-            print(f"[WARNING] Error in clear_filter: {e}")
-            update_status(self.status_label, "Error clearing filter")
+        self.query.clear()
+        self._last_query = None
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+        self.search_entry.delete(0, "end")
+        self.year_var.set("")
+        self.month_var.set("")
+        self.deadline_combo.current(0)
+        self.deadline_position.current(0)
+        self._run_query("Filter cleared")
 
-    def load_sheet_data(self, force_refresh=False):
+    def load_sheet_data(self, force_refresh=False, quiet=False):
+        """
+        Tampilkan log dari replika lokal di disk. Jika replika sudah pernah diisi (mis. dari sesi
+        sebelumnya) data langsung ditampilkan, lalu divalidasi ke sheet di latar belakang
+        (sidik jari kolom kunci) dan hanya dimuat ulang bila ada perbedaan. force_refresh atau
+        replika kosong: sinkronkan dulu sebelum menampilkan.
+        """
         import threading
         from disposisi_app.views.components.loading_screen import loading_manager, LoadingMessageBox
+        replica = get_log_replica()
+        if replica is not self._replica:
+            if self._replica is not None:
+                self._replica.remove_listener(self._on_replica_change)
+            replica.add_listener(self._on_replica_change)
+            self._replica = replica
+        sync_first = force_refresh or replica.last_synced is None
+        self._loading = True
+
         def do_load():
             try:
                 update_status(self.status_label, "Loading data...")
-                use_cache = (not force_refresh and LogTab._log_cache is not None and (time.time() - LogTab._last_cache_time) < LogTab._cache_ttl)
-                retries = 3
-                for attempt in range(retries):
+                # Retry/backoff ditangani rate limiter bersama di google_sheets_connect.execute_request
+                if sync_first:
                     try:
-                        if use_cache:
-                            values = LogTab._log_cache or []
-                        else:
-                            service = get_sheets_service()
-                            range_name = f'{SHEET_NAME}!A6:AH'  # A to AH = 34 columns
-                            result = service.spreadsheets().values().get(
-                                spreadsheetId=SHEET_ID,
-                                range=range_name
-                            ).execute()
-                            values = result.get('values', []) or []
-                            # Filter baris yang benar-benar kosong (semua kolom kosong)
-                            values = [row for row in values if any(cell.strip() for cell in row)]
-                            LogTab._log_cache = values
-                            LogTab._last_cache_time = time.time()
-                        break
+                        # Tarik hanya perubahan (delta) dari sheet
+                        replica.sync_incremental()
                     except Exception as e:
-                        if attempt == retries - 1:
+                        if replica.last_synced is None:
                             raise
-                        time.sleep(1)
-                MAX_ROWS = 500
-                if len(values) > MAX_ROWS:
-                    values = values[:MAX_ROWS]
-                    truncated = True
-                else:
-                    truncated = False
-                self.data = []
-                tahun_set = set()
-                bulan_set = set()
-                for row in values:
-                    row = row + ["" for _ in range(len(ENHANCED_HEADER) - len(row))]
-                    data_row = {}
-                    tgl_surat_val = None
-                    for i, col in enumerate(ENHANCED_HEADER):
-                        if i < len(row):
-                            val = row[i]
-                            # Konversi serial Excel ke tanggal string jika perlu
-                            def excel_serial_to_date(val):
-                                try:
-                                    import datetime
-                                    val_float = float(val)
-                                    if val_float > 30000 and val_float < 90000 and str(int(val_float)) == str(val):
-                                        # Excel 1900 date system
-                                        base = datetime.datetime(1899, 12, 30)
-                                        return (base + datetime.timedelta(days=int(val_float))).strftime('%d-%m-%Y')
-                                except:
-                                    pass
-                                return val
-                            if col in ["Tgl. Surat", "Selesai Tgl.", "Tgl. Penerimaan", "Harap Selesai Tanggal", "Direktur Utama Tanggal", "Direktur Keuangan Tanggal", "Direktur Teknik Tanggal", "GM Keuangan & Administrasi Tanggal", "GM Operasional & Pemeliharaan Tanggal", "Manager Pemeliharaan Tanggal", "Manager Operasional Tanggal", "Manager Administrasi Tanggal", "Manager Keuangan Tanggal"]:
-                                val = excel_serial_to_date(val)
-                            if col == "Tgl. Surat":
-                                tgl_surat_val = val
-                            if col == "Klasifikasi":
-                                klasifikasi = val.strip().upper()
-                                if klasifikasi in ["RAHASIA", "PENTING", "SEGERA"]:
-                                    data_row[col] = klasifikasi
-                                else:
-                                    data_row[col] = ""
-                            elif col == "Disposisi kepada":
-                                disposisi = val.strip()
-                                if disposisi:
-                                    data_row[col] = disposisi
-                                else:
-                                    data_row[col] = ""
-                            elif col == "Untuk Di :":
-                                untuk_di = val.strip()
-                                if untuk_di:
-                                    data_row[col] = untuk_di
-                                else:
-                                    data_row[col] = ""
-                            else:
-                                data_row[col] = val if i < len(row) else ""
-                        else:
-                            data_row[col] = ""
-                    # Tambahkan parsing tahun dan bulan dari Tgl. Surat
-                    if tgl_surat_val:
-                        tgl_split = tgl_surat_val.replace('/', '-').replace('.', '-').split('-')
-                        if len(tgl_split) == 3:
-                            if len(tgl_split[2]) == 4:
-                                tahun_set.add(tgl_split[2])
-                                bulan_set.add(tgl_split[1])
-                            else:
-                                tahun_set.add(tgl_split[0])
-                                bulan_set.add(tgl_split[1])
-                    self.data.append(data_row)
-                self.filtered_data = self.data.copy()
+                        # Offline: tetap tampilkan isi replika terakhir
+                        print(f"[WARNING] Sinkronisasi log gagal, memakai data lokal: {e}")
+                # Tidak ada batas jumlah baris: Treeview hanya menampilkan halaman/viewport aktif
+                row_ids, values, version = replica.all_rows_with_ids()
+                store = LogStore()
+                # Nilai tampilan dibentuk per kolom (pandas bila ada, lihat logic.log_ingest);
+                # Tgl. Surat diindeks tahun -> bulan dan index trigram dibangun per batch oleh LogStore
+                store.extend_columns(log_value_columns(values))
+                self.store = store
+                self._row_ids = row_ids
+                self._index_of_id = {row_id: index for index, row_id in enumerate(row_ids)}
+                self._loaded_version = version
+                # Kriteria pencarian/filter yang aktif tetap berlaku pada data baru
+                self.filtered_data = self.query.evaluate(store)
                 
                 # Refresh table with error handling
                 try:
@@ -517,31 +521,46 @@ class LogTab(ttk.Frame):
                 except Exception as e:
                     print(f"[WARNING] Error refreshing table: {e}")
                     # Continue even if table refresh fails
-                tahun_list = sorted(list(tahun_set))
-                bulan_list = sorted(list(bulan_set), key=lambda x: int(x) if x.isdigit() else 99)
-                self.year_combo['values'] = [''] + tahun_list
-                self.month_combo['values'] = [''] + bulan_list
-                if truncated:
-                    update_status(self.status_label, f"Loaded {len(self.data)} records (truncated)")
-                    LoadingMessageBox.showwarning("Load Log", f"Data log terlalu besar, hanya {MAX_ROWS} baris pertama yang dimuat.", parent=self)
-                else:
-                    update_status(self.status_label, f"Loaded {len(self.data)} records")
-                    LoadingMessageBox.showinfo("Load Log", f"Berhasil memuat {len(self.data)} data dari Google Sheets.", parent=self)
+                self.year_combo['values'] = [''] + [str(y) for y in store.years()]
+                self.month_combo['values'] = [''] + [f"{m:02d}" for m in store.months()]
+                update_status(self.status_label, f"Loaded {len(self.store)} records")
+                if not quiet:
+                    LoadingMessageBox.showinfo("Load Log", f"Berhasil memuat {len(self.store)} data dari Google Sheets.", parent=self)
+                if not sync_first and replica.is_stale(LogTab._cache_ttl):
+                    self._revalidate_in_background(replica)
             except Exception as e:
                 import traceback; traceback.print_exc()
                 update_status(self.status_label, "Error loading data")
                 LoadingMessageBox.showerror("Load Log", f"Gagal memuat data: {e}", parent=self)
             finally:
-                loading_manager.hide_loading()
+                self._loading = False
+                if not quiet:
+                    loading_manager.hide_loading()
         
-        loading_manager.show_loading(self, "Loading Data...", True)
+        if not quiet:
+            loading_manager.show_loading(self, "Loading Data...", True)
         threading.Thread(target=do_load, daemon=True).start()
 
+    def _revalidate_in_background(self, replica):
+        """
+        Cocokkan replika dengan sheet tanpa memblok tampilan; jika ada perubahan, event 'sync'
+        replika memuat ulang tabel (lihat _on_replica_change).
+        """
+        import threading
+
+        def run():
+            try:
+                replica.sync_incremental()
+            except Exception as e:
+                print(f"[WARNING] Validasi log ke Google Sheets gagal, tetap memakai data lokal: {e}")
+
+        threading.Thread(target=run, daemon=True).start()
+
     def refresh_log_data(self, force_refresh=False):
         """Refresh hanya data log, tanpa me-refresh sheet lain."""
         self.load_sheet_data(force_refresh=force_refresh)
 
-    def refresh_table(self):
+    def refresh_table(self, keep_position=False):
         """
         Refresh the table display with enhanced styling.
         Features:
@@ -551,43 +570,27 @@ class LogTab(ttk.Frame):
         - Robust error handling for treeview operations
         """
         try:
-            # Clear existing items with better error handling
-            try:
-                # Use delete with all children at once to avoid individual item errors
-                children = self.tree.get_children()
-                if children:
-                    self.tree.delete(*children)
-            except Exception as e:
-                print(f"[WARNING] Error clearing tree items: {e}")
-                # Fallback: try to delete items one by one
-                try:
-                    children = self.tree.get_children()
-                    for row in children:
-                        try:
-                            self.tree.delete(row)
-                        except:
-                            pass  # Silently ignore individual deletion errors
-                except:
-                    pass  # If all else fails, continue anyway
-            
+            if self.virtual.active:
+                # Mode gulir: item Treeview dipakai ulang oleh VirtualTreeview
+                self.virtual.set_total(len(self.filtered_data), keep_position=keep_position)
+                self.update_paging_info()
+                return
+
             # Paging: hanya tampilkan data sesuai halaman
+            self.current_page = max(1, min(self.current_page, (len(self.filtered_data) + self.page_size - 1) // self.page_size))
             start_idx = (self.current_page - 1) * self.page_size
-            end_idx = start_idx + self.page_size
-            page_data = self.filtered_data[start_idx:end_idx]
-            
-            for i, item in enumerate(page_data):
-                try:
-                    values = []
-                    for col in ENHANCED_HEADER:
-                        val = item.get(col, "")
-                        values.append(str(val) if val is not None else "")
-                    
-                    # Apply alternating row colors for better readability
-                    tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-                    self.tree.insert("", "end", values=values, tags=(tag,))
-                except Exception as e:
-                    print(f"[WARNING] Error inserting row {i}: {e}")
-                    # Continue with other rows even if one fails
+            end_idx = min(start_idx + self.page_size, len(self.filtered_data))
+
+            # Item Treeview dikunci dengan index LogStore: ganti halaman/refresh setelah edit hanya
+            # menyentuh baris yang berubah, nilai tampil diambil dari cache LogStore.display_values
+            store = self.store
+            rows = []
+            for i in range(start_idx, end_idx):
+                index = self.filtered_data.index_at(i)
+                # Apply alternating row colors for better readability
+                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
+                rows.append((index, store.display_values(index), (tag,)))
+            self.tree_rows.sync(rows)
             
             # Update column widths to ensure proper display
             self.tree.update_idletasks()
@@ -599,6 +602,7 @@ class LogTab(ttk.Frame):
             traceback.print_exc()
             # Try to recover by clearing and rebuilding
             try:
+                self.tree_rows.clear()
                 self.tree.delete(*self.tree.get_children())
             except:
                 pass
@@ -665,26 +669,107 @@ class LogTab(ttk.Frame):
         }
         return column_info.get(col_name, "Kolom instruksi dan tanggal untuk jabatan tertentu")
 
+    def on_search_key(self, event=None):
+        """Search-as-you-type: jadwalkan ulang pencarian SEARCH_DEBOUNCE_MS setelah ketikan terakhir."""
+        query = (self.search_col.get(), self.search_entry.get().strip())
+        if query == self._last_query:
+            return  # tombol navigasi/shift, isi tidak berubah
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self.do_search)
+
     def do_search(self):
+        """Perbarui kriteria pencarian lalu evaluasi ulang query gabungan."""
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
         col = self.search_col.get()
-        key = self.search_entry.get().lower()
-        if not key:
-            self.filtered_data = self.data.copy()
-        else:
-            # Pencarian hanya pada kolom label, bukan instruksi
-            self.filtered_data = [d for d in self.data if key in str(d.get(col, "")).lower()]
+        key = self.search_entry.get().strip()
+        self._last_query = (col, key)
+        # Setiap kata harus muncul (substring); kolom teks utama memakai index trigram
+        self.query.set_search(key, None if col == SEARCH_ALL_LABEL else col)
+        self._run_query("Found {count} matching records", update_filter_values=True)
+
+    def _run_query(self, message, update_filter_values=False):
+        """
+        Evaluasi self.query (search + filter kolom + tanggal) di worker thread; hasil diterapkan
+        di thread UI lewat after(). Query yang digantikan dibatalkan/dibuang.
+        """
+        self._search_gen += 1
+        gen = self._search_gen
+        store = self.store
+        query = self.query
+        if self._search_future is not None:
+            self._search_future.cancel()  # belum mulai: tidak pernah dijalankan
+
+        future = _search_executor.submit(query.evaluate, store, lambda: gen != self._search_gen)
+        self._search_future = future
+
+        def poll():
+            if gen != self._search_gen:
+                return  # digantikan query yang lebih baru
+            if not future.done():
+                self.after(SEARCH_POLL_MS, poll)
+                return
+            try:
+                result = future.result()
+            except SearchCancelled:
+                return
+            except Exception as e:
+                print(f"[WARNING] Error in query: {e}")
+                update_status(self.status_label, "Error searching")
+                return
+            if store is not self.store:
+                return  # data dimuat ulang selama pencarian
+            self._apply_query_result(result, message, update_filter_values)
+
+        update_status(self.status_label, "Searching...")
+        self.after(SEARCH_POLL_MS, poll)
+
+    def _apply_query_result(self, view, message, update_filter_values=False):
+        self.filtered_data = view
         self.current_page = 1
         
         # Refresh table with error handling
         try:
             self.refresh_table()
-            self.update_filter_values()
+            if update_filter_values:
+                self.update_filter_values()
             self.update_record_count()
-            update_status(self.status_label, f"Found {len(self.filtered_data)} matching records")
+            update_status(self.status_label, message.format(count=len(self.filtered_data)))
         except Exception as e:
-            print(f"[WARNING] Error in do_search: {e}")
+            print(f"[WARNING] Error applying query: {e}")
             update_status(self.status_label, "Error refreshing table")
 
+    def on_heading_click(self, col, add=False):
+        """Klik heading: urutkan per kolom; Shift+klik menambah kolom sebagai kunci urut berikutnya."""
+        self.query.toggle_sort(col, add=add)
+        self._update_sort_headings()
+        self._run_query("Sorted {count} records")
+
+    def on_heading_shift_click(self, event):
+        if self.tree.identify_region(event.x, event.y) != "heading":
+            return None
+        column_id = self.tree.identify_column(event.x)  # '#1', '#2', ...
+        try:
+            col = ENHANCED_HEADER[int(column_id.lstrip('#')) - 1]
+        except (ValueError, IndexError):
+            return "break"
+        self.on_heading_click(col, add=True)
+        return "break"
+
+    def _update_sort_headings(self):
+        """Tampilkan arah (▲/▼) dan urutan kunci pada heading kolom yang sedang dipakai mengurutkan."""
+        order = {col: (pos, descending) for pos, (col, descending) in enumerate(self.query.sort, start=1)}
+        for col in ENHANCED_HEADER:
+            text = str(self.get_column_display_name(col) or "")
+            if col in order:
+                pos, descending = order[col]
+                text += " ▼" if descending else " ▲"
+                if len(order) > 1:
+                    text += str(pos)
+            self.tree.heading(col, text=text)
+
     def update_filter_values(self, event=None):
         col = self.filter_col.get()
         # Daftar pilihan tetap untuk kolom checkbox
@@ -711,9 +796,12 @@ class LogTab(ttk.Frame):
         if col in pilihan_checkbox:
             unique_vals = pilihan_checkbox[col]
         else:
-            unique_vals = sorted({str(d.get(col, "")) for d in self.filtered_data})
+            unique_vals = sorted({str(v) for v in self.filtered_data.column_values(col)})
         self.filter_val['values'] = unique_vals
-        if unique_vals:
+        active = self.query.column_filter
+        if active and active[0] == col and active[1] in unique_vals:
+            self.filter_val.set(active[1])  # pertahankan filter yang sedang aktif
+        elif unique_vals:
             self.filter_val.current(0)
         else:
             self.filter_val.set("")
@@ -721,115 +809,195 @@ class LogTab(ttk.Frame):
     def do_filter(self):
         col = self.filter_col.get()
         val = self.filter_val.get()
-        if not val:
-            self.filtered_data = self.data.copy()
-        else:
-            # Ubah: Filter data yang MENGANDUNG nilai (bukan persis sama)
-            self.filtered_data = [d for d in self.data if val in str(d.get(col, ""))]
-        self.current_page = 1
-        
-        # Refresh table with error handling
-        try:
-            self.refresh_table()
-            self.update_record_count()
-            update_status(self.status_label, f"Filtered to {len(self.filtered_data)} records")
-        except Exception as e:
-            print(f"[WARNING] Error in do_filter: {e}")
-            update_status(self.status_label, "Error refreshing table")
+        # Ubah: Filter data yang MENGANDUNG nilai (bukan persis sama); digabung dengan search & tanggal
+        self.query.set_column_filter(col, val)
+        self._run_query("Filtered to {count} records")
 
     def apply_year_month_filter(self, event=None):
         tahun = self.year_var.get()
         bulan = self.month_var.get()
-        if not tahun and not bulan:
-            self.filtered_data = self.data.copy()
+        # Lookup di indeks tanggal LogStore, digabung dengan search & filter kolom yang aktif
+        self.query.set_year_month(int(tahun) if tahun else None, int(bulan) if bulan else None)
+        self._run_query("Showing {count} records")
+
+    def apply_deadline_filter(self, event=None):
+        kind = DEADLINE_FILTERS[max(self.deadline_combo.current(), 0)][1]
+        # Lookup di index tenggat LogStore, digabung dengan kriteria lain yang aktif
+        self.query.set_deadline(kind, self._deadline_position())
+        self.update_deadline_counts()
+        self._run_query("Showing {count} records")
+
+    def on_view_mode_changed(self, event=None):
+        """Ganti antara paging biasa dan mode gulir virtual (seluruh data dalam satu daftar)."""
+        self.tree_rows.clear()
+        if self.view_mode.get() == VIEW_MODES[1]:
+            self.virtual.activate()
         else:
-            filtered = []
-            for row in self.data:
-                tgl = row.get("Tgl. Surat", "")
-                if tgl:
-                    tgl_split = tgl.replace('/', '-').replace('.', '-').split('-')
-                    if len(tgl_split) == 3:
-                        if len(tgl_split[2]) == 4:
-                            t_tahun = tgl_split[2]
-                            t_bulan = tgl_split[1]
-                        else:
-                            t_tahun = tgl_split[0]
-                            t_bulan = tgl_split[1]
-                        if (not tahun or t_tahun == tahun) and (not bulan or t_bulan == bulan):
-                            filtered.append(row)
-            self.filtered_data = filtered
-        self.current_page = 1
-        
-        # Refresh table with error handling
-        try:
-            self.refresh_table()
-            self.update_record_count()
-        except Exception as e:
-            print(f"[WARNING] Error in apply_year_month_filter: {e}")
+            self.virtual.deactivate()
+            self.current_page = 1
+        self.refresh_table()
+
+    def _row_values(self, index):
+        """Nilai kolom untuk baris ke-index di tampilan terfilter."""
+        return self.store.display_values(self.filtered_data.index_at(index))
+
+    def _selected_records(self):
+        """Record (dict) terpilih; di mode gulir termasuk baris yang sudah keluar dari viewport."""
+        if self.virtual.active:
+            return [self.filtered_data[i] for i in self.virtual.selected_indices() if i < len(self.filtered_data)]
+        keys = (self.tree_rows.key_of(item) for item in self.tree.selection())
+        return [self.store.record(index) for index in keys if index is not None]
 
     def on_double_click(self, event):
-        selected = self.tree.selection()
-        if not selected:
+        records = self._selected_records()
+        if not records:
             return
-        values = self.tree.item(selected[0], "values")
-        if self.on_edit_log:
-            data = {col: values[i] for i, col in enumerate(ENHANCED_HEADER)}
-            self.on_edit_log(data)
+        self._open_for_edit(records[0])
 
     def edit_selected(self):
         from disposisi_app.views.components.loading_screen import LoadingMessageBox
-        selected = self.tree.selection()
-        if not selected or len(selected) == 0:
+        records = self._selected_records()
+        if not records:
             LoadingMessageBox.showwarning("Edit Log", "Pilih data yang ingin diedit.", parent=self)
             return
-        if len(selected) > 1:
+        if len(records) > 1:
             LoadingMessageBox.showwarning("Edit Log", "Pilih salah satu data saja untuk edit.", parent=self)
             return
-        values = self.tree.item(selected[0], "values")
-        data = {col: values[i] for i, col in enumerate(ENHANCED_HEADER)}
-        if self.on_edit_log:
+        self._open_for_edit(records[0])
+
+    def _open_for_edit(self, record):
+        """
+        Buka baris di tab Edit dengan data lengkap (A-AH). Kolom instruksi Q-AH dimuat ulang dari
+        sheet (get_full_row) di thread pool async_sheets; form dibuka di thread UI setelah selesai.
+        Jika baris lain dibuka sebelum itu, hasil yang lama dibuang.
+        """
+        if not self.on_edit_log:
+            return
+        from async_sheets import AsyncSheetsClient, run_in_tk
+        data = {col: record.get(col, "") for col in ENHANCED_HEADER}
+        token = self._edit_token = object()
+        update_status(self.status_label, "Loading record details...")
+
+        def opened(found):
+            if token is not self._edit_token:
+                return
+            if found is not None:
+                row = found[1]
+                for i, col in enumerate(ENHANCED_HEADER[LOG_SUMMARY_COLUMNS:], start=LOG_SUMMARY_COLUMNS):
+                    data[col] = row[i] if i < len(row) else ""
+            update_status(self.status_label, "Ready")
             self.on_edit_log(data)
 
+        def failed(e):
+            print(f"[WARNING] Gagal memuat detail log, memakai data tabel: {e}")
+            opened(None)
+
+        replica = get_log_replica()
+        run_in_tk(self, AsyncSheetsClient().call(replica.get_full_row, data.get("No. Surat", "")),
+                  on_success=opened, on_error=failed)
+
     def delete_selected(self):
         from disposisi_app.views.components.loading_screen import LoadingMessageBox
-        selected = self.tree.selection()
-        if not selected:
+        records = self._selected_records()
+        if not records:
             LoadingMessageBox.showwarning("Hapus Log", "Pilih data yang ingin dihapus.", parent=self)
             return
         # Confirm deletion
-        if not LoadingMessageBox.askyesno("Confirm Delete", f"Yakin ingin menghapus {len(selected)} data terpilih?", parent=self):
+        if not LoadingMessageBox.askyesno("Confirm Delete", f"Yakin ingin menghapus {len(records)} data terpilih?", parent=self):
             return
-        # Ambil semua index baris yang dipilih (urutan dari bawah agar tidak bergeser saat hapus)
-        idxs = sorted([self.tree.index(item) for item in selected], reverse=True)
-        try:
-            update_status(self.status_label, "Deleting record(s)...", self)
-            service = get_sheets_service()
-            sheet_id = service.spreadsheets().get(spreadsheetId=SHEET_ID).execute()['sheets'][0]['properties']['sheetId']
-            requests = []
-            for idx in idxs:
-                sheet_row = idx + 6
-                requests.append({
-                    'deleteDimension': {
-                        'range': {
-                            'sheetId': sheet_id,
-                            'dimension': 'ROWS',
-                            'startIndex': sheet_row - 1,
-                            'endIndex': sheet_row
-                        }
-                    }
-                })
-            service.spreadsheets().batchUpdate(
-                spreadsheetId=SHEET_ID,
-                body={'requests': requests}
-            ).execute()
+        from async_sheets import AsyncSheetsClient, run_in_tk
+        # Baris diidentifikasi dengan id replika (bukan posisi di halaman/urutan tampilan);
+        # posisi di sheet dicocokkan ulang dengan kolom kunci sebelum dihapus
+        replica = get_log_replica()
+        row_ids = [self._row_ids[record.index] for record in records]
+        update_status(self.status_label, "Deleting record(s)...", self)
+
+        def deleted(_):
             update_status(self.status_label, "Record(s) deleted successfully", self)
-            LoadingMessageBox.showinfo("Hapus Log", f"{len(selected)} data berhasil dihapus dari Google Sheets.", parent=self)
-            self.refresh_log_data(force_refresh=True)  # Selalu refresh tanpa cache
-        except Exception as e:
-            import traceback; traceback.print_exc()
+            LoadingMessageBox.showinfo("Hapus Log", f"{len(row_ids)} data berhasil dihapus dari Google Sheets.", parent=self)
+            if self.is_cache_expired():
+                # Replika ikut tersinkron saat posisi dicocokkan: muat perubahan lainnya juga
+                self.load_sheet_data(quiet=True)
+
+        def failed(e):
+            print(f"[ERROR] Gagal menghapus log: {e}")
             update_status(self.status_label, "Error deleting record(s)", self)
             LoadingMessageBox.showerror("Hapus Log", f"Gagal menghapus data: {e}", parent=self)
 
+        run_in_tk(self, AsyncSheetsClient().call(self._delete_rows, replica, row_ids),
+                  on_success=deleted, on_error=failed)
+
+    @staticmethod
+    def _delete_rows(replica, row_ids):
+        """
+        Bagian remote delete_selected, dijalankan di thread pool async_sheets. Tabel langsung
+        diperbarui lewat _on_replica_change saat baris dihapus dari replika (sebelum batchUpdate
+        selesai) dan dikembalikan jika hapus di sheet gagal. Baris berurutan digabung menjadi
+        satu rentang, semua dalam satu batchUpdate.
+        """
+        positions = replica.locate_ids_for_delete(row_ids)
+        with replica.optimistic_delete(positions):
+            replica.backend.delete_rows(LOG_SHEET_NAME, [pos + LOG_FIRST_ROW for pos in positions])
+
+    def _on_replica_change(self, kind, payload, version):
+        """
+        Listener LogReplica: terapkan penulisan lokal (simpan, edit, hapus, dan rollback-nya) serta
+        edit klien lain yang ditemukan poller langsung ke self.store dan index-nya tanpa memuat
+        ulang log. Jika ada perubahan lain yang belum dimuat (versi tidak berurutan), abaikan;
+        is_cache_expired() akan memuat ulang. 'sync' (replika ditarik ulang dari sheet) memuat
+        ulang log secara diam-diam kecuali load yang sedang berjalan sudah mencakupnya.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            self.after(0, lambda: self._on_replica_change(kind, payload, version))
+            return
+        if kind == 'sync':
+            if not self._loading and self._loaded_version is not None and self._loaded_version < version:
+                self.load_sheet_data(quiet=True)
+            return
+        if self._loaded_version is None or self._loaded_version != version - 1:
+            return
+        store = self.store
+        if kind == 'update':
+            index = self._index_of_id.get(payload[0])
+            if index is None:
+                return
+        elif kind in ('delete', 'restore'):
+            ids = payload if kind == 'delete' else [row_id for row_id, _ in payload]
+            indices = [self._index_of_id[row_id] for row_id in ids if row_id in self._index_of_id]
+            if len(indices) != len(ids):
+                return
+        # Pencarian di worker yang sedang berjalan memakai index baris sebelum perubahan ini:
+        # buang hasilnya (gen baru); query aktif dievaluasi ulang di bawah
+        self._search_gen += 1
+        searching = self._search_future is not None and not self._search_future.done()
+        if self._search_future is not None:
+            self._search_future.cancel()
+        if kind == 'append':
+            row_id, row = payload
+            store.append(row_to_log_values(row))
+            self._row_ids.append(row_id)
+            self._index_of_id[row_id] = len(store) - 1
+        elif kind == 'update':
+            for col, val in zip(ENHANCED_HEADER, row_to_log_values(payload[1])):
+                if store.get(index, col) != val:
+                    store.set(index, col, val)
+        else:
+            if kind == 'delete':
+                store.remove(indices)
+            else:
+                store.restore(indices)
+            self.virtual.selected.clear()
+        self._loaded_version = version
+        self.filtered_data = self.query.evaluate(store)
+        try:
+            self.refresh_table(keep_position=True)
+            self.update_filter_values()
+            self.update_record_count()
+            if searching:
+                update_status(self.status_label, f"Found {len(self.filtered_data)} matching records")
+        except Exception as e:
+            print(f"[WARNING] Error refreshing table: {e}")
+
     def export_excel(self):
         """Export filtered data to Excel with multi-layer header and filter info (centered)."""
         from tkinter import filedialog
@@ -840,15 +1008,59 @@ class LogTab(ttk.Frame):
         )
         if not filepath or not isinstance(filepath, str):
             return
+        from async_sheets import AsyncSheetsClient, run_in_tk
         from disposisi_app.views.components.export_utils import export_excel_advanced
-        export_excel_advanced(self, filepath)
+        # Baris yang diexport ditetapkan sekarang (urutan tampilan); kolom instruksi diambil dari replika
+        store, indices = self.store, list(self.filtered_data.indices)
+        row_ids = [self._row_ids[index] for index in indices]
+        update_status(self.status_label, "Loading instruction columns...")
+
+        def export(details):
+            update_status(self.status_label, "Exporting...")
+            export_excel_advanced(self, filepath, self._export_rows(store, indices, row_ids, details))
+            update_status(self.status_label, "Ready")
+
+        def failed(e):
+            print(f"[WARNING] Gagal memuat kolom instruksi untuk export: {e}")
+            export({})
+
+        run_in_tk(self, AsyncSheetsClient().call(self._load_export_details),
+                  on_success=export, on_error=failed)
+
+    @staticmethod
+    def _load_export_details():
+        """(Worker) Muat kolom instruksi (Q-AH) yang belum ada dalam satu range; return id replika -> row."""
+        replica = get_log_replica()
+        replica.load_details()
+        row_ids, rows, _ = replica.all_rows_with_ids()
+        return dict(zip(row_ids, rows))
+
+    @staticmethod
+    def _export_rows(store, indices, row_ids, details):
+        """Record export: kolom ringkasan dari store, kolom instruksi Q-AH dari baris replika (details)."""
+        detail_cols = list(enumerate(ENHANCED_HEADER[LOG_SUMMARY_COLUMNS:], start=LOG_SUMMARY_COLUMNS))
+        rows = []
+        for index, row_id in zip(indices, row_ids):
+            record = {col: store.get(index, col) for col in ENHANCED_HEADER[:LOG_SUMMARY_COLUMNS]}
+            row = details.get(row_id, ())
+            for i, col in detail_cols:
+                val = row[i] if i < len(row) else store.get(index, col)
+                record[col] = excel_serial_to_date(val) if col in DATE_COLUMNS else val
+            rows.append(record)
+        return rows
 
     def is_cache_expired(self):
-        """Return True if the cache is expired, False otherwise."""
-        return (time.time() - LogTab._last_cache_time) >= LogTab._cache_ttl 
+        """True jika tabel belum memuat versi replika terbaru atau replika lebih tua dari TTL."""
+        replica = get_log_replica()
+        return self._loaded_version != replica.data_version or replica.is_stale(LogTab._cache_ttl)
 
     def update_paging_info(self):
         total_data = len(self.filtered_data)
+        if self.virtual.active:
+            self.paging_info_label.config(text=f"{total_data} baris")
+            self.btn_prev.config(state="disabled")
+            self.btn_next.config(state="disabled")
+            return
         self.total_pages = max(1, (total_data + self.page_size - 1) // self.page_size)
         self.paging_info_label.config(text=f"Halaman {self.current_page} dari {self.total_pages}")
         self.btn_prev.config(state="normal" if self.current_page > 1 else "disabled")
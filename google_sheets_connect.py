@@ -1,8 +1,11 @@
 import os
 import json
+import atexit
 import logging
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote
+from api_rate_limiter import rate_limiter
+from api_metrics import api_metrics
 
 logging.basicConfig(level=logging.WARNING)
 # Path ke credentials.json
@@ -13,119 +16,339 @@ SHEET_ID = '13-EgGz8JYYQ7FLQeCcVyPEXwYFruSGyz8KxPXrJlB7c'
 # Scope untuk Google Sheets API
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Timeout (detik) untuk setiap koneksi HTTP ke Google API
+HTTP_TIMEOUT = 30
+
+class SheetsServicePool:
+    """
+    Pool service Google Sheets yang dipakai bersama oleh seluruh proses.
+    - Credentials dibaca sekali dan token akses dipakai ulang sampai kedaluwarsa
+    - Setiap thread mendapat transport HTTP sendiri (httplib2.Http tidak thread-safe)
+    - Discovery document hanya di-parse sekali
+    - close() menutup semua koneksi; pemakaian berikutnya membangun ulang secara lazy
+    Library klien Google baru diimpor saat service pertama dibuat, sehingga modul ini (builder
+    request, SheetWritePipeline) dan InMemorySheetsBackend bisa dipakai tanpa library tersebut.
+    """
+    def __init__(self, credentials_file=CREDENTIALS_FILE, scopes=None):
+        self.credentials_file = credentials_file
+        self.scopes = list(scopes or SCOPES)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._creds = None
+        self._discovery_doc = None
+        self._transports = []
+        self._generation = 0
+
+    def _ensure_credentials(self):
+        """Kembalikan credentials dengan token yang masih valid (refresh hanya jika perlu)."""
+        import httplib2
+        import google_auth_httplib2
+        from google.oauth2.service_account import Credentials
+        with self._lock:
+            if self._creds is None:
+                self._creds = Credentials.from_service_account_file(self.credentials_file, scopes=self.scopes)
+            if not self._creds.valid:
+                self._creds.refresh(google_auth_httplib2.Request(httplib2.Http(timeout=HTTP_TIMEOUT)))
+            return self._creds
+
+    def _build_service(self, http):
+        from googleapiclient.discovery import build, build_from_document
+        if self._discovery_doc is None:
+            try:
+                from googleapiclient import discovery_cache
+                doc = discovery_cache.get_static_doc('sheets', 'v4')
+                self._discovery_doc = json.loads(doc) if doc else None
+            except Exception:
+                self._discovery_doc = None
+        if self._discovery_doc:
+            return build_from_document(self._discovery_doc, http=http)
+        return build('sheets', 'v4', http=http, cache_discovery=False)
+
+    def get_service(self):
+        """Service object milik thread pemanggil; dibuat sekali per thread."""
+        import httplib2
+        import google_auth_httplib2
+        creds = self._ensure_credentials()
+        local = self._local
+        if getattr(local, 'service', None) is not None and local.generation == self._generation:
+            return local.service
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        service = self._build_service(http)
+        with self._lock:
+            self._transports.append(http)
+            local.generation = self._generation
+        local.service = service
+        return service
+
+    def close(self):
+        """Tutup semua transport HTTP dan lupakan token yang tersimpan."""
+        with self._lock:
+            transports, self._transports = self._transports, []
+            self._generation += 1
+            self._creds = None
+        for http in transports:
+            try:
+                http.http.close()
+            except Exception as e:
+                logging.warning(f"[SheetsServicePool] Gagal menutup koneksi: {e}")
+
+_service_pools = {}
+_service_pools_lock = threading.Lock()
+
+def get_service_pool(credentials_file=None, scopes=None):
+    """
+    Ambil pool untuk kombinasi credentials + scope tertentu (dibuat sekali per proses).
+    """
+    credentials_file = credentials_file or CREDENTIALS_FILE
+    key = (os.path.abspath(credentials_file), tuple(scopes or SCOPES))
+    with _service_pools_lock:
+        pool = _service_pools.get(key)
+        if pool is None:
+            pool = SheetsServicePool(credentials_file, scopes)
+            _service_pools[key] = pool
+        return pool
+
 def get_sheets_service():
     """
-    Membuat koneksi ke Google Sheets API dan mengembalikan service object.
+    Mengembalikan service object Google Sheets API dari pool bersama.
+    Aman dipanggil berulang kali; auth dan discovery tidak diulang.
     """
-    creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=SCOPES)
-    service = build('sheets', 'v4', credentials=creds)
-    return service
+    return get_service_pool().get_service()
 
-def append_row_to_sheet(row_data, sheet_id=None, range_name='Sheet1!A1'):
+def close_sheets_service():
+    """Tutup semua koneksi Google Sheets yang dibuka oleh proses ini."""
+    with _service_pools_lock:
+        pools = list(_service_pools.values())
+    for pool in pools:
+        pool.close()
+
+atexit.register(close_sheets_service)
+
+def _request_op(request):
+    """Nama operasi singkat, mis. 'values.batchGet' dari methodId 'sheets.spreadsheets.values.batchGet'."""
+    method_id = getattr(request, 'methodId', None) or ''
+    return method_id.replace('sheets.spreadsheets.', '', 1) or 'request'
+
+def _request_target(request):
+    """Range yang diminta (dari path atau parameter ranges=) untuk keperluan instrumentasi."""
+    uri = getattr(request, 'uri', None) or ''
+    parsed = urlsplit(uri)
+    if '/values/' in parsed.path:
+        target = parsed.path.split('/values/', 1)[1]
+        for suffix in (':append', ':clear'):
+            if target.endswith(suffix):
+                target = target[:-len(suffix)]
+        return unquote(target)
+    ranges = parse_qs(parsed.query).get('ranges')
+    if ranges:
+        return ','.join(ranges)
+    return ''
+
+def _response_rows(result):
+    """Jumlah baris yang dibaca/ditulis menurut respons Sheets API."""
+    if not isinstance(result, dict):
+        return 0
+    if 'values' in result:
+        return len(result['values'])
+    if 'valueRanges' in result:
+        return sum(len(vr.get('values', [])) for vr in result['valueRanges'])
+    if 'updates' in result:
+        return result['updates'].get('updatedRows', 0)
+    if 'totalUpdatedRows' in result:
+        return result['totalUpdatedRows']
+    return result.get('updatedRows', 0)
+
+# Operasi yang hasilnya bergantung pada isi sheet saat diterapkan (appendCells, deleteDimension,
+# values.append): tidak diulang setelah timeout/5xx karena server mungkin sudah menerapkannya
+NON_IDEMPOTENT_OPS = {'batchUpdate', 'values.append'}
+
+def execute_request(request):
     """
-    Tambahkan satu baris data ke Google Sheet.
-    row_data: list of values (1D)
-    sheet_id: opsional, gunakan SHEET_ID default jika None
-    range_name: range tujuan (default Sheet1!A1, akan append di bawah)
+    Jalankan request Google API (hasil service.spreadsheets()...) lewat rate limiter bersama.
+    Semua pemanggilan .execute() ke Google Sheets harus melalui fungsi ini, sehingga setiap
+    panggilan juga tercatat di api_metrics (operasi, range, baris/byte, latency, retry).
+    Penulisan di NON_IDEMPOTENT_OPS hanya diulang pada 429 (lihat api_rate_limiter).
     """
-    service = get_sheets_service()
-    if sheet_id is None:
-        sheet_id = SHEET_ID
-    body = {'values': [row_data]}
-    result = service.spreadsheets().values().append(
-        spreadsheetId=sheet_id,
-        range=range_name,
-        valueInputOption='USER_ENTERED',
-        insertDataOption='INSERT_ROWS',
-        body=body
-    ).execute()
-    # Ambil baris terakhir yang diisi dari response
-    updated_range = result.get('updates', {}).get('updatedRange')
-    if updated_range:
-        # updated_range format: 'Sheet1!A12:AB12'
-        import re
-        m = re.match(r'[^!]+!A(\d+):', updated_range)
-        if m:
-            row_idx = int(m.group(1)) - 1  # 0-based index
-            sheet_id_num = service.spreadsheets().get(spreadsheetId=sheet_id).execute()['sheets'][0]['properties']['sheetId']
-            requests = [
-                {
-                    'repeatCell': {
-                        'range': {
-                            'sheetId': sheet_id_num,
-                            'startRowIndex': row_idx,
-                            'endRowIndex': row_idx + 1,
-                            'startColumnIndex': 0,
-                            'endColumnIndex': 34
-                        },
-                        'cell': {
-                            'userEnteredFormat': {
-                                'wrapStrategy': 'WRAP',
-                                'horizontalAlignment': 'LEFT',
-                                'verticalAlignment': 'TOP'
-                            }
-                        },
-                        'fields': 'userEnteredFormat.wrapStrategy,userEnteredFormat.horizontalAlignment,userEnteredFormat.verticalAlignment'
-                    }
-                }
-            ]
-            service.spreadsheets().batchUpdate(
-                spreadsheetId=sheet_id,
-                body={'requests': requests}
-            ).execute()
-    return result
+    attempts = [0]
+    response_bytes = [0]
+    postproc = getattr(request, 'postproc', None)
+    if postproc is not None:
+        # Ukuran respons diambil dari body HTTP mentah sebelum di-parse, tanpa serialisasi ulang
+        def measured_postproc(resp, content):
+            response_bytes[0] = len(content or b'')
+            return postproc(resp, content)
+        request.postproc = measured_postproc
 
-def append_rows_to_sheet(rows_data, sheet_id=None, range_name='Sheet1!A1'):
+    def run():
+        attempts[0] += 1
+        return request.execute()
+
+    op = _request_op(request)
+    with api_metrics.track('sheets', op, _request_target(request)) as call:
+        try:
+            result = rate_limiter.call(run, idempotent=op not in NON_IDEMPOTENT_OPS)
+        finally:
+            call.retries = max(0, attempts[0] - 1)
+        body = getattr(request, 'body', None)
+        call.rows = _response_rows(result)
+        call.bytes = (len(body) if isinstance(body, (str, bytes)) else 0) + response_bytes[0]
+        return result
+
+class SpreadsheetMetadataCache:
     """
-    Tambahkan banyak baris data ke Google Sheet sekaligus.
-    rows_data: list of list of values (2D)
-    sheet_id: opsional, gunakan SHEET_ID default jika None
-    range_name: range tujuan (default Sheet1!A1, akan append di bawah)
+    Cache metadata spreadsheet per spreadsheet ID: judul sheet -> sheetId numerik
+    dan ukuran grid. Menggantikan spreadsheets().get() sebelum setiap batchUpdate.
+    Di-invalidate saat sheet baru dibuat atau saat API melaporkan sheet tidak ditemukan.
     """
-    service = get_sheets_service()
-    if sheet_id is None:
-        sheet_id = SHEET_ID
-    body = {'values': rows_data}
-    result = service.spreadsheets().values().append(
-        spreadsheetId=sheet_id,
-        range=range_name,
-        valueInputOption='USER_ENTERED',
-        insertDataOption='INSERT_ROWS',
-        body=body
-    ).execute()
-    return result
+    FIELDS = 'sheets.properties(sheetId,title,index,gridProperties(rowCount,columnCount))'
 
-def create_new_sheet(title, sheet_id=None):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sheets = {}  # spreadsheet_id -> list of properties (urut sesuai index sheet)
+
+    def _fetch(self, spreadsheet_id):
+        service = get_sheets_service()
+        meta = execute_request(service.spreadsheets().get(spreadsheetId=spreadsheet_id, fields=self.FIELDS))
+        sheets = []
+        for sheet in meta.get('sheets', []):
+            props = sheet.get('properties', {})
+            grid = props.get('gridProperties', {})
+            sheets.append({
+                'sheetId': props.get('sheetId'),
+                'title': props.get('title'),
+                'index': props.get('index', len(sheets)),
+                'rowCount': grid.get('rowCount'),
+                'columnCount': grid.get('columnCount'),
+            })
+        sheets.sort(key=lambda p: p['index'])
+        return sheets
+
+    def get_sheets(self, spreadsheet_id, refresh=False):
+        """Daftar properti semua sheet di spreadsheet (diambil dari cache bila ada)."""
+        with self._lock:
+            sheets = None if refresh else self._sheets.get(spreadsheet_id)
+        if sheets is None:
+            sheets = self._fetch(spreadsheet_id)
+            with self._lock:
+                self._sheets[spreadsheet_id] = sheets
+        return sheets
+
+    def get_sheet_properties(self, spreadsheet_id, sheet_name=None):
+        """
+        Properti satu sheet berdasarkan judul. sheet_name None = sheet pertama.
+        Jika judul tidak ada di cache, metadata diambil ulang sekali sebelum
+        jatuh kembali ke sheet pertama.
+        """
+        sheets = self.get_sheets(spreadsheet_id)
+        if sheet_name is not None and not any(p['title'] == sheet_name for p in sheets):
+            sheets = self.get_sheets(spreadsheet_id, refresh=True)
+        if not sheets:
+            raise Exception(f"Spreadsheet {spreadsheet_id} tidak memiliki sheet.")
+        if sheet_name is not None:
+            for props in sheets:
+                if props['title'] == sheet_name:
+                    return props
+            logging.warning(f"[SpreadsheetMetadataCache] Sheet '{sheet_name}' tidak ditemukan, memakai sheet pertama")
+        return sheets[0]
+
+    def invalidate(self, spreadsheet_id=None):
+        """Hapus cache untuk satu spreadsheet, atau semuanya jika spreadsheet_id None."""
+        with self._lock:
+            if spreadsheet_id is None:
+                self._sheets.clear()
+            else:
+                self._sheets.pop(spreadsheet_id, None)
+
+metadata_cache = SpreadsheetMetadataCache()
+
+def get_sheet_id_num(spreadsheet_id=None, sheet_name=None):
+    """sheetId numerik untuk sheet_name (default: sheet pertama), dari cache metadata."""
+    if spreadsheet_id is None:
+        spreadsheet_id = SHEET_ID
+    return metadata_cache.get_sheet_properties(spreadsheet_id, sheet_name)['sheetId']
+
+def is_sheet_not_found_error(error):
+    """True jika error API menandakan sheet/grid yang dirujuk sudah tidak ada."""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    message = str(error)
+    if status == 404:
+        return True
+    return status == 400 and ('No grid with id' in message or 'Unable to parse range' in message)
+
+def batch_update_sheet(build_requests, spreadsheet_id=None, sheet_name=None):
     """
-    Membuat sheet baru di spreadsheet dengan nama title.
-    sheet_id: opsional, gunakan SHEET_ID default jika None
-    Return: sheetId dari sheet baru
+    Jalankan satu spreadsheets().batchUpdate yang butuh sheetId numerik.
+    build_requests: callable(sheet_id_num) -> list of request dict
+    Jika sheet tidak ditemukan (cache basi), metadata di-invalidate lalu dicoba sekali lagi.
     """
+    if spreadsheet_id is None:
+        spreadsheet_id = SHEET_ID
     service = get_sheets_service()
-    if sheet_id is None:
-        sheet_id = SHEET_ID
-    requests = [{
-        'addSheet': {
-            'properties': {
-                'title': title
-            }
+    for attempt in range(2):
+        sheet_id_num = get_sheet_id_num(spreadsheet_id, sheet_name)
+        try:
+            return execute_request(service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={'requests': build_requests(sheet_id_num)}
+            ))
+        except Exception as e:
+            if attempt == 0 and is_sheet_not_found_error(e):
+                metadata_cache.invalidate(spreadsheet_id)
+                continue
+            raise
+
+# Format standar untuk baris data (A6 ke bawah)
+DATA_ROW_FORMAT = {
+    'wrapStrategy': 'WRAP',
+    'horizontalAlignment': 'LEFT',
+    'verticalAlignment': 'TOP'
+}
+DATA_ROW_FORMAT_FIELDS = 'userEnteredFormat.wrapStrategy,userEnteredFormat.horizontalAlignment,userEnteredFormat.verticalAlignment'
+
+def _cell_data(value, with_format=True):
+    """Konversi satu nilai Python menjadi CellData untuk appendCells/updateCells."""
+    if isinstance(value, bool):
+        cell = {'userEnteredValue': {'boolValue': value}}
+    elif isinstance(value, (int, float)):
+        cell = {'userEnteredValue': {'numberValue': value}}
+    else:
+        cell = {'userEnteredValue': {'stringValue': '' if value is None else str(value)}}
+    if with_format:
+        cell['userEnteredFormat'] = DATA_ROW_FORMAT
+    return cell
+
+def _row_data(rows, with_format=True):
+    return [{'values': [_cell_data(v, with_format) for v in row]} for row in rows]
+
+def build_append_rows_request(sheet_id_num, rows_data):
+    """Request appendCells: tulis baris di bawah data terakhir sekaligus dengan format wrap."""
+    return {
+        'appendCells': {
+            'sheetId': sheet_id_num,
+            'rows': _row_data(rows_data),
+            'fields': 'userEnteredValue,' + DATA_ROW_FORMAT_FIELDS
         }
-    }]
-    body = {'requests': requests}
-    response = service.spreadsheets().batchUpdate(
-        spreadsheetId=sheet_id,
-        body=body
-    ).execute()
-    return response['replies'][0]['addSheet']['properties']['sheetId']
+    }
 
-def write_multilayer_header(sheet_id=None, sheet_name='Sheet1'):
+def build_update_rows_request(sheet_id_num, rows_data, start_row_index, with_format=True):
+    """Request updateCells: timpa baris mulai start_row_index (0-based) dari kolom A."""
+    return {
+        'updateCells': {
+            'start': {
+                'sheetId': sheet_id_num,
+                'rowIndex': start_row_index,
+                'columnIndex': 0
+            },
+            'rows': _row_data(rows_data, with_format),
+            'fields': 'userEnteredValue,' + DATA_ROW_FORMAT_FIELDS if with_format else 'userEnteredValue'
+        }
+    }
+
+def build_header_requests(sheet_id_num):
     """
-    Menulis header multi-layer (4 baris pertama) sesuai format laporan disposisi ke Google Sheets.
-    Akan menimpa 4 baris pertama sheet.
+    Semua request untuk header multi-layer (isi 5 baris pertama, merge, format,
+    border, dan wrap untuk area data) agar bisa dikirim dalam satu batchUpdate.
     """
-    service = get_sheets_service()
-    if sheet_id is None:
-        sheet_id = SHEET_ID
     # Baris 1: Label utama (akan di-merge)
     row1 = ["LAPORAN DISPOSISI"] + ["" for _ in range(33)]
     # Baris 2: Tanggal update (akan di-merge)
@@ -151,18 +374,8 @@ def write_multilayer_header(sheet_id=None, sheet_name='Sheet1'):
     row4[32] = "Instruksi"; row4[33] = "Tanggal"
     # Baris 5: Kosong
     row5 = ["" for _ in range(34)]
-    body = {
-        'values': [row1, row2, row3, row4, row5]
-    }
-    range_name = f'{sheet_name}!A1:AH5'
-    service.spreadsheets().values().update(
-        spreadsheetId=sheet_id,
-        range=range_name,
-        valueInputOption='RAW',
-        body=body
-    ).execute()
-    sheet_id_num = service.spreadsheets().get(spreadsheetId=sheet_id).execute()['sheets'][0]['properties']['sheetId']
-    requests = [
+    requests = [build_update_rows_request(sheet_id_num, [row1, row2, row3, row4, row5], 0, with_format=False)]
+    requests += [
         # Merge A1:AH1 for main label
         {
             'mergeCells': {
@@ -267,36 +480,140 @@ def write_multilayer_header(sheet_id=None, sheet_name='Sheet1'):
             }
         }
     ]
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=sheet_id,
-        body={'requests': requests}
-    ).execute()
-    # Set auto wrap untuk seluruh kolom data (A6:AB)
-    requests_wrap = [
-        {
-            'repeatCell': {
-                'range': {
-                    'sheetId': sheet_id_num,
-                    'startRowIndex': 5,  
-                    'endRowIndex': 1000, 
-                    'startColumnIndex': 0,
-                    'endColumnIndex': 34
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'wrapStrategy': 'WRAP',
-                        'horizontalAlignment': 'LEFT',
-                        'verticalAlignment': 'TOP'
-                    }
-                },
-                'fields': 'userEnteredFormat.wrapStrategy,userEnteredFormat.horizontalAlignment,userEnteredFormat.verticalAlignment'
+    # Set auto wrap untuk seluruh kolom data (A6:AH)
+    requests.append({
+        'repeatCell': {
+            'range': {
+                'sheetId': sheet_id_num,
+                'startRowIndex': 5,
+                'endRowIndex': 1000,
+                'startColumnIndex': 0,
+                'endColumnIndex': 34
+            },
+            'cell': {
+                'userEnteredFormat': DATA_ROW_FORMAT
+            },
+            'fields': DATA_ROW_FORMAT_FIELDS
+        }
+    })
+    return requests
+
+def _sheet_name_from_range(range_name, default='Sheet1'):
+    """Ambil judul sheet dari notasi A1, misal "'Sheet1'!A6" -> "Sheet1"."""
+    if '!' not in range_name:
+        return default
+    return range_name.split('!', 1)[0].strip("'")
+
+class SheetWritePipeline:
+    """
+    Kumpulkan semua penulisan untuk satu sheet (header, append, overwrite)
+    lalu kirim sebagai satu spreadsheets().batchUpdate saat commit().
+    backend: opsional SheetsBackend (lihat sheets_backend); default langsung ke Google Sheets.
+    """
+    def __init__(self, spreadsheet_id=None, sheet_name='Sheet1', backend=None):
+        self.spreadsheet_id = spreadsheet_id or SHEET_ID
+        self.sheet_name = sheet_name
+        self.backend = backend
+        self._builders = []
+
+    def add(self, build_requests):
+        """Tambah callable(sheet_id_num) -> list of request."""
+        self._builders.append(build_requests)
+        return self
+
+    def write_header(self):
+        return self.add(build_header_requests)
+
+    def append_rows(self, rows_data):
+        # appendCells menulis setelah baris terakhir yang berisi data di sheet
+        rows_data = [list(r) for r in rows_data]
+        return self.add(lambda sheet_id_num: [build_append_rows_request(sheet_id_num, rows_data)])
+
+    def update_rows(self, rows_data, start_row_index):
+        rows_data = [list(r) for r in rows_data]
+        return self.add(lambda sheet_id_num: [build_update_rows_request(sheet_id_num, rows_data, start_row_index)])
+
+    def commit(self):
+        """Kirim semua request yang terkumpul dalam satu round trip."""
+        if not self._builders:
+            return None
+        builders, self._builders = self._builders, []
+        build_requests = lambda sheet_id_num: [req for build in builders for req in build(sheet_id_num)]
+        if self.backend is not None:
+            return self.backend.batch_update(build_requests, self.sheet_name)
+        return batch_update_sheet(
+            build_requests,
+            spreadsheet_id=self.spreadsheet_id,
+            sheet_name=self.sheet_name
+        )
+
+def batch_get_values(ranges, spreadsheet_id=None, service=None):
+    """
+    Baca beberapa range sekaligus dengan satu values().batchGet.
+    Return: list of values (2D) dengan urutan sama seperti ranges.
+    """
+    if spreadsheet_id is None:
+        spreadsheet_id = SHEET_ID
+    if service is None:
+        service = get_sheets_service()
+    result = execute_request(service.spreadsheets().values().batchGet(
+        spreadsheetId=spreadsheet_id,
+        ranges=list(ranges)
+    ))
+    value_ranges = result.get('valueRanges', [])
+    return [(value_ranges[i].get('values', []) if i < len(value_ranges) else []) for i in range(len(ranges))]
+
+def append_row_to_sheet(row_data, sheet_id=None, range_name='Sheet1!A1'):
+    """
+    Tambahkan satu baris data ke Google Sheet.
+    row_data: list of values (1D)
+    sheet_id: opsional, gunakan SHEET_ID default jika None
+    range_name: range tujuan (default Sheet1!A1, akan append di bawah)
+    Nilai dan format wrap dikirim dalam satu batchUpdate (appendCells).
+    """
+    return append_rows_to_sheet([row_data], sheet_id=sheet_id, range_name=range_name)
+
+def append_rows_to_sheet(rows_data, sheet_id=None, range_name='Sheet1!A1'):
+    """
+    Tambahkan banyak baris data ke Google Sheet sekaligus.
+    rows_data: list of list of values (2D)
+    sheet_id: opsional, gunakan SHEET_ID default jika None
+    range_name: range tujuan (default Sheet1!A1, akan append di bawah)
+    """
+    pipeline = SheetWritePipeline(sheet_id, _sheet_name_from_range(range_name))
+    return pipeline.append_rows(rows_data).commit()
+
+def create_new_sheet(title, sheet_id=None):
+    """
+    Membuat sheet baru di spreadsheet dengan nama title.
+    sheet_id: opsional, gunakan SHEET_ID default jika None
+    Return: sheetId dari sheet baru
+    """
+    service = get_sheets_service()
+    if sheet_id is None:
+        sheet_id = SHEET_ID
+    requests = [{
+        'addSheet': {
+            'properties': {
+                'title': title
             }
         }
-    ]
-    service.spreadsheets().batchUpdate(
+    }]
+    body = {'requests': requests}
+    response = execute_request(service.spreadsheets().batchUpdate(
         spreadsheetId=sheet_id,
-        body={'requests': requests_wrap}
-    ).execute()
+        body=body
+    ))
+    # Daftar sheet berubah, metadata yang tersimpan sudah tidak valid
+    metadata_cache.invalidate(sheet_id)
+    return response['replies'][0]['addSheet']['properties']['sheetId']
+
+def write_multilayer_header(sheet_id=None, sheet_name='Sheet1'):
+    """
+    Menulis header multi-layer (4 baris pertama) sesuai format laporan disposisi ke Google Sheets.
+    Akan menimpa 4 baris pertama sheet. Isi dan format dikirim dalam satu batchUpdate.
+    """
+    return SheetWritePipeline(sheet_id, sheet_name).write_header().commit()
 
 def update_row_in_sheet(row_data, row_number, sheet_id=None, sheet_name='Sheet1'):
     """
@@ -318,15 +635,15 @@ def update_row_in_sheet(row_data, row_number, sheet_id=None, sheet_name='Sheet1'
     print(f"[update_row_in_sheet] Updating row {row_number+5} with {len(row_data)} columns")
     print(f"[update_row_in_sheet] Range: {range_name}")
     
-    service.spreadsheets().values().update(
+    execute_request(service.spreadsheets().values().update(
         spreadsheetId=sheet_id,
         range=range_name,
         valueInputOption='RAW',
         body=body
-    ).execute()
+    ))
 
 if __name__ == "__main__":
     # Contoh penggunaan: cek koneksi dan print judul spreadsheet
     service = get_sheets_service()
-    sheet = service.spreadsheets().get(spreadsheetId=SHEET_ID).execute()
+    sheet = execute_request(service.spreadsheets().get(spreadsheetId=SHEET_ID))
     print("Connected to sheet:", sheet.get('properties', {}).get('title')) 
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Parsing tanggal log disposisi yang dipakai bersama LogStore (index tahun/bulan, kunci urut) dan
+DeadlineIndex (tenggat), tanpa saling mengimpor kedua modul tersebut.
+"""
+
+def parse_date(val):
+    """
+    Parse tanggal dd-mm-YYYY atau YYYY-mm-dd (pemisah -, / atau .) menjadi (tahun, bulan, hari).
+    Return None bila format tidak dikenali.
+    """
+    if not val or not isinstance(val, str):
+        return None
+    parts = val.strip().replace('/', '-').replace('.', '-').split('-')
+    if len(parts) != 3:
+        return None
+    try:
+        if len(parts[2]) == 4:
+            day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
+        else:
+            year, month, day = int(parts[0]), int(parts[1]), int(parts[2])
+    except ValueError:
+        return None
+    if not (1 <= year <= 9999 and 1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    return year, month, day
@@ -0,0 +1,130 @@
+"""
+Index tenggat disposisi: Harap Selesai Tanggal per surat dan tenggat per jabatan.
+
+Tenggat jabatan diambil dari kolom "<jabatan> Tanggal"; jabatan yang hanya tercantum di
+Disposisi kepada (kolom instruksi Q-AH belum dimuat/diisi) memakai Harap Selesai Tanggal.
+Setiap index berupa list (ordinal tanggal, index baris) terurut yang dibangun sekali saat load
+lalu dijaga per baris (insort/hapus) di titik yang sama dengan index LogStore lainnya, sehingga
+"lewat tenggat", "jatuh tempo dalam N hari" dan tenggat per jabatan cukup dua bisect.
+
+Log belum punya penanda selesai, jadi tenggat yang sudah lewat tidak berarti disposisinya masih
+terbuka. "Lewat tenggat" karena itu dibatasi OVERDUE_WINDOW_DAYS hari terakhir; tenggat yang lebih
+lama dianggap sudah ditindaklanjuti dan tidak ikut dihitung.
+"""
+import datetime
+from array import array
+from bisect import bisect_left, insort
+from constants import ENHANCED_HEADER
+from logic.dates import parse_date
+from logic.log_aggregates import DISPOSISI_COLUMN, split_recipients
+
+DEADLINE_COLUMN = "Harap Selesai Tanggal"
+POSITIONS = [c[:-len(" Instruksi")] for c in ENHANCED_HEADER if c.endswith(" Instruksi")]
+POSITION_COLUMNS = {position: f"{position} Tanggal" for position in POSITIONS}
+# Kolom yang memengaruhi index (perubahan kolom lain tidak perlu menyentuh index)
+DEADLINE_COLUMNS = {DEADLINE_COLUMN, DISPOSISI_COLUMN} | set(POSITION_COLUMNS.values())
+
+# Batas umur tenggat yang masih dihitung "lewat tenggat" (lihat docstring modul)
+OVERDUE_WINDOW_DAYS = 30
+# Jenis filter tenggat -> (hari awal, hari akhir) inklusif relatif terhadap hari ini; None = tanpa batas
+DEADLINE_WINDOWS = {
+    'overdue': (-OVERDUE_WINDOW_DAYS, -1),  # tenggat lewat dalam OVERDUE_WINDOW_DAYS hari terakhir
+    'week': (0, 7),                         # jatuh tempo dalam 7 hari
+    'month': (0, 30),                       # jatuh tempo dalam 30 hari
+    'pending': (0, None),                   # belum jatuh tempo
+}
+
+def _date_ordinal(value):
+    """Ordinal datetime.date dari string tanggal (format parse_date), atau None."""
+    parsed = parse_date(value)
+    if not parsed:
+        return None
+    try:
+        return datetime.date(*parsed).toordinal()
+    except ValueError:  # mis. 31-02-2024
+        return None
+
+class DeadlineIndex:
+    """List (ordinal, index baris) terurut: satu untuk Harap Selesai Tanggal, satu per jabatan."""
+    __slots__ = ('_rows', '_positions', '_ordinals')
+
+    def __init__(self):
+        self._rows = []                                           # tenggat surat
+        self._positions = {position: [] for position in POSITIONS}  # tenggat per jabatan
+        self._ordinals = {}                                       # memo nilai tanggal -> ordinal
+
+    def _ordinal(self, value):
+        if not value:
+            return None
+        if value not in self._ordinals:
+            self._ordinals[value] = _date_ordinal(value)
+        return self._ordinals[value]
+
+    def _row_entries(self, deadline_value, recipients_value, position_values):
+        """(list tujuan, ordinal) untuk satu baris; position_values sejajar dengan POSITIONS."""
+        deadline = self._ordinal(deadline_value)
+        entries = [(self._rows, deadline)] if deadline is not None else []
+        recipients = split_recipients(recipients_value) if deadline is not None else ()
+        for position, value in zip(POSITIONS, position_values):
+            own = self._ordinal(value)
+            ordinal = own if own is not None else (deadline if position in recipients else None)
+            if ordinal is not None:
+                entries.append((self._positions[position], ordinal))
+        return entries
+
+    def _entries(self, store, index):
+        return self._row_entries(store.get(index, DEADLINE_COLUMN), store.get(index, DISPOSISI_COLUMN),
+                                 [store.get(index, column) for column in POSITION_COLUMNS.values()])
+
+    def add(self, store, index):
+        for rows, ordinal in self._entries(store, index):
+            insort(rows, (ordinal, index))
+
+    def discard(self, store, index):
+        """Keluarkan baris dari index; dipanggil sebelum nilainya diubah."""
+        for rows, ordinal in self._entries(store, index):
+            i = bisect_left(rows, (ordinal, index))
+            if i < len(rows) and rows[i] == (ordinal, index):
+                del rows[i]
+
+    def add_range(self, store, start, end):
+        """Tambahkan baris start..end-1 sekaligus (saat load): kolom dibaca sekali, tiap list diurutkan sekali."""
+        def column(col):
+            return store.column(col)[start:end] if col in store._col_index else [""] * (end - start)
+        added = {}
+        rows_by_offset = zip(column(DEADLINE_COLUMN), column(DISPOSISI_COLUMN),
+                             zip(*(column(c) for c in POSITION_COLUMNS.values())))
+        for offset, (deadline, recipients, positions) in enumerate(rows_by_offset):
+            for rows, ordinal in self._row_entries(deadline, recipients, positions):
+                added.setdefault(id(rows), (rows, []))[1].append((ordinal, start + offset))
+        for rows, entries in added.values():
+            rows.extend(entries)
+            rows.sort()
+
+    def _bounds(self, rows, kind, today):
+        first, last = DEADLINE_WINDOWS[kind]
+        today = (today or datetime.date.today()).toordinal()
+        lo = 0 if first is None else bisect_left(rows, (today + first,))
+        hi = len(rows) if last is None else bisect_left(rows, (today + last + 1,))
+        return lo, max(lo, hi)
+
+    def _list(self, position):
+        return self._rows if position is None else self._positions.get(position, [])
+
+    def count(self, kind, position=None, today=None):
+        """Jumlah baris untuk jenis tenggat `kind` (lihat DEADLINE_WINDOWS); O(log n)."""
+        rows = self._list(position)
+        lo, hi = self._bounds(rows, kind, today)
+        return hi - lo
+
+    def rows(self, kind, position=None, today=None):
+        """Array index baris (terurut naik, seperti index LogStore lainnya) untuk jenis tenggat `kind`."""
+        rows = self._list(position)
+        lo, hi = self._bounds(rows, kind, today)
+        return array('l', sorted(index for _, index in rows[lo:hi]))
+
+    def by_deadline(self, kind, position=None, today=None):
+        """Index baris untuk `kind` terurut dari tenggat terdekat (mis. daftar prioritas)."""
+        rows = self._list(position)
+        lo, hi = self._bounds(rows, kind, today)
+        return [index for _, index in rows[lo:hi]]
@@ -0,0 +1,81 @@
+"""
+Statistik agregat log disposisi untuk tab Ringkasan: jumlah surat per Klasifikasi, per penerima
+Disposisi kepada dan per bulan (Tgl. Surat).
+
+Counter terbuka vs selesai belum ada: log tidak punya penanda selesai (Selesai Tgl. selalu diisi
+salinan Harap Selesai Tanggal saat simpan/edit, dan kolom "<jabatan> Tanggal" adalah tanggal
+instruksi). Counter status ditambahkan di sini setelah penanda selesai disepakati dan ditulis
+oleh form simpan/edit.
+
+LogAggregates disimpan di LogStore dan diperbarui di titik yang sama dengan index tanggal dan
+trigram (extend/append/set/remove/restore), sehingga membaca ringkasan cukup menyalin counter,
+tidak memindai semua baris.
+"""
+from collections import Counter
+
+KLASIFIKASI_COLUMN = "Klasifikasi"
+DISPOSISI_COLUMN = "Disposisi kepada"
+# Kolom yang memengaruhi counter (selain Tgl. Surat, yang dibaca dari array tahun/bulan LogStore)
+AGGREGATE_COLUMNS = {KLASIFIKASI_COLUMN, DISPOSISI_COLUMN}
+EMPTY_LABEL = "(kosong)"
+
+def split_recipients(value):
+    """'Direktur Utama, GM Operasional & Pemeliharaan' -> ('Direktur Utama', 'GM Operasional & Pemeliharaan')."""
+    return tuple(part.strip() for part in str(value or "").split(",") if part.strip())
+
+class LogAggregates:
+    """Counter agregat atas baris-baris LogStore yang belum dihapus."""
+    __slots__ = ('klasifikasi', 'disposisi', 'months', 'total', '_recipients')
+
+    def __init__(self):
+        self.klasifikasi = Counter()   # nilai Klasifikasi ("" = tanpa klasifikasi) -> jumlah
+        self.disposisi = Counter()     # penerima -> jumlah surat (satu surat bisa ke beberapa penerima)
+        self.months = Counter()        # (tahun, bulan) Tgl. Surat -> jumlah; (0, 0) = tanggal tidak valid
+        self.total = 0
+        self._recipients = {}          # memo split_recipients per nilai (banyak nilai berulang)
+
+    def _split(self, value):
+        recipients = self._recipients.get(value)
+        if recipients is None:
+            recipients = self._recipients[value] = split_recipients(value)
+        return recipients
+
+    def add_columns(self, klasifikasi, disposisi, years, months):
+        """Tambahkan banyak baris sekaligus (saat load); argumen berupa kolom sejajar."""
+        self.klasifikasi.update(klasifikasi)
+        for value, count in Counter(disposisi).items():
+            for recipient in self._split(value):
+                self.disposisi[recipient] += count
+        self.months.update(zip(years, months))
+        self.total += len(klasifikasi)
+
+    def add(self, store, index, sign=1):
+        """Hitung (sign=1) atau keluarkan (sign=-1) satu baris store dari counter."""
+        self._bump(self.klasifikasi, store.get(index, KLASIFIKASI_COLUMN), sign)
+        for recipient in self._split(store.get(index, DISPOSISI_COLUMN)):
+            self._bump(self.disposisi, recipient, sign)
+        self._bump(self.months, (store.year[index], store.month[index]), sign)
+        self.total += sign
+
+    def discard(self, store, index):
+        self.add(store, index, sign=-1)
+
+    @staticmethod
+    def _bump(counter, key, sign):
+        count = counter[key] + sign
+        if count > 0:
+            counter[key] = count
+        else:
+            counter.pop(key, None)
+
+    # --- pembacaan untuk tampilan ---
+    def by_klasifikasi(self):
+        """List (label, jumlah) terurut dari yang terbanyak; tanpa klasifikasi -> EMPTY_LABEL."""
+        return [(value or EMPTY_LABEL, count) for value, count in self.klasifikasi.most_common()]
+
+    def by_disposisi(self):
+        return self.disposisi.most_common()
+
+    def by_month(self):
+        """List ((tahun, bulan), jumlah) terurut kronologis; baris tanpa Tgl. Surat valid tidak ikut."""
+        return sorted((key, count) for key, count in self.months.items() if key[0])
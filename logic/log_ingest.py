@@ -0,0 +1,118 @@
+"""
+Konversi nilai mentah Sheet1 (list baris A-AH dari replika) menjadi kolom nilai tampilan LogTab.
+
+- row_to_log_values(): jalur per baris dalam Python murni (juga fallback bila pandas tidak ada)
+- log_value_columns(): jalur vektor; baris disusun menjadi DataFrame kolom lalu padding,
+  konversi serial tanggal Excel, upper-case Klasifikasi dan strip dijalankan per kolom
+
+Keduanya menghasilkan nilai yang sama; benchmarks/log_ingest.py membandingkan kecepatannya.
+"""
+import datetime
+from constants import ENHANCED_HEADER
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError:  # pandas/numpy opsional: ingest memakai jalur per baris
+    np = pd = None
+
+# Kolom tanggal yang mungkin tersimpan sebagai serial Excel di sheet
+DATE_COLUMNS = {
+    "Tgl. Surat", "Selesai Tgl.", "Tgl. Penerimaan", "Harap Selesai Tanggal",
+    "Direktur Utama Tanggal", "Direktur Keuangan Tanggal", "Direktur Teknik Tanggal",
+    "GM Keuangan & Administrasi Tanggal", "GM Operasional & Pemeliharaan Tanggal",
+    "Manager Pemeliharaan Tanggal", "Manager Operasional Tanggal",
+    "Manager Administrasi Tanggal", "Manager Keuangan Tanggal"
+}
+KLASIFIKASI_VALUES = ["RAHASIA", "PENTING", "SEGERA"]
+STRIP_COLUMNS = ("Disposisi kepada", "Untuk Di :")
+
+# Serial Excel (sistem 1900) yang dianggap tanggal: bilangan bulat di antara batas ini
+SERIAL_MIN, SERIAL_MAX = 30000, 90000
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+DATE_FORMAT = '%d-%m-%Y'
+
+def excel_serial_to_date(val):
+    """Konversi serial Excel (sistem 1900) ke string dd-mm-YYYY; nilai lain dikembalikan apa adanya."""
+    try:
+        val_float = float(val)
+        if val_float > SERIAL_MIN and val_float < SERIAL_MAX and str(int(val_float)) == str(val):
+            return (EXCEL_EPOCH + datetime.timedelta(days=int(val_float))).strftime(DATE_FORMAT)
+    except:
+        pass
+    return val
+
+def row_to_log_values(row):
+    """Satu baris sheet (list A-AH) menjadi list nilai tampilan sesuai urutan ENHANCED_HEADER."""
+    values = []
+    for i, col in enumerate(ENHANCED_HEADER):
+        val = row[i] if i < len(row) else ""
+        if col in DATE_COLUMNS:
+            val = excel_serial_to_date(val)
+        if col == "Klasifikasi":
+            klasifikasi = val.strip().upper()
+            val = klasifikasi if klasifikasi in KLASIFIKASI_VALUES else ""
+        elif col in STRIP_COLUMNS:
+            val = val.strip()
+        values.append(val)
+    return values
+
+def _rows_to_columns(values):
+    """Jalur per baris: hasil row_to_log_values() ditransposisi menjadi list per kolom."""
+    rows = [row_to_log_values(row) for row in values]
+    if not rows:
+        return [[] for _ in ENHANCED_HEADER]
+    return [list(column) for column in zip(*rows)]
+
+def _per_unique(column, transform):
+    """
+    Terapkan transform (Series nilai unik -> Series) sekali per nilai unik lalu petakan kembali
+    ke semua baris; kolom log didominasi nilai berulang (tanggal, klasifikasi, sel kosong).
+    """
+    codes, uniques = pd.factorize(column)
+    # Sel None (kode -1) menunjuk elemen terakhir, yaitu ""
+    mapped = np.append(transform(pd.Series(uniques, dtype=object)).to_numpy(dtype=object), "")
+    return mapped[codes]
+
+def _serial_dates(uniques):
+    """Ganti nilai berisi serial Excel (digit saja, tanpa nol di depan) dengan string tanggal."""
+    serial = pd.to_numeric(uniques, errors='coerce')
+    mask = (serial > SERIAL_MIN) & (serial < SERIAL_MAX) & uniques.astype(str).str.fullmatch(r'[1-9][0-9]*')
+    if not mask.any():
+        return uniques
+    days = pd.to_timedelta(serial[mask].astype(np.int64), unit='D')
+    return uniques.where(~mask, (pd.Timestamp(EXCEL_EPOCH) + days).dt.strftime(DATE_FORMAT))
+
+def _klasifikasi(uniques):
+    upper = uniques.astype(str).str.strip().str.upper()
+    return upper.where(upper.isin(KLASIFIKASI_VALUES), "")
+
+def _strip(uniques):
+    return uniques.astype(str).str.strip()
+
+def log_value_columns(values):
+    """
+    List per kolom (urutan ENHANCED_HEADER) berisi nilai tampilan untuk semua baris `values`.
+    Memakai pandas bila tersedia; hasilnya sama dengan row_to_log_values() per baris.
+    """
+    width = len(ENHANCED_HEADER)
+    if pd is None or not values:
+        return _rows_to_columns(values)
+    # Baris pendek dipad None oleh DataFrame; sel padding di kolom i adalah baris dengan panjang <= i,
+    # sehingga cukup diganti "" lewat mask dari array panjang baris (tanpa memeriksa tiap objek)
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    frame = pd.DataFrame(values, dtype=object).reindex(columns=range(width))
+    columns = []
+    for i, col in enumerate(ENHANCED_HEADER):
+        column = frame[i].to_numpy(dtype=object)
+        padded = lengths <= i
+        if padded.any():
+            column = np.where(padded, "", column)
+        if col in DATE_COLUMNS:
+            column = _per_unique(column, _serial_dates)
+        if col == "Klasifikasi":
+            column = _per_unique(column, _klasifikasi)
+        elif col in STRIP_COLUMNS:
+            column = _per_unique(column, _strip)
+        columns.append(column.tolist())
+    return columns
@@ -0,0 +1,212 @@
+"""
+Query gabungan untuk LogTab: pencarian teks, filter kolom dan filter tahun/bulan/rentang tanggal
+dievaluasi bersama sebagai satu LogView. Filter tenggat (lewat tenggat / jatuh tempo, per jabatan)
+dijawab index tenggat LogStore (logic.deadline_index).
+
+Setiap kriteria menghasilkan array index baris yang di-cache per versi LogStore, sehingga
+mengubah satu kriteria hanya menghitung ulang kriteria tersebut lalu mengiris hasilnya.
+Kriteria yang didukung index (tanggal, trigram) selalu dihitung penuh; kriteria scan (filter
+kolom, pencarian di kolom tanpa index) dijalankan hanya pada kandidat bila kandidatnya sedikit.
+"""
+import datetime
+import threading
+from array import array
+from logic.log_store import LogView
+from logic.text_index import SearchCancelled
+
+# Kriteria scan dijalankan pada kandidat (tanpa cache) bila kandidat < jumlah baris / SCAN_ON_CANDIDATES_RATIO
+SCAN_ON_CANDIDATES_RATIO = 8
+MAX_CACHED_RESULTS = 32  # hasil per kriteria yang disimpan (mis. tiap variasi teks saat mengetik)
+
+def _intersect(a, b):
+    """Irisan dua array index terurut; hasil tetap terurut."""
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    allowed = set(small)
+    return array('l', (i for i in large if i in allowed))
+
+class LogQuery:
+    """
+    Kriteria aktif LogTab. Ubah atribut lewat set_*(); evaluate(store) mengembalikan LogView.
+    - search: (teks, kolom atau None untuk semua kolom teks)
+    - column_filter: (kolom, nilai) -> nilai kolom MENGANDUNG nilai
+    - year/month: int atau None; date_range: (datetime.date, datetime.date) atau None
+    - deadline: (jenis DEADLINE_WINDOWS, jabatan atau None) atau None
+    - sort: list (kolom, menurun) dari kunci utama; kosong = urutan sheet
+    """
+    def __init__(self):
+        self.search = None
+        self.column_filter = None
+        self.year = None
+        self.month = None
+        self.date_range = None
+        self.deadline = None
+        self.sort = []
+        # Cache hasil dipakai bersama thread load, worker pencarian dan thread Tk; semua akses lewat
+        # _lookup()/_remember()/_reset_cache() di bawah lock (komputasi kriteria di luar lock)
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._cache_key = None
+
+    def set_search(self, text, column=None):
+        text = (text or "").strip()
+        self.search = (text, column) if text else None
+
+    def set_column_filter(self, column, value):
+        self.column_filter = (column, value) if value else None
+
+    def set_year_month(self, year=None, month=None):
+        self.year = year
+        self.month = month
+
+    def set_date_range(self, start=None, end=None):
+        self.date_range = (start, end) if start and end else None
+
+    def set_deadline(self, kind=None, position=None):
+        self.deadline = (kind, position) if kind else None
+
+    def set_sort(self, keys):
+        self.sort = list(keys or [])
+
+    def toggle_sort(self, column, add=False):
+        """
+        Klik heading: kolom yang sama membalik arah (naik -> turun -> tanpa urut); add=True
+        menambah/mengubah kolom sebagai kunci berikutnya tanpa membuang kunci lain.
+        """
+        if not add:
+            if self.sort == [(column, False)]:
+                self.sort = [(column, True)]
+            elif self.sort == [(column, True)]:
+                self.sort = []
+            else:
+                self.sort = [(column, False)]
+            return
+        current = dict(self.sort)
+        if column not in current:
+            self.sort = self.sort + [(column, False)]
+        elif not current[column]:
+            self.sort = [(c, True if c == column else d) for c, d in self.sort]
+        else:
+            self.sort = [(c, d) for c, d in self.sort if c != column]
+
+    def clear(self):
+        self.search = None
+        self.column_filter = None
+        self.year = None
+        self.month = None
+        self.date_range = None
+        self.deadline = None
+
+    def is_empty(self):
+        return not (self.search or self.column_filter or self.year or self.month or self.date_range
+                    or self.deadline)
+
+    def _predicates(self, store):
+        """List (kunci_cache, indexed, fungsi(kandidat, cancel) -> array)."""
+        predicates = []
+        year, month = self.year, self.month
+        if year or month:
+            predicates.append((('date', year, month), True, lambda rows, cancel: store.date_rows(year, month)))
+        if self.date_range:
+            start, end = self.date_range
+            predicates.append((('range', start, end), True, lambda rows, cancel: store.date_range_rows(start, end)))
+        if self.deadline:
+            kind, position = self.deadline
+            # Hari ini masuk kunci cache: hasil berganti saat tanggal berganti
+            today = datetime.date.today()
+            predicates.append((('deadline', kind, position, today), True,
+                               lambda rows, cancel: store.deadlines.rows(kind, position, today)))
+        if self.search:
+            text, column = self.search
+            columns = None if column is None else [column]
+            indexed = columns is None or all(c in store.text_index.columns for c in columns)
+
+            def run_search(rows, cancel):
+                view = LogView(store, rows) if rows is not None else store.all()
+                return view.search(text, columns, cancel).indices
+            predicates.append((('search', text, column), indexed, run_search))
+        if self.column_filter:
+            column, value = self.column_filter
+
+            def run_filter(rows, cancel):
+                view = LogView(store, rows) if rows is not None else store.all()
+                return view.contains(column, value).indices
+            predicates.append((('filter', column, value), False, run_filter))
+        return predicates
+
+    def _reset_cache(self, cache_key):
+        """Kosongkan cache bila versi store (atau store-nya) berganti."""
+        with self._lock:
+            if cache_key != self._cache_key:
+                self._cache = {}
+                self._cache_key = cache_key
+
+    def _lookup(self, key):
+        with self._lock:
+            return self._cache.get(key)
+
+    def _remember(self, key, rows):
+        with self._lock:
+            self._cache[key] = rows
+            while len(self._cache) > MAX_CACHED_RESULTS:
+                self._cache.pop(next(iter(self._cache)), None)  # buang entri tertua
+        return rows
+
+    def evaluate(self, store, cancel=None):
+        """
+        Hasil semua kriteria aktif sebagai LogView (urutan baris = urutan store).
+        cancel: callable opsional; SearchCancelled dilempar bila query sudah digantikan.
+        """
+        # Kunci entri cache memuat versi store, sehingga hasil dari versi lama tidak pernah terpakai
+        cache_key = (id(store), store.version)
+        self._reset_cache(cache_key)
+        sort = tuple(self.sort)
+        predicates = [((cache_key,) + key, indexed, run) for key, indexed, run in self._predicates(store)]
+        if not predicates:
+            return self._sorted(store, None, sort, cache_key)
+
+        # 1) Kriteria ber-index atau yang sudah ada di cache: hasil penuh (di-cache)
+        results = []
+        deferred = []
+        for key, indexed, run in predicates:
+            if cancel is not None and cancel():
+                raise SearchCancelled(key)
+            cached = self._lookup(key)
+            if cached is not None:
+                results.append(cached)
+            elif indexed:
+                results.append(self._remember(key, array('l', run(None, cancel))))
+            else:
+                deferred.append((key, run))
+
+        # 2) Iris mulai dari hasil paling selektif (terkecil)
+        results.sort(key=len)
+        candidates = results[0] if results else None
+        for rows in results[1:]:
+            candidates = _intersect(candidates, rows)
+
+        # 3) Kriteria scan: pada kandidat bila sedikit, selain itu hasil penuh yang di-cache
+        for key, run in deferred:
+            if cancel is not None and cancel():
+                raise SearchCancelled(key)
+            if candidates is not None and len(candidates) * SCAN_ON_CANDIDATES_RATIO < len(store):
+                candidates = array('l', run(candidates, cancel))
+                continue
+            rows = self._remember(key, array('l', run(None, cancel)))
+            candidates = rows if candidates is None else _intersect(candidates, rows)
+        return self._sorted(store, candidates, sort, cache_key)
+
+    def _sorted(self, store, candidates, sort, cache_key):
+        """LogView kandidat (None = semua baris) dalam urutan sort."""
+        if not sort:
+            return store.all() if candidates is None else LogView(store, candidates)
+        if candidates is not None and len(candidates) * SCAN_ON_CANDIDATES_RATIO < len(store):
+            return LogView(store, candidates).sort(sort)
+        # Urutan penuh di-cache per versi store; hasil filter cukup menyaring urutan tersebut
+        key = (cache_key, 'sort', sort)
+        order = self._lookup(key)
+        if order is None:
+            order = self._remember(key, store.all().sort(sort).indices)
+        if candidates is None:
+            return LogView(store, order)
+        allowed = set(candidates)
+        return LogView(store, array('l', (i for i in order if i in allowed)))
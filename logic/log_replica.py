@@ -0,0 +1,729 @@
+import os
+import time
+import sqlite3
+import difflib
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sheets_backend import get_backend, row_ranges
+from constants import (ENHANCED_HEADER, LOG_SHEET_NAME, LOG_FIRST_ROW, LOG_SUMMARY_COLUMNS,
+                       LOG_SUMMARY_LAST_COL, LOG_DETAIL_FIRST_COL)
+
+logging.basicConfig(level=logging.WARNING)
+
+# Folder lokal untuk replika log (relatif terhadap folder kerja aplikasi, sama seperti credentials/)
+REPLICA_DIR = 'cache'
+SYNC_INTERVAL = 60  # detik, umur replika sebelum dianggap basi
+POLL_INTERVAL = 15  # detik, interval poller perubahan di latar belakang (lihat poll_changes)
+SENTINEL_ROWS = 20  # baris di akhir log (dan sesudahnya) yang dibandingkan setiap polling
+SYNC_ATTEMPTS = 3  # percobaan ulang diff bila replika ditulis secara lokal selama unduhan
+FULL_SYNC_INTERVAL = 600  # detik, sinkronisasi penuh berkala (menangkap edit kolom non-kunci dari klien lain)
+
+def _quote(col):
+    return '"' + col.replace('"', '""') + '"'
+
+def iso_date(value):
+    """
+    Ubah tanggal dari sheet ('dd-mm-yyyy', 'yyyy-mm-dd', 'dd/mm/yyyy', serial Excel)
+    menjadi 'yyyy-mm-dd' agar bisa diindeks dan diurutkan. Return '' jika tidak dikenali.
+    """
+    value = str(value or "").strip()
+    if not value:
+        return ""
+    if value.isdigit() and 30000 < int(value) < 90000:
+        return (datetime(1899, 12, 30) + timedelta(days=int(value))).strftime('%Y-%m-%d')
+    for fmt in ("%d-%m-%Y", "%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return ""
+
+def _pad_row(row):
+    row = ["" if v is None else str(v) for v in row[:len(ENHANCED_HEADER)]]
+    return row + ["" for _ in range(len(ENHANCED_HEADER) - len(row))]
+
+def _row_hash(row):
+    # Hanya kolom ringkasan (A-P) yang selalu ada di replika, jadi hash dihitung dari situ
+    return hashlib.md5("\x1f".join(row[:LOG_SUMMARY_COLUMNS]).encode('utf-8')).hexdigest()
+
+def _trim_keys(keys):
+    keys = list(keys)
+    while keys and not keys[-1]:
+        keys.pop()
+    return keys
+
+def _key_fingerprint(keys):
+    """Sidik jari kolom kunci (No. Surat) per posisi baris, dipakai sebagai watermark sinkronisasi."""
+    return hashlib.md5("\n".join(keys).encode('utf-8')).hexdigest()
+
+def _is_blank(row):
+    return not any(str(c).strip() for c in row)
+
+def _extent_keys(key_values, tail_start, tail_values):
+    """
+    Kunci per posisi sampai baris terakhir yang berisi data di A:P. key_values: hasil baca kolom B;
+    tail_values: A:P mulai posisi tail_start. Baris tanpa No. Surat di akhir log tetap mendapat
+    posisi (kunci ""), sehingga penambahan baris tanpa kunci mengubah watermark.
+    """
+    keys = _trim_keys(str(r[0]).strip() if r else "" for r in key_values)
+    filled = [offset for offset, row in enumerate(tail_values) if not _is_blank(row)]
+    extent = max(len(keys), tail_start + filled[-1] + 1 if filled else 0)
+    return keys + ["" for _ in range(extent - len(keys))]
+
+class LogReplica:
+    """
+    Replika lokal (SQLite) dari log disposisi di Sheet1!A6:AH.
+    - Semua pembacaan layar dilayani dari database lokal
+    - sync() menarik isi sheet; start_background_sync() menjalankan poll_changes() berkala
+    - apply_append/apply_update/apply_delete menerapkan penulisan yang sudah
+      berhasil di sheet agar replika langsung konsisten tanpa unduh ulang
+    Kolom pos = posisi baris di bawah header (baris sheet = pos + LOG_FIRST_ROW).
+    Sinkronisasi hanya menarik kolom ringkasan A-P; kolom instruksi Q-AH dimuat per baris
+    lewat load_details()/get_full_row() (detail_loaded = 1 jika sudah ada di replika).
+    """
+    SCHEMA_VERSION = 3
+
+    def __init__(self, backend=None, sheet_name=LOG_SHEET_NAME, db_path=None):
+        self.backend = backend or get_backend()
+        self.spreadsheet_id = self.backend.spreadsheet_id
+        self.sheet_name = sheet_name
+        if db_path is None:
+            os.makedirs(REPLICA_DIR, exist_ok=True)
+            db_path = os.path.join(REPLICA_DIR, f'log_{self.spreadsheet_id}.sqlite3')
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Satu sinkronisasi (baca lokal -> diff -> unduh -> terapkan) pada satu waktu; tidak reentrant,
+        # jadi bagian dalam memakai _sync()/_sync_incremental() yang mengandaikan lock sudah dipegang
+        self._sync_lock = threading.Lock()
+        self._sync_thread = None
+        self._stop_event = threading.Event()
+        self._listeners = []
+        self._init_schema()
+
+    # ------------------------------------------------------------------ schema
+    def _init_schema(self):
+        columns = ",\n".join(f"{_quote(col)} TEXT NOT NULL DEFAULT ''" for col in ENHANCED_HEADER)
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS sync_meta (key TEXT PRIMARY KEY, value TEXT)")
+            version = self._get_meta('schema_version')
+            if version is not None and int(version) != self.SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS log_rows")
+                self._conn.execute("DELETE FROM sync_meta")
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS log_rows (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pos INTEGER NOT NULL,
+                    {columns},
+                    tgl_surat_iso TEXT NOT NULL DEFAULT '',
+                    row_hash TEXT NOT NULL DEFAULT '',
+                    detail_loaded INTEGER NOT NULL DEFAULT 0
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_log_pos ON log_rows(pos)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_log_no_surat ON log_rows({_quote('No. Surat')})")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_log_no_agenda ON log_rows({_quote('No. Agenda')})")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_log_tgl_surat ON log_rows(tgl_surat_iso)")
+            self._set_meta('schema_version', self.SCHEMA_VERSION)
+
+    def _get_meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM sync_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO sync_meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _insert_rows(self, positioned_rows, detail_loaded=False):
+        placeholders = ", ".join("?" for _ in range(len(ENHANCED_HEADER) + 4))
+        names = ", ".join(["pos"] + [_quote(c) for c in ENHANCED_HEADER] + ["tgl_surat_iso", "row_hash", "detail_loaded"])
+        self._conn.executemany(
+            f"INSERT INTO log_rows ({names}) VALUES ({placeholders})",
+            [[pos] + row + [iso_date(row[2]), _row_hash(row), int(detail_loaded)] for pos, row in positioned_rows]
+        )
+
+    # -------------------------------------------------------------------- sync
+    def fetch_remote(self):
+        """Unduh kolom ringkasan (A-P) seluruh log. Return list of (pos, row 34 kolom), baris kosong dilewati."""
+        values = self.backend.get_range(f'{self.sheet_name}!A{LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}')
+        return [(pos, _pad_row(row)) for pos, row in enumerate(values) if any(str(c).strip() for c in row)]
+
+    def sync(self):
+        """Sinkronisasi penuh: ganti isi replika dengan isi sheet saat ini."""
+        with self._sync_lock:
+            return self._sync()
+
+    def _sync(self):
+        for attempt in range(SYNC_ATTEMPTS):
+            version = self.data_version
+            positioned_rows = self.fetch_remote()
+            with self._lock:
+                # Penulisan lokal selama unduhan mungkin belum ada di hasil unduhan: unduh ulang
+                if self.data_version != version and attempt < SYNC_ATTEMPTS - 1:
+                    continue
+                with self._conn:
+                    self._conn.execute("DELETE FROM log_rows")
+                    self._insert_rows(positioned_rows)
+                    now = time.time()
+                    self._set_meta('last_synced', now)
+                    self._set_meta('last_full_sync', now)
+                    self._write_watermark()
+                version = self.data_version
+            break
+        self._notify('sync', None, version)
+        return len(positioned_rows)
+
+    def _local_keys(self):
+        """Kolom No. Surat lokal per posisi sampai baris terakhir replika (posisi tanpa baris = '')."""
+        rows = self._conn.execute(f"SELECT pos, {_quote('No. Surat')} FROM log_rows ORDER BY pos").fetchall()
+        keys = ["" for _ in range(rows[-1][0] + 1)] if rows else []
+        for pos, key in rows:
+            keys[pos] = key.strip()
+        return keys
+
+    def _write_watermark(self):
+        # Dipanggil setiap kali isi replika berubah; data_version memberi tahu pembaca (LogTab)
+        # bahwa data yang sudah dimuat perlu diperbarui
+        keys = self._local_keys()
+        self._set_meta('row_count', len(keys))
+        self._set_meta('key_fingerprint', _key_fingerprint(keys))
+        self._set_meta('data_version', int(self._get_meta('data_version', 0)) + 1)
+
+    def sync_incremental(self):
+        """
+        Sinkronisasi delta. Hanya kolom kunci (B) dan ekor log (A:P mulai SENTINEL_ROWS baris
+        terakhir replika) yang diunduh. Ekor menentukan baris terakhir yang berisi data, sehingga
+        baris tanpa No. Surat di akhir log tetap terhitung; kunci per posisi sampai baris itu
+        dibandingkan dengan watermark (jumlah baris + sidik jari). Jika berbeda, urutan kunci lokal
+        vs sheet di-diff: baris yang hanya bergeser dipindah posisinya secara lokal, baris yang
+        dihapus dibuang, dan hanya blok yang ditambah/berubah yang diunduh ulang (A:P).
+        Edit kolom selain B tidak mengubah watermark; edit baris terbaru ditangkap poll_changes(),
+        sisanya oleh sync penuh berkala.
+        Return jumlah baris yang diunduh ulang.
+        """
+        with self._sync_lock:
+            return self._sync_incremental()
+
+    def _sync_incremental(self):
+        if self.last_synced is None:
+            return self._sync()
+        for _ in range(SYNC_ATTEMPTS):
+            fetched_count = self._sync_delta()
+            if fetched_count is not None:
+                return fetched_count
+        # Replika terus ditulis selama unduhan: ganti seluruhnya
+        return self._sync()
+
+    def _sync_delta(self):
+        """
+        Satu percobaan sync_incremental(). Diff dihitung terhadap data_version yang dibaca bersama
+        kunci lokal; jika versi bergeser sebelum hasil unduhan diterapkan (penulisan lokal di
+        antaranya), hasilnya dibuang dan None dikembalikan agar diff diulang.
+        """
+        with self._lock:
+            base_version = self.data_version
+            row_count = int(self._get_meta('row_count', 0))
+        tail_start = max(row_count - SENTINEL_ROWS, 0)
+        key_values, tail_values = self.backend.batch_get([
+            f'{self.sheet_name}!B{LOG_FIRST_ROW}:B',
+            f'{self.sheet_name}!A{tail_start + LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}'])
+        remote_keys = _extent_keys(key_values, tail_start, tail_values)
+        with self._lock:
+            if self.data_version != base_version:
+                return None
+            if _key_fingerprint(remote_keys) == self._get_meta('key_fingerprint'):
+                with self._conn:
+                    self._set_meta('last_synced', time.time())
+                return 0
+            local_keys = self._local_keys()
+
+        # Potong prefix/suffix yang sama dulu agar diff hanya pada bagian yang berubah
+        start = 0
+        while start < min(len(local_keys), len(remote_keys)) and local_keys[start] == remote_keys[start]:
+            start += 1
+        end = 0
+        while (end < min(len(local_keys), len(remote_keys)) - start
+               and local_keys[-1 - end] == remote_keys[-1 - end]):
+            end += 1
+        matcher = difflib.SequenceMatcher(None, local_keys[start:len(local_keys) - end],
+                                          remote_keys[start:len(remote_keys) - end], autojunk=False)
+        opcodes = [('equal', 0, start, 0, start)] if start else []
+        opcodes += [(tag, i1 + start, i2 + start, j1 + start, j2 + start) for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+        if end:
+            opcodes.append(('equal', len(local_keys) - end, len(local_keys), len(remote_keys) - end, len(remote_keys)))
+
+        fetch = [(j1, j2) for tag, i1, i2, j1, j2 in opcodes if tag in ('replace', 'insert')]
+        fetched_count = sum(j2 - j1 for j1, j2 in fetch)
+        if fetched_count * 2 > max(len(remote_keys), 1):
+            # Perubahan besar: sinkronisasi penuh lebih murah
+            self._sync()
+            return len(remote_keys)
+        fetched = self.backend.batch_get(
+            [f'{self.sheet_name}!A{j1 + LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}{j2 + LOG_FIRST_ROW - 1}' for j1, j2 in fetch]
+        ) if fetch else []
+
+        with self._lock:
+            if self.data_version != base_version:
+                return None
+            self._apply_delta(opcodes, fetch, fetched)
+            version = self.data_version
+        self._notify('sync', None, version)
+        return fetched_count
+
+    def _apply_delta(self, opcodes, fetch, fetched):
+        """Terapkan hasil diff _sync_delta() ke replika (dipanggil dengan self._lock dipegang)."""
+        with self._conn:
+            # Tandai semua baris lama dengan posisi negatif, lalu pindahkan yang masih ada
+            self._conn.execute("UPDATE log_rows SET pos = -pos - 1")
+            new_rows = []
+            for tag, i1, i2, j1, j2 in opcodes:
+                if tag == 'equal':
+                    self._conn.execute(
+                        "UPDATE log_rows SET pos = ? - pos - 1 WHERE pos BETWEEN ? AND ?",
+                        (j1 - i1, -i2, -i1 - 1)
+                    )
+            for (j1, j2), values in zip(fetch, fetched):
+                for offset, row in enumerate(values[:j2 - j1]):
+                    if any(str(c).strip() for c in row):
+                        new_rows.append((j1 + offset, _pad_row(row)))
+            # Baris yang isinya tidak berubah (hash sama) cukup dipindah, tidak ditulis ulang
+            for pos, row in list(new_rows):
+                moved = self._conn.execute(
+                    "UPDATE log_rows SET pos = ? WHERE id = (SELECT id FROM log_rows WHERE pos < 0 AND row_hash = ? LIMIT 1)",
+                    (pos, _row_hash(row))
+                ).rowcount
+                if moved:
+                    new_rows.remove((pos, row))
+            self._conn.execute("DELETE FROM log_rows WHERE pos < 0")
+            self._insert_rows(new_rows)
+            self._set_meta('last_synced', time.time())
+            self._write_watermark()
+
+    def poll_changes(self):
+        """
+        Deteksi murah perubahan dari klien lain (dipanggil poller latar belakang). Satu request
+        kecil membaca jendela sentinel A:P di akhir log: SENTINEL_ROWS baris terakhir replika
+        ditambah SENTINEL_ROWS baris sesudahnya. Baris yang ditambah, dihapus atau disisipkan di
+        mana pun menggeser isi jendela sehingga kuncinya (B) tidak lagi sama; hanya dalam kasus
+        itu sync_incremental() dijalankan untuk menarik blok yang berubah. Jika kunci sama, baris
+        jendela yang hash-nya berbeda (edit pada baris terbaru) diperbarui di tempat dari data
+        yang sudah terunduh. Edit baris lama di luar jendela ditangkap sync penuh berkala.
+        Return jumlah baris replika yang berubah.
+        """
+        with self._sync_lock:
+            return self._poll_changes()
+
+    def _poll_changes(self):
+        if self.last_synced is None:
+            return self._sync()
+        with self._lock:
+            base_version = self.data_version
+            end = self._conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM log_rows").fetchone()[0]
+            start = max(end - SENTINEL_ROWS, 0)
+            local = {pos: (key.strip(), row_hash) for pos, key, row_hash in self._conn.execute(
+                f"SELECT pos, {_quote('No. Surat')}, row_hash FROM log_rows WHERE pos >= ?", (start,))}
+        window = self.backend.get_range(
+            f'{self.sheet_name}!A{start + LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}{end + SENTINEL_ROWS + LOG_FIRST_ROW - 1}')
+        changed = []
+        for offset in range(end + SENTINEL_ROWS - start):
+            values = window[offset] if offset < len(window) else []
+            blank = not any(str(c).strip() for c in values)
+            current = local.get(start + offset)
+            if current is None and blank:
+                continue
+            row = _pad_row(values)
+            if current is None or blank or row[1].strip() != current[0]:
+                # Struktur log berubah (baris bergeser): diff kolom kunci. Bila diff tidak menemukan
+                # perubahan yang terlihat di jendela, sync penuh, agar polling berikutnya kembali
+                # cukup membaca jendela dan tidak mengunduh kolom B setiap kali
+                fetched_count = self._sync_incremental()
+                if self.data_version == base_version:
+                    return self._sync()
+                return fetched_count
+            if _row_hash(row) != current[1]:
+                changed.append((start + offset, row))
+        if not changed:
+            with self._lock, self._conn:
+                self._set_meta('last_synced', time.time())
+            return 0
+        return self._apply_remote_rows(changed, base_version)
+
+    def _apply_remote_rows(self, changed, base_version):
+        """
+        Timpa kolom ringkasan baris-baris yang diedit klien lain (list (pos, row)); kolom instruksi
+        ditandai belum dimuat. Setiap baris dikirim ke listener sebagai 'update' tersendiri.
+        Jika replika ditulis secara lokal sejak jendela sentinel dibaca, posisi bisa sudah bergeser:
+        tidak ada yang diterapkan dan polling berikutnya mengulang.
+        """
+        summary = ", ".join(f"{_quote(c)} = ?" for c in ENHANCED_HEADER[:LOG_SUMMARY_COLUMNS])
+        events = []
+        with self._lock:
+            if self.data_version != base_version:
+                return 0
+            with self._conn:
+                for pos, row in changed:
+                    self._conn.execute(
+                        f"UPDATE log_rows SET {summary}, tgl_surat_iso = ?, row_hash = ?, detail_loaded = 0 WHERE pos = ?",
+                        row[:LOG_SUMMARY_COLUMNS] + [iso_date(row[2]), _row_hash(row), pos]
+                    )
+                    self._write_watermark()
+                    updated = self._snapshot([pos])[0]
+                    events.append(((updated[0], self._snapshot_row(updated)), int(self._get_meta('data_version'))))
+                self._set_meta('last_synced', time.time())
+        for payload, version in events:
+            self._notify('update', payload, version)
+        return len(events)
+
+    def _get_meta_locked(self, key, default=None):
+        with self._lock:
+            return self._get_meta(key, default)
+
+    @property
+    def last_synced(self):
+        value = self._get_meta_locked('last_synced')
+        return float(value) if value else None
+
+    @property
+    def data_version(self):
+        """Naik setiap isi replika berubah (sync, delta, atau penulisan lokal); tersimpan di disk."""
+        return int(self._get_meta_locked('data_version', 0))
+
+    def is_stale(self, max_age=SYNC_INTERVAL):
+        last = self.last_synced
+        return last is None or (time.time() - last) >= max_age
+
+    def ensure_synced(self, max_age=None):
+        """Sinkronisasi hanya jika replika belum pernah diisi (atau lebih tua dari max_age)."""
+        if self.last_synced is None or (max_age is not None and self.is_stale(max_age)):
+            self.sync()
+
+    def start_background_sync(self, interval=POLL_INTERVAL):
+        """
+        Jalankan poller perubahan (poll_changes) berkala di thread daemon; perubahan diteruskan ke
+        listener (lihat add_listener). Aman dipanggil berulang.
+        """
+        if self._sync_thread and self._sync_thread.is_alive():
+            return
+        self._stop_event.clear()
+        started = time.time()
+
+        def run():
+            while not self._stop_event.is_set():
+                try:
+                    # Saat start cukup validasi delta terhadap replika di disk; sync penuh baru
+                    # setelah FULL_SYNC_INTERVAL berjalan di sesi ini
+                    last_full = max(float(self._get_meta_locked('last_full_sync') or 0), started)
+                    if time.time() - last_full >= FULL_SYNC_INTERVAL:
+                        self.sync()
+                    elif self.is_stale(interval):
+                        self.poll_changes()
+                except Exception as e:
+                    logging.warning(f"[LogReplica] Sinkronisasi latar belakang gagal: {e}")
+                self._stop_event.wait(interval)
+
+        self._sync_thread = threading.Thread(target=run, daemon=True)
+        self._sync_thread.start()
+
+    def stop_background_sync(self):
+        self._stop_event.set()
+
+    # ------------------------------------------------------------------- reads
+    def all_rows(self):
+        """Semua baris log (list 34 kolom) sesuai urutan di sheet."""
+        names = ", ".join(_quote(c) for c in ENHANCED_HEADER)
+        with self._lock:
+            return [list(r) for r in self._conn.execute(f"SELECT {names} FROM log_rows ORDER BY pos")]
+
+    def all_rows_with_ids(self):
+        """
+        (ids, rows, version): id replika (stabil selama baris tidak diunduh ulang) sejajar dengan
+        all_rows(), dibaca atomik bersama data_version-nya (lihat add_listener()).
+        """
+        names = ", ".join(_quote(c) for c in ENHANCED_HEADER)
+        with self._lock:
+            result = self._conn.execute(f"SELECT id, {names} FROM log_rows ORDER BY pos").fetchall()
+            version = self.data_version
+        return [r[0] for r in result], [list(r[1:]) for r in result], version
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM log_rows").fetchone()[0]
+
+    def find_by_no_surat(self, no_surat):
+        """Return (pos, row) untuk No. Surat tertentu, atau None."""
+        names = ", ".join(_quote(c) for c in ENHANCED_HEADER)
+        with self._lock:
+            r = self._conn.execute(
+                f"SELECT pos, {names} FROM log_rows WHERE {_quote('No. Surat')} = ? ORDER BY pos LIMIT 1",
+                (str(no_surat).strip(),)
+            ).fetchone()
+        return (r[0], list(r[1:])) if r else None
+
+    def no_surat_exists(self, no_surat, exclude=None):
+        """True jika No. Surat sudah dipakai (opsional: abaikan No. Surat milik data yang sedang diedit)."""
+        no_surat = str(no_surat).strip()
+        if exclude is not None and no_surat == str(exclude).strip():
+            return False
+        with self._lock:
+            r = self._conn.execute(
+                f"SELECT 1 FROM log_rows WHERE {_quote('No. Surat')} = ? LIMIT 1", (no_surat,)
+            ).fetchone()
+        return r is not None
+
+    def _remote_key_index(self, no_surat):
+        """Cari posisi No. Surat langsung dari kolom kunci (B) di sheet, tanpa mengunduh kolom lain."""
+        keys = self.backend.get_range(f'{self.sheet_name}!B{LOG_FIRST_ROW}:B')
+        for pos, row in enumerate(keys):
+            if row and str(row[0]).strip() == no_surat:
+                return pos
+        return None
+
+    def locate_for_write(self, no_surat):
+        """
+        Posisi baris untuk No. Surat sebelum ditimpa. Posisi lokal diverifikasi dengan
+        membaca satu sel No. Surat di sheet; jika tidak cocok (sheet berubah), replika
+        disinkronkan secara delta sekali. Jika replika belum pernah diisi, posisi dicari
+        dari kolom kunci saja. Return pos atau None jika tidak ditemukan.
+        """
+        no_surat = str(no_surat).strip()
+        if self.last_synced is None:
+            return self._remote_key_index(no_surat)
+        for attempt in range(2):
+            found = self.find_by_no_surat(no_surat)
+            if found is not None:
+                pos = found[0]
+                values = self.backend.get_range(f'{self.sheet_name}!B{pos + LOG_FIRST_ROW}')
+                if values and values[0] and str(values[0][0]).strip() == no_surat:
+                    return pos
+            if attempt == 0:
+                self.sync_incremental()
+        return None
+
+    def locate_ids_for_delete(self, ids):
+        """
+        Posisi (pos) baris-baris replika `ids` sebelum dihapus. Semua posisi diverifikasi dengan
+        satu pembacaan kolom kunci (B) di sheet; jika ada yang tidak cocok (sheet berubah),
+        replika disinkronkan secara delta sekali lalu dicocokkan ulang.
+        Return list pos terurut; ValueError jika baris tidak lagi dapat dipastikan.
+        """
+        wanted = set(ids)
+        for attempt in range(2):
+            with self._lock:
+                found = [(pos, key.strip()) for row_id, pos, key in self._conn.execute(
+                    f"SELECT id, pos, {_quote('No. Surat')} FROM log_rows") if row_id in wanted]
+            remote = [str(r[0]).strip() if r else "" for r in self.backend.get_range(
+                f'{self.sheet_name}!B{LOG_FIRST_ROW}:B')]
+            if len(found) == len(wanted) and all(
+                    (remote[pos] if pos < len(remote) else "") == key for pos, key in found):
+                return sorted(pos for pos, _ in found)
+            if attempt == 0:
+                self.sync_incremental()
+        raise ValueError("Baris yang dipilih sudah berubah di Google Sheets; muat ulang data lalu coba lagi.")
+
+    def load_details(self, positions=None, refresh=False):
+        """
+        Muat kolom instruksi (Q-AH) dari sheet. positions=None: semua baris yang belum
+        dimuat dalam satu range (mis. sebelum export); selain itu hanya baris-baris tersebut.
+        refresh=True: muat ulang walaupun sudah pernah dimuat.
+        """
+        loaded_filter = "1 = 1" if refresh else "detail_loaded = 0"
+        with self._lock:
+            if positions is None:
+                missing = [r[0] for r in self._conn.execute(f"SELECT pos FROM log_rows WHERE {loaded_filter}")]
+            else:
+                marks = ", ".join("?" for _ in positions)
+                missing = [r[0] for r in self._conn.execute(
+                    f"SELECT pos FROM log_rows WHERE {loaded_filter} AND pos IN ({marks})", list(positions))]
+        if not missing:
+            return 0
+        first, last = LOG_DETAIL_FIRST_COL, 'AH'
+        if positions is None:
+            block = self.backend.get_range(f'{self.sheet_name}!{first}{LOG_FIRST_ROW}:{last}')
+            details = {pos: (block[pos] if pos < len(block) else []) for pos in missing}
+        else:
+            values = self.backend.batch_get(
+                [f'{self.sheet_name}!{first}{pos + LOG_FIRST_ROW}:{last}{pos + LOG_FIRST_ROW}' for pos in missing])
+            details = {pos: (v[0] if v else []) for pos, v in zip(missing, values)}
+        detail_cols = ENHANCED_HEADER[LOG_SUMMARY_COLUMNS:]
+        assignments = ", ".join(f"{_quote(c)} = ?" for c in detail_cols)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"UPDATE log_rows SET {assignments}, detail_loaded = 1 WHERE pos = ?",
+                [_pad_row([""] * LOG_SUMMARY_COLUMNS + list(row))[LOG_SUMMARY_COLUMNS:] + [pos]
+                 for pos, row in details.items()]
+            )
+        return len(details)
+
+    def get_full_row(self, no_surat):
+        """
+        Baris lengkap (34 kolom) untuk No. Surat. Kolom instruksi dimuat dari sheet jika
+        belum ada; jika replika belum pernah diisi, ambil kolom kunci lalu satu baris saja.
+        Return (pos, row) atau None.
+        """
+        no_surat = str(no_surat).strip()
+        if self.last_synced is None:
+            pos = self._remote_key_index(no_surat)
+            if pos is None:
+                return None
+            values = self.backend.get_range(f'{self.sheet_name}!A{pos + LOG_FIRST_ROW}:AH{pos + LOG_FIRST_ROW}')
+            return pos, _pad_row(values[0] if values else [])
+        found = self.find_by_no_surat(no_surat)
+        if found is None:
+            return None
+        # Selalu muat ulang kolom instruksi baris yang dibuka agar edit tidak menimpa data basi
+        self.load_details([found[0]], refresh=True)
+        return self.find_by_no_surat(no_surat)
+
+    # ------------------------------------------------------------ write-through
+    # -------------------------------------------------------- penulisan lokal
+    def add_listener(self, callback):
+        """
+        callback(kind, payload, version) dipanggil (di thread penulis) setiap penulisan lokal
+        lewat apply_*/optimistic_* (termasuk rollback-nya) dan setiap perubahan dari sheet:
+        - 'append' / 'update': payload (id, row 34 kolom); 'update' juga untuk edit klien lain
+          yang terdeteksi poll_changes()
+        - 'delete': payload list id
+        - 'restore': payload list (id, row) baris yang dikembalikan setelah hapus gagal
+        - 'sync': payload None; isi replika ditarik ulang (sync/sync_incremental), muat ulang
+        version = data_version setelah perubahan; pembaca yang memegang version - 1 dapat
+        menerapkan perubahan di tempat, selain itu perlu memuat ulang.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, kind, payload, version):
+        for callback in list(self._listeners):
+            try:
+                callback(kind, payload, version)
+            except Exception as e:
+                logging.warning(f"Listener replika log gagal: {e}")
+
+    def _snapshot(self, positions):
+        """Salinan lengkap baris-baris di posisi tertentu (untuk rollback), terurut per pos."""
+        names = ", ".join(["id", "pos"] + [_quote(c) for c in ENHANCED_HEADER] + ["tgl_surat_iso", "row_hash", "detail_loaded"])
+        wanted = set(positions)
+        if not wanted:
+            return []
+        rows = self._conn.execute(f"SELECT {names} FROM log_rows WHERE pos BETWEEN ? AND ? ORDER BY pos",
+                                  (min(wanted), max(wanted)))
+        return [r for r in rows if r[1] in wanted]
+
+    @staticmethod
+    def _snapshot_row(snapshot):
+        return list(snapshot[2:2 + len(ENHANCED_HEADER)])
+
+    def apply_append(self, row, pos=None):
+        """Catat baris yang baru saja ditambahkan di sheet (default: setelah baris terakhir). Return id baris."""
+        row = _pad_row(row)
+        with self._lock:
+            with self._conn:
+                if pos is None:
+                    pos = self._conn.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM log_rows").fetchone()[0]
+                self._insert_rows([(pos, row)], detail_loaded=True)
+                row_id = self._conn.execute("SELECT MAX(id) FROM log_rows").fetchone()[0]
+                self._write_watermark()
+            version = self.data_version
+        self._notify('append', (row_id, row), version)
+        return row_id
+
+    def apply_update(self, pos, row):
+        """Catat baris yang baru saja ditimpa di sheet."""
+        row = _pad_row(row)
+        assignments = ", ".join(f"{_quote(c)} = ?" for c in ENHANCED_HEADER)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    f"UPDATE log_rows SET {assignments}, tgl_surat_iso = ?, row_hash = ?, detail_loaded = 1 WHERE pos = ?",
+                    row + [iso_date(row[2]), _row_hash(row), pos]
+                )
+                found = self._conn.execute("SELECT id FROM log_rows WHERE pos = ?", (pos,)).fetchone()
+                self._write_watermark()
+            version = self.data_version
+        if found is not None:
+            self._notify('update', (found[0], row), version)
+
+    def apply_delete(self, positions):
+        """Catat baris yang baru saja dihapus di sheet; baris di bawahnya bergeser naik."""
+        with self._lock:
+            with self._conn:
+                ids = [r[0] for r in self._snapshot(positions)]
+                # Per rentang posisi berurutan, dari bawah: satu DELETE dan satu geser per rentang
+                for first, last in reversed(row_ranges(positions)):
+                    self._conn.execute("DELETE FROM log_rows WHERE pos BETWEEN ? AND ?", (first, last))
+                    self._conn.execute("UPDATE log_rows SET pos = pos - ? WHERE pos > ?", (last - first + 1, last))
+                self._write_watermark()
+            version = self.data_version
+        self._notify('delete', ids, version)
+
+    # Penulisan optimistis: replika (dan pembaca lewat listener) diperbarui sebelum request ke
+    # sheet dikirim; jika blok with melempar exception, perubahan lokal dikembalikan lalu
+    # exception diteruskan ke pemanggil. Baris baru tidak ditulis optimistis: posisinya baru
+    # diketahui setelah append (lihat sheet_logic.upload_to_sheet), lalu dicatat lewat apply_append.
+    @contextmanager
+    def optimistic_update(self, pos, row):
+        with self._lock:
+            old = self._snapshot([pos])
+        self.apply_update(pos, row)
+        try:
+            yield
+        except Exception:
+            if old:
+                self._restore_snapshot(old, reinsert=False)
+            raise
+
+    @contextmanager
+    def optimistic_delete(self, positions):
+        with self._lock:
+            old = self._snapshot(positions)
+        self.apply_delete(positions)
+        try:
+            yield
+        except Exception:
+            self._restore_snapshot(old, reinsert=True, positions=positions)
+            raise
+
+    def _restore_snapshot(self, snapshot, reinsert, positions=()):
+        """Kembalikan baris dari _snapshot(); reinsert=True untuk baris yang sudah dihapus."""
+        names = ["id", "pos"] + [_quote(c) for c in ENHANCED_HEADER] + ["tgl_surat_iso", "row_hash", "detail_loaded"]
+        with self._lock:
+            with self._conn:
+                if reinsert:
+                    # Buka kembali celah posisi per rentang (naik), lalu sisipkan dengan id semula
+                    for first, last in row_ranges(positions):
+                        self._conn.execute("UPDATE log_rows SET pos = pos + ? WHERE pos >= ?", (last - first + 1, first))
+                    self._conn.executemany(
+                        f"INSERT INTO log_rows ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+                        snapshot)
+                else:
+                    assignments = ", ".join(f"{name} = ?" for name in names[2:])
+                    self._conn.executemany(
+                        f"UPDATE log_rows SET {assignments} WHERE id = ?",
+                        [list(r[2:]) + [r[0]] for r in snapshot])
+                self._write_watermark()
+            version = self.data_version
+        if reinsert:
+            self._notify('restore', [(r[0], self._snapshot_row(r)) for r in snapshot], version)
+        else:
+            self._notify('update', (snapshot[0][0], self._snapshot_row(snapshot[0])), version)
+
+    def close(self):
+        self.stop_background_sync()
+        with self._lock:
+            self._conn.close()
+
+_replicas = {}
+_replicas_lock = threading.Lock()
+
+def get_log_replica(backend=None):
+    """Replika log bersama untuk backend aktif (dibuat sekali per proses per spreadsheet)."""
+    backend = backend or get_backend()
+    with _replicas_lock:
+        replica = _replicas.get(backend.spreadsheet_id)
+        if replica is None or replica.backend is not backend:
+            replica = LogReplica(backend)
+            _replicas[backend.spreadsheet_id] = replica
+        return replica
@@ -0,0 +1,429 @@
+"""
+Penyimpanan kompak untuk data log yang ditampilkan di LogTab.
+
+Data disimpan per kolom (satu list per kolom ENHANCED_HEADER) alih-alih satu dict per baris.
+Nilai yang banyak berulang (Klasifikasi, Disposisi kepada, Untuk Di, tanggal, dst.) di-intern
+sehingga baris-baris berbagi objek string yang sama. Hasil pencarian/filter berupa LogView:
+array index ke dalam LogStore, bukan salinan list of dict.
+
+Tgl. Surat di-parse sekali saat baris ditambahkan menjadi (tahun, bulan, hari) bertipe int
+dan diindeks tahun -> bulan -> index baris, sehingga filter tahun/bulan dan rentang tanggal
+cukup berupa lookup. Kolom teks utama juga diindeks trigram (logic.text_index) untuk pencarian.
+Kunci urut per kolom (tanggal, nomor natural, teks casefold) dihitung saat baris masuk sehingga
+mengurutkan ulang cukup lookup kunci + sort stabil. Statistik ringkasan (logic.log_aggregates)
+dan index tenggat (logic.deadline_index) diperbarui di titik yang sama dengan index-index tersebut.
+"""
+import re
+import sys
+from array import array
+from constants import ENHANCED_HEADER
+from logic.dates import parse_date
+from logic.text_index import TrigramIndex, SearchCancelled
+from logic.log_aggregates import LogAggregates, AGGREGATE_COLUMNS, KLASIFIKASI_COLUMN, DISPOSISI_COLUMN
+from logic.deadline_index import DeadlineIndex, DEADLINE_COLUMNS
+
+# Kolom teks bebas yang hampir selalu unik per baris; kolom lain di-intern
+FREE_TEXT_COLUMNS = {"No. Agenda", "No. Surat", "Perihal"} | {c for c in ENHANCED_HEADER if c.endswith("Instruksi")}
+DATE_COLUMN = "Tgl. Surat"
+# Kolom yang masuk index pencarian teks penuh
+TEXT_SEARCH_COLUMNS = ["Perihal", "Asal Surat", "No. Surat", "Ditujukan"] + [c for c in ENHANCED_HEADER if c.endswith("Instruksi")]
+# Kolom yang diurutkan sebagai tanggal dan sebagai nomor natural ("2" < "10", "12/UM" < "100/UM")
+SORT_DATE_COLUMNS = {c for c in ENHANCED_HEADER if c.startswith("Tgl.") or c.endswith(("Tgl.", "Tanggal"))}
+NATURAL_SORT_COLUMNS = {"No. Agenda", "No. Surat", "Kode Klasifikasi"}
+_DIGITS = re.compile(r'(\d+)')
+
+def sort_key(col, val):
+    """
+    Kunci urut untuk satu nilai kolom. Nilai kosong selalu di akhir (urutan naik); tanggal yang
+    tidak bisa di-parse diurutkan sebagai teks setelah tanggal yang valid.
+    """
+    text = str(val).strip() if val is not None else ""
+    if not text:
+        return (2,)
+    if col in SORT_DATE_COLUMNS:
+        parsed = parse_date(text)
+        if parsed:
+            return (0, parsed)
+        return (1, text.casefold())
+    if col in NATURAL_SORT_COLUMNS:
+        # Potongan teks dan angka bergantian, selalu diawali teks -> tipe per posisi konsisten
+        parts = _DIGITS.split(text.casefold())
+        return (0, tuple(int(p) if i % 2 else p for i, p in enumerate(parts)))
+    return (0, text.casefold())
+
+class LogStore:
+    """Kolom-kolom log dalam bentuk list paralel; baris diakses lewat index (0-based, urutan sheet)."""
+    __slots__ = ('header', '_col_index', '_columns', '_intern', '_date_col', 'year', 'month', 'day', '_date_index',
+                 'text_index', 'version', '_display', '_sort_keys', '_sort_memo', '_removed',
+                 'aggregates', 'deadlines')
+
+    def __init__(self, header=ENHANCED_HEADER):
+        self.header = list(header)
+        self._col_index = {col: i for i, col in enumerate(self.header)}
+        self._columns = [[] for _ in self.header]
+        self._intern = [col not in FREE_TEXT_COLUMNS for col in self.header]
+        self._date_col = self._col_index.get(DATE_COLUMN)
+        # Tgl. Surat bertipe int per baris (0 = tidak ada/tidak valid)
+        self.year = array('h')
+        self.month = array('b')
+        self.day = array('b')
+        self._date_index = {}  # tahun -> bulan -> array index baris (terurut)
+        self.text_index = TrigramIndex([c for c in TEXT_SEARCH_COLUMNS if c in self._col_index])
+        self.version = 0  # naik setiap perubahan data; dipakai cache LogQuery
+        self._display = {}  # index -> tuple str untuk Treeview (dibuat saat pertama tampil)
+        # Kunci urut per kolom, sejajar dengan _columns; memo per nilai karena banyak nilai berulang
+        self._sort_keys = [[] for _ in self.header]
+        self._sort_memo = [{} for _ in self.header]
+        self._removed = set()  # index baris yang sudah dihapus; index baris lain tidak bergeser
+        self.aggregates = LogAggregates()  # counter ringkasan atas baris yang belum dihapus
+        self.deadlines = DeadlineIndex()   # tenggat surat dan per jabatan
+
+    def __len__(self):
+        return len(self._columns[0]) if self._columns else 0
+
+    def append(self, values):
+        """Tambahkan satu baris (list nilai sesuai urutan header; kekurangan diisi "")."""
+        for i, column in enumerate(self._columns):
+            val = values[i] if i < len(values) else ""
+            if val is None:
+                val = ""
+            if self._intern[i] and isinstance(val, str):
+                val = sys.intern(val)
+            column.append(val)
+            self._sort_keys[i].append(self._sort_key(i, val))
+        index = len(self) - 1
+        self._index_date(index)
+        self.aggregates.add(self, index)
+        self.deadlines.add(self, index)
+        self.text_index.add(index, LogRecord(self, index))
+        self.version += 1
+
+    def extend(self, rows):
+        """Tambahkan banyak baris sekaligus; index teks dibangun per batch (lebih cepat dari append per baris)."""
+        width = len(self.header)
+        rows = [list(values[:width]) + [""] * (width - len(values)) for values in rows]
+        self.extend_columns([list(column) for column in zip(*rows)] if rows else [])
+
+    def extend_columns(self, columns):
+        """
+        Tambahkan banyak baris dari list per kolom (urutan header, semua sama panjang), mis. hasil
+        logic.log_ingest.log_value_columns(); kolom yang tidak ada diisi "".
+        """
+        start = len(self)
+        count = len(columns[0]) if columns else 0
+        for i, column in enumerate(self._columns):
+            added = columns[i] if i < len(columns) else [""] * count
+            added = ["" if val is None else val for val in added]
+            if self._intern[i]:
+                added = [sys.intern(val) if isinstance(val, str) else val for val in added]
+            column.extend(added)
+            memo = self._sort_memo[i]
+            for val in set(added).difference(memo):
+                memo[val] = sort_key(self.header[i], val)
+            self._sort_keys[i].extend(map(memo.__getitem__, added))
+        for index in range(start, len(self)):
+            self._index_date(index)
+        self.aggregates.add_columns(
+            *(self._column_or_blank(col)[start:] for col in (KLASIFIKASI_COLUMN, DISPOSISI_COLUMN)),
+            self.year[start:], self.month[start:])
+        self.deadlines.add_range(self, start, len(self))
+        self.text_index.add_many({col: self.column(col)[start:] for col in self.text_index.columns})
+        self.version += 1
+
+    def remove(self, indices):
+        """
+        Hapus baris dari semua index (tanggal, trigram) tanpa menggeser index baris lain;
+        baris yang dihapus tidak lagi muncul di all() maupun hasil query.
+        """
+        for index in indices:
+            if index in self._removed:
+                continue
+            self._removed.add(index)
+            self.aggregates.discard(self, index)
+            self.deadlines.discard(self, index)
+            self._unindex_date(index)
+            self.year[index] = self.month[index] = self.day[index] = 0
+            self.text_index.remove(index)
+            self._display.pop(index, None)
+        self.version += 1
+
+    def restore(self, indices):
+        """Kembalikan baris yang dihapus lewat remove() (mis. hapus di sheet gagal); nilainya masih tersimpan."""
+        for index in indices:
+            if index not in self._removed:
+                continue
+            self._removed.discard(index)
+            self._index_date(index)
+            self.aggregates.add(self, index)
+            self.deadlines.add(self, index)
+            for col in self.text_index.columns:
+                self.text_index.update(index, col, self.get(index, col))
+        self.version += 1
+
+    def live_count(self):
+        """Jumlah baris yang belum dihapus."""
+        return len(self) - len(self._removed)
+
+    def _sort_key(self, i, val):
+        memo = self._sort_memo[i]
+        key = memo.get(val)
+        if key is None:
+            key = memo[val] = sort_key(self.header[i], val)
+        return key
+
+    def sort_keys(self, col):
+        """List kunci urut kolom `col` per index baris (lihat sort_key())."""
+        return self._sort_keys[self._col_index[col]]
+
+    def _index_date(self, index):
+        parsed = parse_date(self._columns[self._date_col][index]) if self._date_col is not None else None
+        year, month, day = parsed or (0, 0, 0)
+        if index == len(self.year):
+            self.year.append(year)
+            self.month.append(month)
+            self.day.append(day)
+        else:
+            self._unindex_date(index)
+            self.year[index], self.month[index], self.day[index] = year, month, day
+        if parsed:
+            rows = self._date_index.setdefault(year, {}).setdefault(month, array('l'))
+            rows.append(index)
+            if len(rows) > 1 and rows[-2] > index:
+                self._date_index[year][month] = array('l', sorted(rows))
+
+    def _unindex_date(self, index):
+        year, month = self.year[index], self.month[index]
+        months = self._date_index.get(year, {})
+        rows = months.get(month)
+        if rows is not None and index in rows:
+            rows.remove(index)
+            if not rows:
+                del months[month]
+                if not months:
+                    del self._date_index[year]
+
+    def column(self, col):
+        """List nilai satu kolom (jangan diubah langsung; gunakan set())."""
+        return self._columns[self._col_index[col]]
+
+    def _column_or_blank(self, col):
+        i = self._col_index.get(col)
+        return self._columns[i] if i is not None else [""] * len(self)
+
+    def get(self, index, col, default=""):
+        i = self._col_index.get(col)
+        if i is None:
+            return default
+        return self._columns[i][index]
+
+    def set(self, index, col, val):
+        i = self._col_index[col]
+        if self._intern[i] and isinstance(val, str):
+            val = sys.intern(val)
+        live = index not in self._removed
+        counted = live and (col in AGGREGATE_COLUMNS or i == self._date_col)
+        deadline = live and col in DEADLINE_COLUMNS
+        if counted:
+            self.aggregates.discard(self, index)
+        if deadline:
+            self.deadlines.discard(self, index)
+        self._columns[i][index] = val
+        self._sort_keys[i][index] = self._sort_key(i, val)
+        self._display.pop(index, None)
+        if i == self._date_col:
+            self._index_date(index)
+        if counted:
+            self.aggregates.add(self, index)
+        if deadline:
+            self.deadlines.add(self, index)
+        self.text_index.update(index, col, val)
+        self.version += 1
+
+    def values(self, index):
+        return [column[index] for column in self._columns]
+
+    def display_values(self, index):
+        """Nilai baris sebagai tuple str siap tampil; di-cache sampai baris diubah lewat set()."""
+        values = self._display.get(index)
+        if values is None:
+            values = self._display[index] = tuple(str(column[index]) for column in self._columns)
+        return values
+
+    def record(self, index):
+        return LogRecord(self, index)
+
+    def all(self):
+        if self._removed:
+            removed = self._removed
+            return LogView(self, array('l', (i for i in range(len(self)) if i not in removed)))
+        return LogView(self, array('l', range(len(self))))
+
+    # --- indeks tanggal (Tgl. Surat) ---
+    def date_of(self, index):
+        """(tahun, bulan, hari) untuk baris index, atau None bila Tgl. Surat tidak valid."""
+        if not self.year[index]:
+            return None
+        return self.year[index], self.month[index], self.day[index]
+
+    def years(self):
+        return sorted(self._date_index)
+
+    def months(self, year=None):
+        if year is not None:
+            return sorted(self._date_index.get(year, {}))
+        return sorted({m for months in self._date_index.values() for m in months})
+
+    def date_rows(self, year=None, month=None):
+        """Array index baris (terurut) untuk tahun dan/atau bulan tertentu; None berarti semua."""
+        if year is None and month is None:
+            return array('l', (i for i in range(len(self)) if self.year[i]))
+        years = [year] if year is not None else list(self._date_index)
+        parts = []
+        for y in years:
+            months = self._date_index.get(y, {})
+            if month is not None:
+                parts.append(months.get(month, ()))
+            else:
+                parts.extend(months.values())
+        if len(parts) == 1:
+            return array('l', parts[0])
+        return array('l', sorted(i for part in parts for i in part))
+
+    def date_range_rows(self, start, end):
+        """
+        Array index baris dengan Tgl. Surat di antara start dan end (datetime.date, inklusif).
+        Hanya bulan-bulan di dalam rentang yang diperiksa per hari.
+        """
+        lo = (start.year, start.month, start.day)
+        hi = (end.year, end.month, end.day)
+        result = []
+        for y, months in self._date_index.items():
+            if not (lo[0] <= y <= hi[0]):
+                continue
+            for m, rows in months.items():
+                if not ((lo[0], lo[1]) <= (y, m) <= (hi[0], hi[1])):
+                    continue
+                if (y, m) != (lo[0], lo[1]) and (y, m) != (hi[0], hi[1]):
+                    result.extend(rows)
+                else:
+                    day = self.day
+                    result.extend(i for i in rows if lo <= (y, m, day[i]) <= hi)
+        return array('l', sorted(result))
+
+class LogRecord:
+    """Pandangan satu baris LogStore dengan antarmuka mirip dict (get/[]/keys/items)."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def get(self, col, default=""):
+        return self.store.get(self.index, col, default)
+
+    def __getitem__(self, col):
+        if col not in self.store._col_index:
+            raise KeyError(col)
+        return self.store.get(self.index, col)
+
+    def __contains__(self, col):
+        return col in self.store._col_index
+
+    def keys(self):
+        return list(self.store.header)
+
+    def items(self):
+        return list(zip(self.store.header, self.store.values(self.index)))
+
+    def to_dict(self):
+        return dict(self.items())
+
+class LogView:
+    """
+    Subset baris LogStore sebagai array index. Mendukung len(), iterasi (LogRecord),
+    index/slice, dan filter berantai tanpa menyalin data baris.
+    """
+    __slots__ = ('store', 'indices')
+
+    def __init__(self, store, indices):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __bool__(self):
+        return len(self.indices) > 0
+
+    def __iter__(self):
+        store = self.store
+        for index in self.indices:
+            yield LogRecord(store, index)
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return LogView(self.store, self.indices[pos])
+        return LogRecord(self.store, self.indices[pos])
+
+    def index_at(self, pos):
+        """Index baris di LogStore untuk posisi ke-pos di view ini."""
+        return self.indices[pos]
+
+    def column_values(self, col):
+        column = self.store.column(col)
+        return (column[i] for i in self.indices)
+
+    def filter(self, col, predicate):
+        """View baru berisi baris yang nilai kolom `col`-nya memenuhi predicate(value)."""
+        column = self.store.column(col)
+        return LogView(self.store, array('l', (i for i in self.indices if predicate(column[i]))))
+
+    def restrict(self, rows):
+        """View baru: irisan view ini dengan array index baris `rows` (mis. dari date_rows())."""
+        if len(self.indices) == len(self.store):
+            return LogView(self.store, array('l', rows))
+        allowed = set(rows)
+        return LogView(self.store, array('l', (i for i in self.indices if i in allowed)))
+
+    def date_range(self, start, end):
+        """View baru berisi baris dengan Tgl. Surat dalam rentang [start, end] (datetime.date)."""
+        return self.restrict(self.store.date_range_rows(start, end))
+
+    def search(self, query, columns=None, cancel=None):
+        """
+        View baru berisi baris yang memuat semua kata di query (substring, tanpa beda huruf besar/kecil)
+        pada kolom `columns`; kolom yang tidak diindeks dicari dengan scan linear.
+        cancel: lihat TrigramIndex.search (SearchCancelled bila query sudah tidak relevan).
+        """
+        indexed = self.store.text_index.columns
+        if columns is not None and any(c not in indexed for c in columns):
+            view = self
+            for term in query.split():
+                if cancel is not None and cancel():
+                    raise SearchCancelled(query)
+                lowered = term.lower()
+                view = LogView(self.store, array('l', (
+                    i for i in view.indices
+                    if any(lowered in str(self.store.get(i, c)).lower() for c in columns))))
+            return view
+        rows = self.store.text_index.search(query, columns, cancel)
+        if rows is None:
+            return self
+        return self.restrict(rows)
+
+    def sort(self, keys):
+        """
+        View baru dengan urutan menurut keys: list (kolom, menurun) dari kunci utama ke kunci
+        berikutnya. Sort stabil per kunci mulai dari kunci terakhir, sehingga baris yang sama
+        tetap berurutan sesuai urutan sheet.
+        """
+        order = list(self.indices)
+        for col, descending in reversed(list(keys)):
+            order.sort(key=self.store.sort_keys(col).__getitem__, reverse=descending)
+        return LogView(self.store, array('l', order))
+
+    def contains(self, col, needle, ignore_case=False):
+        if ignore_case:
+            needle = needle.lower()
+            return self.filter(col, lambda v: needle in str(v).lower())
+        return self.filter(col, lambda v: needle in str(v))
@@ -0,0 +1,169 @@
+"""
+Inverted index trigram untuk pencarian teks di log disposisi.
+
+Setiap nilai kolom teks di-lowercase sekali lalu dipecah menjadi trigram (3 karakter berurutan).
+Posting list berupa array index baris yang terurut. Query dipecah per kata (semua kata harus
+ada, AND); kandidat diperoleh dari irisan posting trigram kata tersebut lalu diverifikasi dengan
+pencarian substring pada teks yang sudah di-lowercase, sehingga hasilnya sama dengan scan linear.
+"""
+from array import array
+from bisect import bisect_left, insort
+
+class SearchCancelled(Exception):
+    """Dilempar search() bila cancel() bernilai True (query sudah digantikan query yang lebih baru)."""
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _has(postings, row):
+    i = bisect_left(postings, row)
+    return i < len(postings) and postings[i] == row
+
+class TrigramIndex:
+    """
+    Index trigram atas beberapa kolom. Baris diidentifikasi dengan index (int) yang sama
+    dengan LogStore; add/update/remove menjaga index tetap sinkron secara inkremental.
+    """
+    __slots__ = ('columns', '_lower', '_postings')
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self._lower = {col: [] for col in self.columns}   # teks lowercase per kolom per baris
+        self._postings = {}                                 # trigram -> array('l') index baris
+
+    def __len__(self):
+        return len(self._lower[self.columns[0]]) if self.columns else 0
+
+    def _row_grams(self, row):
+        grams = set()
+        for col in self.columns:
+            grams |= trigrams(self._lower[col][row])
+        return grams
+
+    def add(self, row, values):
+        """Tambahkan baris baru; values: dict/record kolom -> nilai. row harus = len(index)."""
+        for col in self.columns:
+            text = values.get(col, "")
+            self._lower[col].append(str(text).lower() if text else "")
+        for gram in self._row_grams(row):
+            postings = self._postings.get(gram)
+            if postings is None:
+                self._postings[gram] = array('l', (row,))
+            elif postings[-1] < row:
+                postings.append(row)
+            else:
+                insort(postings, row)
+
+    def add_many(self, columns):
+        """
+        Tambahkan banyak baris sekaligus (saat load). columns: dict kolom -> list nilai, semua sama
+        panjang; baris baru mendapat index len(index), len(index)+1, ...
+        Trigram dihitung sekali per nilai unik karena banyak nilai berulang antar baris.
+        """
+        start = len(self)
+        count = len(next(iter(columns.values()))) if columns else 0
+        lowered = []
+        for col in self.columns:
+            values = columns.get(col) or [""] * count
+            texts = [str(v).lower() if v else "" for v in values]
+            self._lower[col].extend(texts)
+            lowered.append(texts)
+        gram_cache = {}
+        pending = {}
+        for offset in range(count):
+            grams = set()
+            for texts in lowered:
+                text = texts[offset]
+                if len(text) < 3:
+                    continue
+                cached = gram_cache.get(text)
+                if cached is None:
+                    cached = gram_cache[text] = trigrams(text)
+                grams |= cached
+            row = start + offset
+            for gram in grams:
+                rows = pending.get(gram)
+                if rows is None:
+                    pending[gram] = [row]
+                else:
+                    rows.append(row)
+        for gram, rows in pending.items():
+            postings = self._postings.get(gram)
+            if postings is None:
+                self._postings[gram] = array('l', rows)
+            else:
+                postings.extend(rows)
+
+    def remove(self, row):
+        """Hapus baris dari posting list (teksnya dikosongkan; index baris lain tidak bergeser)."""
+        for gram in self._row_grams(row):
+            postings = self._postings.get(gram)
+            if postings is not None and _has(postings, row):
+                postings.remove(row)
+                if not postings:
+                    del self._postings[gram]
+        for col in self.columns:
+            self._lower[col][row] = ""
+
+    def update(self, row, col, value):
+        """Perbarui satu kolom baris yang sudah ada."""
+        if col not in self._lower:
+            return
+        old_grams = self._row_grams(row)
+        self._lower[col][row] = str(value).lower() if value else ""
+        new_grams = self._row_grams(row)
+        for gram in old_grams - new_grams:
+            postings = self._postings.get(gram)
+            if postings is not None and _has(postings, row):
+                postings.remove(row)
+                if not postings:
+                    del self._postings[gram]
+        for gram in new_grams - old_grams:
+            postings = self._postings.setdefault(gram, array('l'))
+            insort(postings, row)
+
+    def _term_candidates(self, term):
+        """Kandidat baris untuk satu kata (None = semua baris; kata < 3 karakter tidak punya trigram)."""
+        grams = trigrams(term)
+        if not grams:
+            return None
+        lists = []
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                return []
+            lists.append(postings)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            candidates = [row for row in candidates if _has(postings, row)]
+            if not candidates:
+                break
+        return candidates
+
+    def search(self, query, columns=None, cancel=None):
+        """
+        Index baris (terurut) yang memuat setiap kata di query sebagai substring pada salah
+        satu kolom `columns` (default: semua kolom index). Query kosong -> None (tanpa filter).
+        cancel: callable opsional, dicek per kata; bila True dilempar SearchCancelled.
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        columns = [c for c in (columns or self.columns) if c in self._lower]
+        texts = [self._lower[c] for c in columns]
+        result = None
+        # Kata terpanjang biasanya paling selektif, proses lebih dulu
+        for term in sorted(set(terms), key=len, reverse=True):
+            if cancel is not None and cancel():
+                raise SearchCancelled(query)
+            candidates = self._term_candidates(term)
+            if candidates is None:
+                candidates = result if result is not None else range(len(self))
+            elif result is not None:
+                allowed = set(result)
+                candidates = [row for row in candidates if row in allowed]
+            result = [row for row in candidates if any(term in text[row] for text in texts)]
+            if not result:
+                break
+        return array('l', result)
@@ -934,39 +934,30 @@ class EditTab(ttk.Frame):
                     loading_manager.hide_loading()
                     return
                 
-                # Cek duplikasi No. Surat (kecuali data yang sedang diedit)
+                # Pre-check: segarkan replika (cek duplikasi No. Surat, kecuali data yang sedang
+                # diedit), lalu verifikasi posisi baris lama di sheet. Berurutan karena
+                # locate_for_write dapat menjalankan sinkronisasi sendiri bila posisinya bergeser
+                row_pos = None
                 try:
-                    from google_sheets_connect import get_sheets_service, SHEET_ID
-                    service = get_sheets_service()
-                    range_name = 'Sheet1!A6:AH'  # Changed to include all columns
-                    result = service.spreadsheets().values().get(
-                        spreadsheetId=SHEET_ID,
-                        range=range_name
-                    ).execute()
-                    values = result.get('values', [])
+                    from logic.log_replica import get_log_replica
+                    replica = get_log_replica()
                     no_surat_lama = safe_get_value(self.data_log, "No. Surat")
-                    
-                    for row in values:
-                        if len(row) > 1:
-                            no_surat = str(row[1]).strip()
-                            if no_surat and no_surat == no_surat_baru and no_surat != no_surat_lama:
-                                LoadingMessageBox.showerror("Error", f"No. Surat '{no_surat_baru}' sudah ada di data lain!", parent=self)
-                                loading_manager.hide_loading()
-                                return
+                    replica.sync_incremental()
+                    row_pos = replica.locate_for_write(no_surat_lama)
+                    if replica.no_surat_exists(no_surat_baru, exclude=no_surat_lama):
+                        LoadingMessageBox.showerror("Error", f"No. Surat '{no_surat_baru}' sudah ada di data lain!", parent=self)
+                        loading_manager.hide_loading()
+                        return
                 except Exception as e:
                     print(f"[EditTab][WARNING] Tidak bisa cek duplikasi No. Surat: {e}")
                     # Continue even if duplicate check fails to avoid data loss
-
-                # Progress simulation
-                for i in range(1, 101):
-                    import time; time.sleep(0.01)
-                    loading_manager.update_progress(i)
+                loading_manager.update_progress(50)
                 
                 print("[EditTab] Memanggil update_log_entry...")
                 
                 # Use the fixed update_log_entry function
                 from edit_logic import update_log_entry
-                success = update_log_entry(self.data_log, data_baru)
+                success = update_log_entry(self.data_log, data_baru, row_pos=row_pos)
                 
                 if success:
                     print("[EditTab] Update berhasil.")
@@ -1019,10 +1010,7 @@ class EditTab(ttk.Frame):
                     loading_manager.hide_loading()
                     return
                 
-                # Progress simulation
-                for i in range(1, 101):
-                    import time; time.sleep(0.01)
-                    loading_manager.update_progress(i)
+                loading_manager.update_progress(20)
                 
                 # Ambil data dari form menggunakan collect_form_data_safely
                 data_baru = collect_form_data_safely(self)
@@ -1044,7 +1032,7 @@ class EditTab(ttk.Frame):
                 try:
                     update_log_entry(self.data_log, data_baru)
                 except Exception as e:
-                    import traceback; traceback.print_exc()
+                    traceback.print_exc()
                     LoadingMessageBox.showerror("Google Sheets", f"Gagal upload ke Google Sheets: {e}", parent=self)
                 LoadingMessageBox.showinfo("Sukses", f"Data edit berhasil diekspor ke PDF:\n{filepath}", parent=self)
             except Exception as e:
@@ -1073,10 +1061,7 @@ class EditTab(ttk.Frame):
                 # Show loading screen
                 loading_manager.show_loading(self, "Menyimpan perubahan...", True)
                 
-                # Progress simulation
-                for i in range(1, 101):
-                    import time; time.sleep(0.01)
-                    loading_manager.update_progress(i)
+                loading_manager.update_progress(20)
                 
                 # Ambil data dari form
                 data_baru = collect_form_data_safely(self)
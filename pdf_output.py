@@ -6,6 +6,7 @@ from reportlab.lib.utils import ImageReader
 import logging
 from typing import Dict, Any
 import PyPDF2
+from api_metrics import api_metrics
 
 logging.basicConfig(
     filename='app.log',
@@ -47,6 +48,7 @@ def get_abbreviated_manager_text(data):
         return f"Manager {', '.join(selected_abbreviations)}"
     return ""
 
+@api_metrics.timed('pdf', 'render')
 def save_form_to_pdf(filepath: str, data: Dict[str, Any]) -> None:
     try:
         # FIX: Check and handle file permissions before creating PDF
@@ -572,6 +574,7 @@ def save_form_to_pdf(filepath: str, data: Dict[str, Any]) -> None:
         except Exception:
             pass
 
+@api_metrics.timed('pdf', 'merge')
 def merge_pdfs(pdf_files, output_path):
     """Gabungkan beberapa file PDF menjadi satu file output_path."""
     merger = PyPDF2.PdfMerger()
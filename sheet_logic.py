@@ -1,24 +1,13 @@
 import traceback
 import logging
 from tkinter import messagebox
-from google_sheets_connect import append_row_to_sheet, write_multilayer_header, get_sheets_service, SHEET_ID, update_row_in_sheet
+from constants import ENHANCED_HEADER, LOG_SHEET_NAME, LOG_FIRST_ROW
+from logic.log_replica import get_log_replica
+from sheets_backend import get_backend
 from datetime import datetime
 
 logging.basicConfig(level=logging.WARNING)
 
-ENHANCED_HEADER = [
-    "No. Agenda", "No. Surat", "Tgl. Surat", "Perihal", "Asal Surat", "Ditujukan", 
-    "Klasifikasi", "Disposisi kepada", "Untuk Di :", "Selesai Tgl.", "Kode Klasifikasi", 
-    "Tgl. Penerimaan", "Indeks", "Bicarakan dengan", "Teruskan kepada", "Harap Selesai Tanggal",
-    "Direktur Utama Instruksi", "Direktur Utama Tanggal", "Direktur Keuangan Instruksi", "Direktur Keuangan Tanggal",
-    "Direktur Teknik Instruksi", "Direktur Teknik Tanggal", "GM Keuangan & Administrasi Instruksi", "GM Keuangan & Administrasi Tanggal",
-    "GM Operasional & Pemeliharaan Instruksi", "GM Operasional & Pemeliharaan Tanggal", 
-    "Manager Pemeliharaan Instruksi", "Manager Pemeliharaan Tanggal",
-    "Manager Operasional Instruksi", "Manager Operasional Tanggal",
-    "Manager Administrasi Instruksi", "Manager Administrasi Tanggal",
-    "Manager Keuangan Instruksi", "Manager Keuangan Tanggal"
-]
-
 # Field mapping for consistent data conversion
 FIELD_MAPPING = {
     "Tgl. Surat": "tgl_surat",
@@ -304,6 +293,25 @@ def prepare_row_data(self, data):
         # Return minimal valid row data to prevent complete failure
         return [""] * 34
 
+def _appended_pos(backend, sheet_name, no_surat):
+    """
+    Posisi replika (0 = baris LOG_FIRST_ROW) baris yang baru ditambahkan lewat appendCells.
+    Respons batchUpdate untuk appendCells tidak memuat range yang ditulis, dan panjang kolom B
+    sebelum append tidak menghitung baris terakhir yang No. Surat-nya kosong; jadi kolom kunci
+    dibaca ulang dan dicari kemunculan terakhir no_surat. None (setelah baris terakhir replika)
+    jika tidak dapat dibaca.
+    """
+    try:
+        values = backend.get_range(f'{sheet_name}!B{LOG_FIRST_ROW}:B')
+    except Exception as e:
+        print(f"[WARNING] Gagal membaca posisi baris baru: {e}")
+        return None
+    no_surat = str(no_surat).strip()
+    for pos in range(len(values) - 1, -1, -1):
+        if values[pos] and str(values[pos][0]).strip() == no_surat:
+            return pos
+    return None
+
 def upload_to_sheet(self, call_from_pdf=False, data_override=None):
     """Upload data to Google Sheets with improved error handling and null safety"""
     try:
@@ -404,42 +412,45 @@ def upload_to_sheet(self, call_from_pdf=False, data_override=None):
             LoadingMessageBox.showerror("Validasi", "No. Surat wajib diisi!", parent=self)
             return False
         
-        # Cek duplikasi No. Surat dengan error handling
+        # Header probe dan cek duplikasi No. Surat dalam satu batchGet
+        from disposisi_app.views.components.loading_screen import LoadingMessageBox
+        from disposisi_app.views.components.validation import is_no_surat_in_values
+        sheet_name = LOG_SHEET_NAME
+        backend = get_backend()
+        header_values = None
+        no_surat_values = None
         try:
-            from disposisi_app.views.components.validation import is_no_surat_unique
-            if not is_no_surat_unique(no_surat, get_sheets_service, SHEET_ID):
-                LoadingMessageBox.showerror("Validasi", f"No. Surat '{no_surat}' sudah ada di database!", parent=self)
-                return False
+            header_values, no_surat_values = backend.batch_get(
+                [f'{sheet_name}!A1:A4', f'{sheet_name}!B{LOG_FIRST_ROW}:B']
+            )
         except Exception as e:
-            print(f"[WARNING] Error checking uniqueness: {e}")
+            print(f"[WARNING] Error checking headers/uniqueness: {e}")
             # Continue anyway if validation fails - better to save than lose data
         
-        # Ensure sheet has proper headers
-        from googleapiclient.errors import HttpError
-        import time
-        sheet_name = 'Sheet1'
-        
-        try:
-            service = get_sheets_service()
-            result = service.spreadsheets().values().get(
-                spreadsheetId=SHEET_ID,
-                range=f'{sheet_name}!A1:A4'
-            ).execute()
-            values = result.get('values', [])
-            if len(values) < 4:
-                write_multilayer_header(sheet_id=SHEET_ID, sheet_name=sheet_name)
-                time.sleep(1)
-        except HttpError as e:
-            print(f"[WARNING] Error checking headers: {e}")
-            try:
-                write_multilayer_header(sheet_id=SHEET_ID, sheet_name=sheet_name)
-                time.sleep(1)
-            except Exception as header_error:
-                print(f"[WARNING] Could not write headers: {header_error}")
+        if no_surat_values is not None and is_no_surat_in_values(no_surat, no_surat_values):
+            LoadingMessageBox.showerror("Validasi", f"No. Surat '{no_surat}' sudah ada di database!", parent=self)
+            return False
         
-        # Prepare and upload data
+        # Prepare and upload data: header (jika perlu) + baris baru dalam satu batchUpdate
         row_data = prepare_row_data(self, data)
-        append_row_to_sheet(row_data, range_name=f'{sheet_name}!A6')
+        pipeline = backend.write_pipeline(sheet_name)
+        needs_header = header_values is not None and len(header_values) < 4
+        if needs_header:
+            pipeline.write_header()
+        pos = None
+        if no_surat_values is not None and (needs_header or not no_surat_values):
+            # appendCells menulis setelah baris terakhir berisi data (bisa baris 5 jika log kosong),
+            # jadi tulis eksplisit tepat di bawah data terakhir mulai baris LOG_FIRST_ROW
+            start_row_index = LOG_FIRST_ROW - 1 + len(no_surat_values)
+            pipeline.update_rows([row_data], start_row_index=start_row_index)
+            pos = start_row_index - (LOG_FIRST_ROW - 1)
+        else:
+            pipeline.append_rows([row_data])
+        pipeline.commit()
+        if pos is None:
+            pos = _appended_pos(backend, sheet_name, no_surat)
+        # Baris baru masuk replika lokal (dan tab Log lewat listener) pada posisi yang ditulis
+        get_log_replica().apply_append(row_data, pos=pos)
         
         if not call_from_pdf:
             from disposisi_app.views.components.loading_screen import LoadingMessageBox
@@ -458,25 +469,12 @@ def upload_to_sheet(self, call_from_pdf=False, data_override=None):
 def update_log_entry(data_lama, data_baru):
     """Update log entry in Google Sheets with robust error handling"""
     try:
-        service = get_sheets_service()
-        range_name = 'Sheet1!A6:AH'  # Changed from AB to AH for 34 columns
-        result = service.spreadsheets().values().get(
-            spreadsheetId=SHEET_ID,
-            range=range_name
-        ).execute()
-        values = result.get('values', []) or []
-        
-        # Find the row to update
-        idx = -1
+        replica = get_log_replica()
         no_surat_lama = safe_get_value(data_lama, "No. Surat")
         
-        for i, row in enumerate(values):
-            row_full = row + ["" for _ in range(len(ENHANCED_HEADER) - len(row))]
-            if str(row_full[1]).strip() == no_surat_lama:
-                idx = i
-                break
-        
-        if idx == -1:
+        # Find the row to update (replika lokal, diverifikasi satu sel di sheet)
+        idx = replica.locate_for_write(no_surat_lama)
+        if idx is None:
             raise Exception(f"Data dengan No. Surat '{no_surat_lama}' tidak ditemukan di sheet, tidak bisa update.")
         
         # Convert snake_case fields back to sheet headers with null handling
@@ -593,10 +591,13 @@ def update_log_entry(data_lama, data_baru):
             row_data.append("")
         row_data = row_data[:34]  
         
-        print(f"[update_log_entry] Akan update baris ke-{idx+6} dengan {len(row_data)} kolom")
+        row_number = idx + LOG_FIRST_ROW
+        print(f"[update_log_entry] Akan update baris ke-{row_number} dengan {len(row_data)} kolom")
         if missing_keys:
             print(f"[update_log_entry][INFO] Kolom kosong: {missing_keys}")
-        update_row_in_sheet(row_data, idx+1)
+        # Replika (dan tab Log) diperbarui lebih dulu, dikembalikan jika penulisan ke sheet gagal
+        with replica.optimistic_update(idx, row_data):
+            replica.backend.update_range(f'{LOG_SHEET_NAME}!A{row_number}:AH{row_number}', [row_data])
         
         return True
         
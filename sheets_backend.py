@@ -0,0 +1,373 @@
+"""
+Abstraksi penyimpanan log disposisi.
+
+Semua pembacaan/penulisan log (LogTab, upload_to_sheet, update_log_entry, replika lokal)
+memakai backend aktif dari get_backend():
+- GoogleSheetsBackend: Google Sheets API (default)
+- InMemorySheetsBackend: data di memori (opsional disimpan ke file JSON), bisa diisi
+  N baris sintetis untuk mengukur biaya parsing/filter/export tanpa noise jaringan
+
+Backend bisa dipilih lewat environment variable SHEETS_BACKEND:
+    google            -> Google Sheets (default)
+    memory:N          -> in-memory dengan N baris sintetis
+    file:PATH[:N]     -> in-memory yang disimpan ke PATH (diisi N baris jika file belum ada)
+"""
+import os
+import json
+import random
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from google_sheets_connect import (
+    get_sheets_service, execute_request, batch_get_values, batch_update_sheet,
+    build_append_rows_request, build_header_requests, build_update_rows_request,
+    SheetWritePipeline, SHEET_ID
+)
+from constants import ENHANCED_HEADER, LOG_SHEET_NAME, LOG_FIRST_ROW
+
+logging.basicConfig(level=logging.WARNING)
+
+def column_index(letters):
+    """'A' -> 0, 'AH' -> 33"""
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - ord('A') + 1)
+    return index - 1
+
+def column_letter(index):
+    """0 -> 'A', 33 -> 'AH'"""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return letters
+
+def _split_cell(ref):
+    letters = "".join(ch for ch in ref if ch.isalpha())
+    digits = "".join(ch for ch in ref if ch.isdigit())
+    return (column_index(letters) if letters else None), (int(digits) - 1 if digits else None)
+
+def parse_a1_range(range_name, default_sheet=LOG_SHEET_NAME):
+    """
+    Parse notasi A1 menjadi (sheet, row_start, col_start, row_end, col_end), 0-based,
+    end eksklusif, None = terbuka. Contoh: 'Sheet1!A6:AH' -> ('Sheet1', 5, 0, None, 34)
+    """
+    if '!' in range_name:
+        sheet, ref = range_name.split('!', 1)
+        sheet = sheet.strip("'")
+    else:
+        sheet, ref = default_sheet, range_name
+    start, _, end = ref.partition(':')
+    col_start, row_start = _split_cell(start)
+    if end:
+        col_end, row_end = _split_cell(end)
+    else:
+        col_end, row_end = col_start, row_start
+    return (
+        sheet,
+        row_start or 0,
+        col_start or 0,
+        None if row_end is None else row_end + 1,
+        None if col_end is None else col_end + 1,
+    )
+
+class SheetsBackend(ABC):
+    """Antarmuka backend. Nomor baris mengikuti sheet (1-based), range memakai notasi A1."""
+    spreadsheet_id = None
+
+    def get_range(self, range_name):
+        """Nilai range (list of rows) dengan pemangkasan sel/baris kosong di akhir seperti API."""
+        return self.batch_get([range_name])[0]
+
+    @abstractmethod
+    def batch_get(self, ranges):
+        """List nilai per range (urutan sama dengan ranges)."""
+
+    @abstractmethod
+    def append(self, range_name, rows):
+        """Tambah baris setelah baris terakhir yang berisi data di sheet range_name."""
+
+    @abstractmethod
+    def update_range(self, range_name, rows):
+        """Timpa sel mulai dari sel kiri atas range_name."""
+
+    @abstractmethod
+    def batch_update(self, build_requests, sheet_name=None):
+        """build_requests: callable(sheet_id_num) -> list of request batchUpdate."""
+
+    def delete_rows(self, sheet_name, row_numbers):
+        """Hapus baris-baris (nomor baris sheet, 1-based) dalam satu batchUpdate."""
+        if not row_numbers:
+            return None
+        return self.batch_update(lambda sheet_id_num: _delete_rows_requests(sheet_id_num, row_numbers), sheet_name)
+
+    def write_pipeline(self, sheet_name=LOG_SHEET_NAME):
+        """SheetWritePipeline yang commit-nya dikirim lewat backend ini."""
+        return SheetWritePipeline(self.spreadsheet_id, sheet_name, backend=self)
+
+def row_ranges(row_numbers):
+    """Gabungkan nomor baris yang berurutan menjadi rentang (awal, akhir) inklusif, terurut naik."""
+    ranges = []
+    for row in sorted(set(row_numbers)):
+        if ranges and row == ranges[-1][1] + 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return [tuple(r) for r in ranges]
+
+def _delete_rows_requests(sheet_id_num, row_numbers):
+    # Baris berurutan digabung menjadi satu rentang; dari bawah ke atas agar indeks
+    # baris di atasnya tidak bergeser
+    return [{
+        'deleteDimension': {
+            'range': {
+                'sheetId': sheet_id_num,
+                'dimension': 'ROWS',
+                'startIndex': first - 1,
+                'endIndex': last
+            }
+        }
+    } for first, last in reversed(row_ranges(row_numbers))]
+
+class GoogleSheetsBackend(SheetsBackend):
+    """
+    service_factory: callable yang mengembalikan service Sheets milik thread pemanggil
+    (default pool utama; EmailSender memakai pool dengan scope read-only untuk sheet admin).
+    """
+    def __init__(self, spreadsheet_id=None, service_factory=None):
+        self.spreadsheet_id = spreadsheet_id or SHEET_ID
+        self.service_factory = service_factory or get_sheets_service
+
+    def get_range(self, range_name):
+        service = self.service_factory()
+        result = execute_request(service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name
+        ))
+        return result.get('values', []) or []
+
+    def batch_get(self, ranges):
+        return batch_get_values(ranges, spreadsheet_id=self.spreadsheet_id, service=self.service_factory())
+
+    def append(self, range_name, rows):
+        sheet_name = parse_a1_range(range_name)[0]
+        rows = [list(r) for r in rows]
+        return self.batch_update(lambda sheet_id_num: [build_append_rows_request(sheet_id_num, rows)], sheet_name)
+
+    def update_range(self, range_name, rows):
+        service = self.service_factory()
+        return execute_request(service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            valueInputOption='RAW',
+            body={'values': [list(r) for r in rows]}
+        ))
+
+    def batch_update(self, build_requests, sheet_name=None):
+        return batch_update_sheet(build_requests, spreadsheet_id=self.spreadsheet_id, sheet_name=sheet_name)
+
+def _cell_value(cell):
+    value = (cell or {}).get('userEnteredValue', {})
+    if 'stringValue' in value:
+        return value['stringValue']
+    if 'numberValue' in value:
+        number = value['numberValue']
+        return str(int(number)) if float(number).is_integer() else str(number)
+    if 'boolValue' in value:
+        return 'TRUE' if value['boolValue'] else 'FALSE'
+    return ""
+
+def _trim(rows):
+    """Pangkas sel kosong di akhir tiap baris dan baris kosong di akhir (perilaku values.get)."""
+    trimmed = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        trimmed.append(row)
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return trimmed
+
+class InMemorySheetsBackend(SheetsBackend):
+    """
+    Backend di memori dengan semantik baca/tulis yang sama dengan Google Sheets
+    untuk operasi yang dipakai aplikasi. Request format (merge, border, dll.) diabaikan.
+    path: jika diisi, isi sheet dimuat dari/disimpan ke file JSON setelah setiap penulisan.
+    """
+    def __init__(self, rows=0, path=None, spreadsheet_id=None, seed=0):
+        self.path = path
+        self.spreadsheet_id = spreadsheet_id or (f"file-{os.path.basename(path)}" if path else "memory")
+        self._lock = threading.RLock()
+        self._sheets = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._sheets = json.load(f)
+        else:
+            self._sheets[LOG_SHEET_NAME] = []
+            self.batch_update(build_header_requests, LOG_SHEET_NAME)
+            if rows:
+                self.batch_update(
+                    lambda sheet_id_num: [build_update_rows_request(
+                        sheet_id_num, synthetic_log_rows(rows, seed), LOG_FIRST_ROW - 1, with_format=False)],
+                    LOG_SHEET_NAME
+                )
+
+    def _save(self):
+        if self.path:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._sheets, f, ensure_ascii=False)
+
+    def _sheet(self, sheet_name):
+        if sheet_name is None:
+            sheet_name = next(iter(self._sheets), LOG_SHEET_NAME)
+        return self._sheets.setdefault(sheet_name, [])
+
+    def _write(self, grid, row_index, col_index, rows):
+        for offset, values in enumerate(rows):
+            target = row_index + offset
+            while len(grid) <= target:
+                grid.append([])
+            row = grid[target]
+            needed = col_index + len(values)
+            if len(row) < needed:
+                row.extend("" for _ in range(needed - len(row)))
+            row[col_index:needed] = ["" if v is None else str(v) for v in values]
+
+    def _last_data_row(self, grid):
+        for index in range(len(grid) - 1, -1, -1):
+            if any(cell != "" for cell in grid[index]):
+                return index
+        return -1
+
+    def batch_get(self, ranges):
+        results = []
+        with self._lock:
+            for range_name in ranges:
+                sheet, r0, c0, r1, c1 = parse_a1_range(range_name)
+                grid = self._sheet(sheet)
+                rows = grid[r0:r1 if r1 is not None else len(grid)]
+                results.append(_trim([row[c0:c1 if c1 is not None else len(row)] for row in rows]))
+        return results
+
+    def append(self, range_name, rows):
+        sheet = parse_a1_range(range_name)[0]
+        with self._lock:
+            grid = self._sheet(sheet)
+            self._write(grid, self._last_data_row(grid) + 1, 0, rows)
+            self._save()
+
+    def update_range(self, range_name, rows):
+        sheet, r0, c0, _, _ = parse_a1_range(range_name)
+        with self._lock:
+            self._write(self._sheet(sheet), r0, c0, rows)
+            self._save()
+
+    def batch_update(self, build_requests, sheet_name=None):
+        with self._lock:
+            names = list(self._sheets) or [LOG_SHEET_NAME]
+            name = sheet_name if sheet_name is not None else names[0]
+            grid = self._sheet(name)
+            sheet_id_num = list(self._sheets).index(name)
+            replies = []
+            for request in build_requests(sheet_id_num):
+                if 'appendCells' in request:
+                    rows = [[_cell_value(c) for c in r.get('values', [])] for r in request['appendCells'].get('rows', [])]
+                    self._write(grid, self._last_data_row(grid) + 1, 0, rows)
+                elif 'updateCells' in request:
+                    body = request['updateCells']
+                    start = body.get('start', {})
+                    rows = [[_cell_value(c) for c in r.get('values', [])] for r in body.get('rows', [])]
+                    self._write(grid, start.get('rowIndex', 0), start.get('columnIndex', 0), rows)
+                elif 'deleteDimension' in request:
+                    rng = request['deleteDimension']['range']
+                    if rng.get('dimension') == 'ROWS':
+                        del grid[rng['startIndex']:rng['endIndex']]
+                elif 'addSheet' in request:
+                    title = request['addSheet']['properties']['title']
+                    self._sheets.setdefault(title, [])
+                    replies.append({'addSheet': {'properties': {'sheetId': list(self._sheets).index(title), 'title': title}}})
+                    continue
+                replies.append({})
+            self._save()
+        return {'spreadsheetId': self.spreadsheet_id, 'replies': replies}
+
+_INSTANSI = ["Kementerian PUPR", "Dinas Perhubungan", "PT Jasa Marga", "BPJT", "Pemda Kota", "Kantor Pusat", "Bank Mandiri", "Kepolisian"]
+_PERIHAL = ["Undangan rapat koordinasi", "Laporan pemeliharaan jalan", "Permohonan data lalu lintas",
+            "Pemberitahuan audit keuangan", "Usulan anggaran", "Evaluasi kinerja operasional",
+            "Permintaan klarifikasi tarif", "Penyampaian hasil survei", "Pengadaan barang dan jasa"]
+_UNTUK_DI = ["Ketahui & File", "Proses Selesai", "Teliti & Pendapat", "Buatkan Resume", "Edarkan", "Sesuai Disposisi"]
+_JABATAN = ["Direktur Utama", "Direktur Keuangan", "Direktur Teknik", "GM Keuangan & Administrasi",
+            "GM Operasional & Pemeliharaan", "Manager Pemeliharaan", "Manager Operasional",
+            "Manager Administrasi", "Manager Keuangan"]
+
+def synthetic_log_rows(n, seed=0):
+    """N baris log (34 kolom, urutan ENHANCED_HEADER) dengan isi acak yang realistis."""
+    rng = random.Random(seed)
+    base = datetime(2022, 1, 1)
+    rows = []
+    for i in range(n):
+        tgl_surat = base + timedelta(days=rng.randint(0, 1460))
+        tgl_terima = tgl_surat + timedelta(days=rng.randint(0, 7))
+        selesai = tgl_terima + timedelta(days=rng.randint(1, 30))
+        tujuan = rng.sample(_JABATAN, rng.randint(1, 3))
+        row = {
+            "No. Agenda": str(i + 1),
+            "No. Surat": f"{i + 1:05d}/{rng.choice(['UM', 'KU', 'TK', 'OP'])}/{tgl_surat.year}",
+            "Tgl. Surat": tgl_surat.strftime('%d-%m-%Y'),
+            "Perihal": f"{rng.choice(_PERIHAL)} {rng.randint(1, 99)}",
+            "Asal Surat": rng.choice(_INSTANSI),
+            "Ditujukan": "Direktur Utama",
+            "Klasifikasi": rng.choice(["", "", "RAHASIA", "PENTING", "SEGERA"]),
+            "Disposisi kepada": ", ".join(tujuan),
+            "Untuk Di :": ", ".join(rng.sample(_UNTUK_DI, rng.randint(1, 2))),
+            "Selesai Tgl.": selesai.strftime('%d-%m-%Y'),
+            "Kode Klasifikasi": f"{rng.randint(100, 999)}.{rng.randint(1, 9)}",
+            "Tgl. Penerimaan": tgl_terima.strftime('%d-%m-%Y'),
+            "Indeks": rng.choice(["A", "B", "C", "D"]),
+            "Bicarakan dengan": "",
+            "Teruskan kepada": "",
+            "Harap Selesai Tanggal": selesai.strftime('%d-%m-%Y'),
+        }
+        for jabatan in tujuan:
+            row[f"{jabatan} Instruksi"] = rng.choice(_UNTUK_DI)
+            row[f"{jabatan} Tanggal"] = tgl_terima.strftime('%d-%m-%Y')
+        rows.append([row.get(col, "") for col in ENHANCED_HEADER])
+    return rows
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def backend_from_env():
+    """Bangun backend dari environment variable SHEETS_BACKEND (lihat docstring modul)."""
+    spec = os.environ.get('SHEETS_BACKEND', 'google').strip()
+    kind, _, arg = spec.partition(':')
+    if kind == 'memory':
+        return InMemorySheetsBackend(rows=int(arg or 0))
+    if kind == 'file':
+        # Jumlah baris hanya diambil dari bagian setelah ':' terakhir yang berupa angka,
+        # sehingga path Windows seperti C:\data\log.json tidak terpotong di huruf drive
+        path, _, rows = arg.rpartition(':')
+        if not path or not rows.isdigit():
+            path, rows = arg, ''
+        return InMemorySheetsBackend(rows=int(rows or 0), path=path)
+    if kind != 'google':
+        logging.warning(f"[sheets_backend] SHEETS_BACKEND '{spec}' tidak dikenal, memakai Google Sheets")
+    return GoogleSheetsBackend()
+
+def get_backend():
+    """Backend aktif (dibuat sekali per proses)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = backend_from_env()
+        return _backend
+
+def set_backend(backend):
+    """Ganti backend aktif, mis. InMemorySheetsBackend untuk benchmark."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+    return backend
@@ -0,0 +1,92 @@
+"""DeadlineIndex: batas jendela tenggat dengan "hari ini" tetap, dan pembaruan saat tenggat berubah."""
+import datetime
+
+import pytest
+
+from constants import ENHANCED_HEADER
+from logic.deadline_index import DEADLINE_COLUMN, POSITION_COLUMNS, POSITIONS
+from logic.log_store import LogStore
+
+TODAY = datetime.date(2024, 3, 15)
+# Offset hari dari TODAY per baris; None = tanpa tenggat. -31 berada di luar jendela lewat tenggat
+OFFSETS = [-30, -2, -1, 0, 1, 7, 8, 30, 31, None, -31]
+EXPECTED = {
+    'overdue': [0, 1, 2],
+    'week': [3, 4, 5],
+    'month': [3, 4, 5, 6, 7],
+    'pending': [3, 4, 5, 6, 7, 8],
+}
+
+def _date(offset, fmt="%d-%m-%Y"):
+    return (TODAY + datetime.timedelta(days=offset)).strftime(fmt)
+
+def _values(record):
+    return [record.get(col, "") for col in ENHANCED_HEADER]
+
+@pytest.fixture
+def store():
+    store = LogStore()
+    store.extend([_values({DEADLINE_COLUMN: _date(offset) if offset is not None else ""})
+                  for offset in OFFSETS])
+    return store
+
+@pytest.mark.parametrize("kind", sorted(EXPECTED))
+def test_window_boundaries(store, kind):
+    assert list(store.deadlines.rows(kind, today=TODAY)) == EXPECTED[kind]
+    assert store.deadlines.count(kind, today=TODAY) == len(EXPECTED[kind])
+
+def test_by_deadline_is_ordered_by_date(store):
+    store.set(4, DEADLINE_COLUMN, _date(-5))
+    assert store.deadlines.by_deadline('overdue', today=TODAY) == [0, 4, 1, 2]
+
+def test_date_formats_and_invalid_values():
+    store = LogStore()
+    store.extend([_values({DEADLINE_COLUMN: value}) for value in
+                  [_date(-1, "%Y-%m-%d"), _date(3, "%d/%m/%Y"), "31-02-2024", "segera", ""]])
+    assert list(store.deadlines.rows('overdue', today=TODAY)) == [0]
+    assert list(store.deadlines.rows('pending', today=TODAY)) == [1]
+
+def test_appended_rows_are_indexed(store):
+    store.append(_values({DEADLINE_COLUMN: _date(-1)}))
+    assert list(store.deadlines.rows('overdue', today=TODAY)) == EXPECTED['overdue'] + [len(store) - 1]
+
+def test_index_follows_deadline_changes(store):
+    store.set(10, DEADLINE_COLUMN, _date(-3))    # di luar jendela -> lewat tenggat
+    store.set(0, DEADLINE_COLUMN, _date(2))      # lewat tenggat -> minggu ini
+    store.set(5, DEADLINE_COLUMN, _date(-1))     # minggu ini -> lewat tenggat
+    store.set(9, DEADLINE_COLUMN, _date(7))      # tanpa tenggat -> minggu ini
+    store.set(3, DEADLINE_COLUMN, "")            # tenggat dikosongkan
+    assert list(store.deadlines.rows('overdue', today=TODAY)) == [1, 2, 5, 10]
+    assert list(store.deadlines.rows('week', today=TODAY)) == [0, 4, 9]
+    assert store.deadlines.count('pending', today=TODAY) == 6
+
+def test_removed_and_restored_rows(store):
+    store.remove([1, 4])
+    assert list(store.deadlines.rows('overdue', today=TODAY)) == [0, 2]
+    assert list(store.deadlines.rows('week', today=TODAY)) == [3, 5]
+    # Perubahan pada baris terhapus tidak masuk index
+    store.set(1, DEADLINE_COLUMN, _date(1))
+    assert list(store.deadlines.rows('week', today=TODAY)) == [3, 5]
+    store.restore([1, 4])
+    assert list(store.deadlines.rows('week', today=TODAY)) == [1, 3, 4, 5]
+
+def test_position_deadlines():
+    first, second = POSITIONS[0], POSITIONS[1]
+    store = LogStore()
+    store.extend([
+        # Tenggat jabatan sendiri mengalahkan Harap Selesai Tanggal
+        _values({DEADLINE_COLUMN: _date(10), "Disposisi kepada": first, POSITION_COLUMNS[first]: _date(-1)}),
+        # Hanya tercantum di Disposisi kepada -> memakai Harap Selesai Tanggal
+        _values({DEADLINE_COLUMN: _date(-3), "Disposisi kepada": f"{first}, {second}"}),
+        # Tidak didisposisikan ke jabatan mana pun
+        _values({DEADLINE_COLUMN: _date(-3)}),
+    ])
+    assert list(store.deadlines.rows('overdue', first, today=TODAY)) == [0, 1]
+    assert list(store.deadlines.rows('overdue', second, today=TODAY)) == [1]
+    assert list(store.deadlines.rows('overdue', today=TODAY)) == [1, 2]
+
+    store.set(1, "Disposisi kepada", first)
+    assert list(store.deadlines.rows('overdue', second, today=TODAY)) == []
+    store.set(0, POSITION_COLUMNS[first], "")
+    assert list(store.deadlines.rows('overdue', first, today=TODAY)) == [1]
+    assert list(store.deadlines.rows('month', first, today=TODAY)) == [0]
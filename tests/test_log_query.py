@@ -0,0 +1,146 @@
+"""LogQuery: kriteria gabungan dibandingkan dengan filter linear, dan cache per versi LogStore."""
+import datetime
+import random
+
+import pytest
+
+from constants import ENHANCED_HEADER
+from logic.log_query import LogQuery
+from logic.dates import parse_date
+from logic.log_store import TEXT_SEARCH_COLUMNS, LogStore, sort_key
+
+PERIHAL = ["Undangan rapat koordinasi", "Laporan keuangan", "Perbaikan jalan tol", "Sosialisasi K3",
+           "Rapat evaluasi kinerja", "Permohonan data", "Pengadaan panel listrik", ""]
+ASAL = ["BPJT", "Kementerian PUPR", "Dinas Perhubungan", "PLN", "Pemkot Bekasi"]
+KLASIFIKASI = ["Biasa", "Penting", "Rahasia", "Segera", ""]
+
+def _row(rng, i):
+    record = {
+        "No. Agenda": str(i + 1),
+        "No. Surat": f"{rng.randint(1, 400):03d}/{rng.choice(['DU', 'DK', 'GM'])}/2024",
+        "Tgl. Surat": f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.choice([2023, 2024])}",
+        "Perihal": rng.choice(PERIHAL),
+        "Asal Surat": rng.choice(ASAL),
+        "Klasifikasi": rng.choice(KLASIFIKASI),
+    }
+    if i % 17 == 0:
+        record["Tgl. Surat"] = ""
+    return _values(record)
+
+def _values(record):
+    return [record.get(col, "") for col in ENHANCED_HEADER]
+
+@pytest.fixture
+def store():
+    rng = random.Random(16)
+    store = LogStore()
+    store.extend([_row(rng, i) for i in range(400)])
+    return store
+
+def reference(store, removed=(), search=None, column_filter=None, year=None, month=None, sort=()):
+    """Evaluasi naif: scan semua baris yang belum dihapus, lalu sort stabil per kunci."""
+    rows = []
+    for i in range(len(store)):
+        if i in removed:
+            continue
+        if search and not all(any(term in str(store.get(i, c)).lower() for c in TEXT_SEARCH_COLUMNS)
+                              for term in search.lower().split()):
+            continue
+        if column_filter and column_filter[1] not in str(store.get(i, column_filter[0])):
+            continue
+        parsed = parse_date(store.get(i, "Tgl. Surat"))
+        if (year or month) and not parsed:
+            continue
+        if year and parsed[0] != year or month and parsed[1] != month:
+            continue
+        rows.append(i)
+    for col, descending in reversed(list(sort)):
+        rows.sort(key=lambda i: sort_key(col, store.get(i, col)), reverse=descending)
+    return rows
+
+CASES = [
+    dict(search="rapat"),
+    dict(search="rapat", column_filter=("Klasifikasi", "Penting")),
+    dict(search="rapat", column_filter=("Klasifikasi", "Penting"), year=2024, sort=[("Tgl. Surat", True)]),
+    dict(column_filter=("Asal Surat", "PUPR"), month=3, sort=[("No. Surat", False)]),
+    dict(search="laporan", year=2023, month=7, sort=[("Klasifikasi", False), ("No. Agenda", True)]),
+    dict(column_filter=("Klasifikasi", "e"), sort=[("Perihal", False), ("Tgl. Surat", False)]),
+    dict(year=2024, sort=[("Asal Surat", True)]),
+    dict(search="tidak-ada", column_filter=("Klasifikasi", "Biasa")),
+    dict(sort=[("No. Surat", True)]),
+]
+
+def _apply(query, case):
+    query.clear()
+    if case.get("search"):
+        query.set_search(case["search"])
+    if case.get("column_filter"):
+        query.set_column_filter(*case["column_filter"])
+    query.set_year_month(case.get("year"), case.get("month"))
+    query.set_sort(case.get("sort"))
+
+@pytest.mark.parametrize("case", CASES)
+def test_combined_criteria_match_linear_filter(store, case):
+    query = LogQuery()
+    _apply(query, case)
+    assert list(query.evaluate(store).indices) == reference(store, **case)
+
+def test_removed_rows_are_excluded(store):
+    removed = set(range(0, len(store), 5))
+    store.remove(removed)
+    query = LogQuery()
+    for case in CASES:
+        _apply(query, case)
+        assert list(query.evaluate(store).indices) == reference(store, removed, **case)
+
+def test_changing_one_criterion_reuses_cache(store):
+    # Hasil yang sama dari cache dan dari evaluasi baru
+    query = LogQuery()
+    for case in CASES + CASES[::-1]:
+        _apply(query, case)
+        assert list(query.evaluate(store).indices) == reference(store, **case)
+
+def test_cache_invalidated_when_store_version_changes(store):
+    query = LogQuery()
+    query.set_search("rapat")
+    query.set_column_filter("Klasifikasi", "Penting")
+    query.set_sort([("No. Agenda", True)])
+    before = list(query.evaluate(store).indices)
+    target = next(i for i in range(len(store)) if i not in before)
+
+    store.set(target, "Perihal", "Rapat direksi")
+    store.set(target, "Klasifikasi", "Penting")
+    after = list(query.evaluate(store).indices)
+    assert target in after
+    assert after == reference(store, search="rapat", column_filter=("Klasifikasi", "Penting"),
+                              sort=[("No. Agenda", True)])
+
+    store.remove([before[0]])
+    assert before[0] not in query.evaluate(store).indices
+
+    store.append(_values({"No. Agenda": "401", "Perihal": "Rapat baru", "Klasifikasi": "Penting"}))
+    assert query.evaluate(store).indices[0] == len(store) - 1
+
+def test_cache_not_shared_between_stores(store):
+    query = LogQuery()
+    query.set_search("rapat")
+    query.evaluate(store)
+    other = LogStore()
+    other.extend([_row(random.Random(2), i) for i in range(10)])
+    assert list(query.evaluate(other).indices) == reference(other, search="rapat")
+
+def test_deadline_criterion_combines_with_search():
+    today = datetime.date.today()
+    store = LogStore()
+    for days, perihal in [(-3, "Rapat"), (-1, "Laporan"), (2, "Rapat"), (40, "Rapat"), (None, "Rapat")]:
+        record = {"Perihal": perihal}
+        if days is not None:
+            record["Harap Selesai Tanggal"] = (today + datetime.timedelta(days=days)).strftime("%d-%m-%Y")
+        store.append(_values(record))
+    query = LogQuery()
+    query.set_deadline("overdue")
+    assert list(query.evaluate(store).indices) == [0, 1]
+    query.set_search("rapat")
+    assert list(query.evaluate(store).indices) == [0]
+    query.set_deadline("pending")
+    assert list(query.evaluate(store).indices) == [2, 3]
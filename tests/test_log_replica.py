@@ -0,0 +1,228 @@
+"""LogReplica: diff kolom kunci dan polling sentinel terhadap InMemorySheetsBackend."""
+import threading
+
+import pytest
+
+from constants import ENHANCED_HEADER, LOG_FIRST_ROW, LOG_SHEET_NAME, LOG_SUMMARY_COLUMNS, LOG_SUMMARY_LAST_COL
+from logic.log_replica import SENTINEL_ROWS, LogReplica
+from sheets_backend import InMemorySheetsBackend
+
+ROWS = 60
+
+def _pad(row):
+    return [str(c) for c in row] + [""] * (len(ENHANCED_HEADER) - len(row))
+
+def remote_rows(backend):
+    values = backend.get_range(f'{LOG_SHEET_NAME}!A{LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}')
+    return [_pad(row)[:LOG_SUMMARY_COLUMNS] for row in values if any(str(c).strip() for c in row)]
+
+def local_rows(replica):
+    return [row[:LOG_SUMMARY_COLUMNS] for row in replica.all_rows()]
+
+def sheet_rows(backend):
+    return [_pad(row) for row in backend.get_range(f'{LOG_SHEET_NAME}!A{LOG_FIRST_ROW}:AH')]
+
+def rewrite(backend, rows):
+    """Timpa isi log di sheet (mis. untuk menyisipkan atau menukar baris)."""
+    backend.update_range(f'{LOG_SHEET_NAME}!A{LOG_FIRST_ROW}', [_pad(row) for row in rows])
+
+def new_row(key):
+    return _pad(["999", key, "01-01-2024", f"Perihal {key}", "BPJT"])
+
+@pytest.fixture
+def backend():
+    return InMemorySheetsBackend(rows=ROWS)
+
+@pytest.fixture
+def replica(backend):
+    replica = LogReplica(backend=backend, db_path=':memory:')
+    replica.sync()
+    yield replica
+    replica.close()
+
+@pytest.fixture
+def batch_gets(backend, monkeypatch):
+    """Daftar range per panggilan batch_get (unduhan blok A:P oleh sync_incremental)."""
+    calls = []
+    original = backend.batch_get
+
+    def recording(ranges):
+        calls.append(list(ranges))
+        return original(ranges)
+    monkeypatch.setattr(backend, 'batch_get', recording)
+    return calls
+
+def _ids(replica):
+    return replica.all_rows_with_ids()[0]
+
+def test_initial_sync(backend, replica):
+    assert replica.count() == ROWS
+    assert local_rows(replica) == remote_rows(backend)
+
+def test_unchanged_sheet_downloads_nothing(replica, batch_gets):
+    version = replica.data_version
+    assert replica.sync_incremental() == 0
+    assert replica.data_version == version
+    # Hanya kolom kunci dan ekor log yang dibaca, dalam satu request
+    assert batch_gets == [[f'{LOG_SHEET_NAME}!B{LOG_FIRST_ROW}:B',
+                           f'{LOG_SHEET_NAME}!A{ROWS - SENTINEL_ROWS + LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}']]
+
+def test_append_fetches_only_new_rows(backend, replica, batch_gets):
+    backend.append(f'{LOG_SHEET_NAME}!A1', [new_row("NEW-1"), new_row("NEW-2")])
+    assert replica.sync_incremental() == 2
+    assert batch_gets[-1] == [f'{LOG_SHEET_NAME}!A{ROWS + LOG_FIRST_ROW}:{LOG_SUMMARY_LAST_COL}{ROWS + LOG_FIRST_ROW + 1}']
+    assert local_rows(replica) == remote_rows(backend)
+
+def test_append_without_key(backend, replica):
+    backend.append(f'{LOG_SHEET_NAME}!A1', [_pad(["61", "", "01-02-2024", "Perihal tanpa nomor"])])
+    assert replica.sync_incremental() == 1
+    assert replica.count() == ROWS + 1
+    assert local_rows(replica) == remote_rows(backend)
+    # Baris tanpa kunci menjadi bagian watermark: sync berikutnya tidak mengunduh apa pun
+    assert replica.sync_incremental() == 0
+
+def test_delete_trailing_row_without_key(backend, replica):
+    backend.append(f'{LOG_SHEET_NAME}!A1', [_pad(["61", "", "01-02-2024", "Perihal tanpa nomor"])])
+    replica.sync_incremental()
+    backend.delete_rows(LOG_SHEET_NAME, [ROWS + LOG_FIRST_ROW])
+    replica.sync_incremental()
+    assert replica.count() == ROWS
+    assert local_rows(replica) == remote_rows(backend)
+
+def test_delete_moves_rows_without_download(backend, replica):
+    ids = _ids(replica)
+    backend.delete_rows(LOG_SHEET_NAME, [LOG_FIRST_ROW + 5, LOG_FIRST_ROW + 40])
+    assert replica.sync_incremental() == 0
+    assert local_rows(replica) == remote_rows(backend)
+    # Baris yang tersisa tetap baris replika yang sama (dipindah, tidak diunduh ulang)
+    assert _ids(replica) == ids[:5] + ids[6:40] + ids[41:]
+
+def test_swapped_rows_keep_their_replica_rows(backend, replica):
+    ids = _ids(replica)
+    rows = sheet_rows(backend)
+    rows[10], rows[20] = rows[20], rows[10]
+    rewrite(backend, rows)
+    replica.sync_incremental()
+    assert local_rows(replica) == remote_rows(backend)
+    swapped = list(ids)
+    swapped[10], swapped[20] = swapped[20], swapped[10]
+    assert _ids(replica) == swapped
+
+def test_mid_sheet_insert(backend, replica):
+    ids = _ids(replica)
+    rows = sheet_rows(backend)
+    rows.insert(25, new_row("INSERTED"))
+    rewrite(backend, rows)
+    assert replica.sync_incremental() == 1
+    assert local_rows(replica) == remote_rows(backend)
+    after = _ids(replica)
+    assert after[:25] == ids[:25] and after[26:] == ids[25:]
+
+def test_mixed_changes(backend, replica):
+    rows = sheet_rows(backend)
+    del rows[3]
+    rows.insert(30, new_row("MID"))
+    rows[50], rows[51] = rows[51], rows[50]
+    rows.append(new_row("END"))
+    backend.delete_rows(LOG_SHEET_NAME, [LOG_FIRST_ROW + ROWS - 1])
+    rewrite(backend, rows)
+    replica.sync_incremental()
+    assert local_rows(replica) == remote_rows(backend)
+
+def test_poll_without_changes(replica, batch_gets):
+    version = replica.data_version
+    assert replica.poll_changes() == 0
+    assert replica.data_version == version
+    assert len(batch_gets) == 1  # satu request jendela sentinel
+
+def test_poll_updates_edited_recent_row(backend, replica):
+    events = []
+    replica.add_listener(lambda kind, payload, version: events.append((kind, payload)))
+    rows = sheet_rows(backend)
+    rows[-2][3] = "Perihal diubah klien lain"
+    rewrite(backend, rows)
+    assert replica.poll_changes() == 1
+    assert local_rows(replica) == remote_rows(backend)
+    assert [kind for kind, _ in events] == ['update']
+    assert events[0][1][1][3] == "Perihal diubah klien lain"
+
+def test_poll_misses_edit_outside_window(backend, replica):
+    # Edit baris lama di luar jendela sentinel ditangkap sync penuh berkala, bukan polling
+    rows = sheet_rows(backend)
+    rows[ROWS - SENTINEL_ROWS - 1][3] = "Perihal lama diubah"
+    rewrite(backend, rows)
+    assert replica.poll_changes() == 0
+    replica.sync()
+    assert local_rows(replica) == remote_rows(backend)
+
+@pytest.mark.parametrize("change", ["append", "delete", "insert"])
+def test_poll_detects_structural_changes(backend, replica, change):
+    if change == "append":
+        backend.append(f'{LOG_SHEET_NAME}!A1', [new_row("NEW-1")])
+    elif change == "delete":
+        backend.delete_rows(LOG_SHEET_NAME, [LOG_FIRST_ROW + 3])
+    else:
+        rows = sheet_rows(backend)
+        rows.insert(7, new_row("INSERTED"))
+        rewrite(backend, rows)
+    events = []
+    replica.add_listener(lambda kind, payload, version: events.append(kind))
+    replica.poll_changes()
+    assert local_rows(replica) == remote_rows(backend)
+    assert events == ['sync']
+
+def test_poll_imports_row_without_key_once(backend, replica, batch_gets):
+    backend.update_range(f'{LOG_SHEET_NAME}!A{ROWS + LOG_FIRST_ROW}',
+                         [["61", "", "01-02-2024", "Perihal tanpa nomor"]])
+    replica.poll_changes()
+    assert replica.count() == ROWS + 1
+    assert local_rows(replica) == remote_rows(backend)
+    # Polling berikutnya kembali hanya membaca jendela sentinel
+    batch_gets.clear()
+    for _ in range(3):
+        assert replica.poll_changes() == 0
+    assert len(batch_gets) == 3
+    assert all(len(ranges) == 1 and ranges[0].startswith(f'{LOG_SHEET_NAME}!A') for ranges in batch_gets)
+
+def test_local_write_during_download_is_kept(backend, replica, monkeypatch):
+    # Baris yang ditulis lokal selama blok diunduh tidak boleh tertimpa hasil diff yang sudah basi
+    original = backend.batch_get
+    written = []
+
+    def batch_get(ranges):
+        result = original(ranges)
+        if not written and ranges[0].startswith(f'{LOG_SHEET_NAME}!A'):
+            row = new_row("LOCAL-1")
+            backend.append(f'{LOG_SHEET_NAME}!A1', [row])
+            replica.apply_append(row)
+            written.append(row)
+        return result
+    monkeypatch.setattr(backend, 'batch_get', batch_get)
+    backend.delete_rows(LOG_SHEET_NAME, [LOG_FIRST_ROW + 8])
+    backend.append(f'{LOG_SHEET_NAME}!A1', [new_row("NEW-A")])
+    replica.sync_incremental()
+    assert written
+    assert local_rows(replica) == remote_rows(backend)
+
+def test_concurrent_syncs_do_not_lose_rows(backend, replica, monkeypatch):
+    # Sync kedua dimulai (dan sheet berubah lagi) saat sync pertama sedang mengunduh blok
+    original = backend.batch_get
+    racing = []
+
+    def batch_get(ranges):
+        result = original(ranges)
+        if not racing and ranges[0].startswith(f'{LOG_SHEET_NAME}!A'):
+            backend.append(f'{LOG_SHEET_NAME}!A1', [new_row(f"RACE-{i}") for i in range(3)])
+            thread = threading.Thread(target=replica.sync_incremental)
+            thread.start()
+            racing.append(thread)
+            thread.join(timeout=0.3)  # tanpa lock, sync kedua selesai di sini dan ditimpa sync pertama
+        return result
+    monkeypatch.setattr(backend, 'batch_get', batch_get)
+    backend.append(f'{LOG_SHEET_NAME}!A1', [new_row("NEW-A"), new_row("NEW-B")])
+    backend.delete_rows(LOG_SHEET_NAME, [LOG_FIRST_ROW + 8])
+    replica.sync_incremental()
+    racing[0].join(timeout=10)
+    assert not racing[0].is_alive()
+    assert local_rows(replica) == remote_rows(backend)
+    assert replica.count() == ROWS + 4
@@ -0,0 +1,24 @@
+"""Pemilihan backend lewat SHEETS_BACKEND."""
+import pytest
+
+import sheets_backend
+
+@pytest.mark.parametrize("spec, path, rows", [
+    (r"file:C:\data\log.json:1000", r"C:\data\log.json", 1000),
+    (r"file:C:\data\log.json", r"C:\data\log.json", 0),
+    ("file:/tmp/log.json:5", "/tmp/log.json", 5),
+    ("file:log.json", "log.json", 0),
+])
+def test_file_backend_spec(monkeypatch, spec, path, rows):
+    created = []
+    monkeypatch.setattr(sheets_backend, "InMemorySheetsBackend",
+                        lambda rows=0, path=None: created.append((path, rows)))
+    monkeypatch.setenv("SHEETS_BACKEND", spec)
+    sheets_backend.backend_from_env()
+    assert created == [(path, rows)]
+
+def test_memory_backend_spec(monkeypatch):
+    monkeypatch.setenv("SHEETS_BACKEND", "memory:3")
+    backend = sheets_backend.backend_from_env()
+    assert isinstance(backend, sheets_backend.InMemorySheetsBackend)
+    assert len(backend.get_range("Sheet1!B6:B")) == 3
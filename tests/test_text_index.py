@@ -0,0 +1,108 @@
+"""TrigramIndex harus memberi hasil yang sama dengan scan substring linear."""
+import pytest
+
+from logic.text_index import SearchCancelled, TrigramIndex
+
+COLUMNS = ["No. Surat", "Perihal", "Asal Surat"]
+ROWS = [
+    ("001/DU/2024", "Undangan Rapat Koordinasi", "Kementerian PUPR"),
+    ("002/DK/2024", "Laporan Keuangan Triwulan", "BPJT"),
+    ("003/DT/2024", "Perbaikan jalan tol km 12", "Dinas Perhubungan"),
+    ("004/DU/2024", "UNDANGAN SOSIALISASI", "Pemkot Bekasi"),
+    ("005/GM/2024", "Énergie électrique gardu", "PLN Área Bekasi"),
+    ("006/GM/2024", "Pengadaan ÉLECTRIQUE panel", "Vendor Ñandú"),
+    ("007/MK/2024", "", "İSTANBUL Office"),
+    ("008/MK/2024", "Rapat", ""),
+    ("009/MA/2024", "ab", "x"),
+]
+QUERIES = [
+    "", "   ", "a", "ab", "AB", "km", "12", "rapat", "RAPAT", "undangan rapat", "rapat undangan",
+    "bekasi", "Bekasi pemkot", "énergie", "ÉNERGIE", "électrique", "ÉLECTRIQUE", "área", "ÑANDÚ",
+    "istanbul", "İstanbul", "/2024", "du/", "tidak-ada", "tol jalan", "laporan xyz",
+]
+
+def _records(rows):
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+def linear_search(records, query, columns=None, removed=()):
+    """Acuan: setiap kata query harus substring (lowercase) pada salah satu kolom."""
+    terms = query.lower().split()
+    if not terms:
+        return None
+    columns = columns or COLUMNS
+    return [i for i, record in enumerate(records) if i not in removed
+            and all(any(term in str(record.get(c) or "").lower() for c in columns) for term in terms)]
+
+def _result(index, query, columns=None):
+    found = index.search(query, columns)
+    return None if found is None else list(found)
+
+@pytest.fixture(params=["add", "add_many"])
+def indexed(request):
+    records = _records(ROWS)
+    index = TrigramIndex(COLUMNS)
+    if request.param == "add":
+        for i, record in enumerate(records):
+            index.add(i, record)
+    else:
+        index.add_many({c: [r[c] for r in records] for c in COLUMNS})
+    return index, records
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_matches_linear_scan(indexed, query):
+    index, records = indexed
+    assert _result(index, query) == linear_search(records, query)
+
+def test_short_queries_scan_every_row(indexed):
+    # Kata < 3 karakter tidak punya trigram; tetap harus ditemukan lewat verifikasi substring
+    index, records = indexed
+    for query in ("a", "ab", "AB", "x", "12", "ab rapat"):
+        assert _result(index, query) == linear_search(records, query)
+    assert _result(index, "ab") == [8]
+
+def test_search_is_case_insensitive_for_accented_text(indexed):
+    index, _ = indexed
+    assert _result(index, "ÉNERGIE") == _result(index, "énergie") == [4]
+    assert _result(index, "électrique") == [4, 5]
+
+def test_search_restricted_to_columns(indexed):
+    index, records = indexed
+    for query in ("bekasi", "rapat", "du"):
+        assert _result(index, query, ["Perihal"]) == linear_search(records, query, ["Perihal"])
+    assert _result(index, "bekasi", ["Perihal"]) == []
+
+def test_update_after_indexing(indexed):
+    index, records = indexed
+    changes = [(0, "Perihal", "Pemberitahuan libur"), (3, "Asal Surat", "Rapat Direksi"),
+               (4, "Perihal", ""), (7, "Perihal", "ÉNERGIE baru"), (8, "No. Surat", None)]
+    for row, col, value in changes:
+        index.update(row, col, value)
+        records[row][col] = value
+    for query in QUERIES + ["libur", "direksi", "baru"]:
+        assert _result(index, query) == linear_search(records, query)
+    assert _result(index, "undangan") == [3]
+    assert _result(index, "energie") == []
+
+def test_update_ignores_unindexed_column(indexed):
+    index, records = indexed
+    index.update(0, "Klasifikasi", "Rapat")
+    assert _result(index, "rapat") == linear_search(records, "rapat")
+
+def test_remove_after_indexing(indexed):
+    index, records = indexed
+    removed = {0, 4, 8}
+    for row in removed:
+        index.remove(row)
+    for query in QUERIES:
+        assert _result(index, query) == linear_search(records, query, removed=removed)
+    # Baris lain tidak bergeser, dan baris baru tetap mendapat index berikutnya
+    index.add(len(records), {"Perihal": "Rapat evaluasi"})
+    records.append({"Perihal": "Rapat evaluasi"})
+    assert _result(index, "rapat") == linear_search(records, "rapat", removed=removed)
+
+def test_search_cancelled():
+    index = TrigramIndex(COLUMNS)
+    for i, record in enumerate(_records(ROWS)):
+        index.add(i, record)
+    with pytest.raises(SearchCancelled):
+        index.search("rapat", cancel=lambda: True)